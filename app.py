@@ -1,11 +1,14 @@
-import streamlit as st
-from streamlit_option_menu import option_menu
-import plotly.graph_objects as go
-import numpy as np
-import pandas as pd
-import json
 import os
 import sys
+import time
+
+# Modo de perfil de inicialização: mede o custo de cada import a partir daqui
+from utils.lazy_imports import lazy_import, profiling_enabled, start_import_profile, get_import_profiler
+if profiling_enabled():
+    start_import_profile()
+
+import streamlit as st
+from streamlit_option_menu import option_menu
 from typing import Dict, List, Any
 
 # Configuração da página antes de qualquer coisa
@@ -15,12 +18,24 @@ st.set_page_config(
     layout="wide"
 )
 
+# Dependências pesadas só são carregadas nas páginas que as utilizam
+go = lazy_import('plotly.graph_objects')
+test_processor = lazy_import('utils.test_processor')
+recommendation_cache = lazy_import('utils.recommendation_cache')
+incremental_scoring = lazy_import('utils.incremental_scoring')
+normalization = lazy_import('utils.normalization')
+
+from utils import instrumentation
+
 # Importações dos módulos utils
 try:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from utils.sport_helper import get_sport_recommendations
-    from utils.test_processor import process_test_results
-    from utils.age_adjusted_calculations import get_age_group
+    from utils.diagnostics import set_diagnostics_sink
+    from utils.streamlit_sink import StreamlitSink
+    set_diagnostics_sink(StreamlitSink())
+    # Instrumentação opcional (SPORT_ANALYZER_METRICS), configurada uma vez por processo
+    if not instrumentation.is_enabled():
+        instrumentation.configure_from_env()
 except Exception as e:
     st.error(f"Erro ao importar módulos: {str(e)}")
 
@@ -228,42 +243,26 @@ def analyze_user_attributes(test_results, personal_info):
     """Analisa os atributos do usuário e retorna pontos fortes e a desenvolver."""
     attributes = {}
     
-    # Análise física
-    if test_results['dados_fisicos']:
-        dados_fisicos = test_results['dados_fisicos']
-        attributes['velocidade'] = normalize_score(dados_fisicos['velocidade'], 2.5, 5.0, inverse=True)
-        attributes['forca_superior'] = normalize_score(dados_fisicos['forca_superior'], 0, 50)
-        attributes['forca_inferior'] = normalize_score(dados_fisicos['forca_inferior'], 0, 60)
-    
-    # Análise técnica
-    if test_results['habilidades_tecnicas']:
-        hab_tecnicas = test_results['habilidades_tecnicas']
-        attributes['coordenacao'] = normalize_score(hab_tecnicas['coordenacao'], 0, 50)
-        attributes['precisao'] = normalize_score(hab_tecnicas['precisao'], 0, 10)
-        attributes['agilidade'] = normalize_score(hab_tecnicas['agilidade'], 5, 15, inverse=True)
-        attributes['equilibrio'] = normalize_score(hab_tecnicas['equilibrio'], 0, 60)
-    
-    # Análise tática
-    if test_results['aspectos_taticos']:
-        aspectos_taticos = test_results['aspectos_taticos']
-        attributes['tomada_decisao'] = normalize_score(aspectos_taticos['tomada_decisao'], 0, 10)
-        attributes['visao_jogo'] = normalize_score(aspectos_taticos['visao_jogo'], 0, 10)
-        attributes['posicionamento'] = normalize_score(aspectos_taticos['posicionamento'], 1, 10)
+    # Análise física, técnica e tática (faixas da especificação de normalização)
+    for category, tests in test_processor.CATEGORY_TESTS.items():
+        if test_results[category]:
+            for test in tests:
+                attributes[test] = normalization.TEST_SPEC.normalize(test, test_results[category][test], missing=0)
     
     # Análise psicológica (médias das subcategorias)
     if test_results['fatores_psicologicos']:
         fatores_psic = test_results['fatores_psicologicos']
-        attributes['motivacao'] = calculate_average([
+        attributes['motivacao'] = test_processor.calculate_average([
             fatores_psic['motivacao']['dedicacao'],
             fatores_psic['motivacao']['frequencia'],
             fatores_psic['motivacao']['comprometimento']
         ])
-        attributes['resiliencia'] = calculate_average([
+        attributes['resiliencia'] = test_processor.calculate_average([
             fatores_psic['resiliencia']['derrotas'],
             fatores_psic['resiliencia']['criticas'],
             fatores_psic['resiliencia']['erros']
         ])
-        attributes['trabalho_equipe'] = calculate_average([
+        attributes['trabalho_equipe'] = test_processor.calculate_average([
             fatores_psic['trabalho_equipe']['comunicacao'],
             fatores_psic['trabalho_equipe']['opinioes'],
             fatores_psic['trabalho_equipe']['contribuicao']
@@ -271,9 +270,9 @@ def analyze_user_attributes(test_results, personal_info):
     
     # Análise das informações pessoais
     if personal_info:
-        attributes['altura'] = normalize_score(personal_info.get('altura', 170), 150, 210)
-        attributes['peso'] = normalize_score(personal_info.get('peso', 70), 45, 120)
-        attributes['envergadura'] = normalize_score(personal_info.get('envergadura', 170), 150, 210)
+        attributes['altura'] = test_processor.normalize_score(personal_info.get('altura', 170), 150, 210)
+        attributes['peso'] = test_processor.normalize_score(personal_info.get('peso', 70), 45, 120)
+        attributes['envergadura'] = test_processor.normalize_score(personal_info.get('envergadura', 170), 150, 210)
     
     # Identificar pontos fortes e a desenvolver
     sorted_attrs = sorted(attributes.items(), key=lambda x: x[1], reverse=True)
@@ -708,26 +707,38 @@ def show_recommendations():
                 'fatores_psicologicos': st.session_state.test_results['fatores_psicologicos']
             }
 
-            # Processar scores para o gráfico radar
-            processed_scores = process_test_results(st.session_state.test_results)
-            if not processed_scores:
-                st.error("Erro ao processar resultados dos testes.")
-                return
-                
-            st.session_state.processed_scores = processed_scores
+            # Reexecuções sem mudança nas entradas reutilizam o resultado em cache
+            cache = recommendation_cache.get_recommendation_cache()
+            cache_key = recommendation_cache.fingerprint(user_data)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                processed_scores, recommendations = cached
+            else:
+                # Processar scores para o gráfico radar
+                processed_scores = test_processor.process_test_results(st.session_state.test_results)
+                if not processed_scores:
+                    st.error("Erro ao processar resultados dos testes.")
+                    return
+
+                # Gerar recomendações; o modelo incremental da sessão recalcula apenas
+                # as etapas afetadas pelos testes alterados desde a última visita
+                if st.session_state.get('incremental_recommender') is None:
+                    st.session_state.incremental_recommender = incremental_scoring.IncrementalRecommender()
+                recommendations = st.session_state.incremental_recommender.recommend(user_data)
+                if not recommendations:
+                    st.error("Não foi possível gerar recomendações com os dados fornecidos.")
+                    return
+
+                cache.put(cache_key, (processed_scores, recommendations))
 
-            # Gerar recomendações
-            recommendations = get_sport_recommendations(user_data)
-            if not recommendations:
-                st.error("Não foi possível gerar recomendações com os dados fornecidos.")
-                return
-                
+            st.session_state.processed_scores = processed_scores
             st.session_state.recommendations = recommendations
 
             # Exibir Radar Chart (Perfil do usuário)
             st.subheader("📊 Seu Perfil")
-            fig = create_radar_chart(st.session_state.processed_scores)
-            st.plotly_chart(fig, use_container_width=True)
+            with instrumentation.timed('page.recommendations.radar_chart'):
+                fig = create_radar_chart(st.session_state.processed_scores)
+                st.plotly_chart(fig, use_container_width=True)
 
             # Exibir contagem de esportes recomendados
             total_recomendacoes = len(st.session_state.recommendations)
@@ -788,12 +799,47 @@ def show_recommendations():
         st.error(f"Erro ao processar recomendações: {str(e)}")
         return
         
+# Nome da etapa de renderização de cada página nas métricas
+PAGE_STAGES = {
+    "Home": "home",
+    "Dados Físicos": "dados_fisicos",
+    "Habilidades Técnicas": "habilidades_tecnicas",
+    "Aspectos Táticos": "aspectos_taticos",
+    "Fatores Psicológicos": "fatores_psicologicos",
+    "Recomendações": "recommendations",
+}
+
+def show_metrics_admin():
+    """Página oculta com as medições guardadas em memória pela instrumentação"""
+    st.title("Métricas do pipeline")
+    buffer = instrumentation.find_sink(instrumentation.RingBufferSink)
+    if buffer is None:
+        st.info(f"Ative o destino em memória com {instrumentation.METRICS_ENV_VAR}=memory para ver as métricas.")
+        return
+
+    st.subheader("Resumo por etapa")
+    st.table([{'etapa': stage, **stats} for stage, stats in buffer.summary().items()])
+
+    st.subheader("Contadores")
+    st.table([{'contador': name, 'valor': value} for name, value in buffer.counters().items()])
+
+    st.subheader("Medições recentes")
+    st.table([
+        {'horário': time.strftime('%H:%M:%S', time.localtime(ts)), 'etapa': stage, 'ms': round(seconds * 1000, 3)}
+        for ts, stage, seconds in buffer.recent()[:100]
+    ])
+
 def main():
     # Verifica se é um reset
     if "reset" in st.query_params:
         reset_session_state()
         st.query_params.clear()
     
+    # Página de administração oculta: ?admin=metrics
+    if st.query_params.get("admin") == "metrics":
+        show_metrics_admin()
+        return
+
     # Inicializa o estado da sessão
     if 'initialized' not in st.session_state:
         init_session_state()
@@ -810,18 +856,28 @@ def main():
         )
     
     # Conteúdo baseado na seleção do menu
-    if selected == "Home":
-        show_home()
-    elif selected == "Dados Físicos":
-        show_dados_fisicos()
-    elif selected == "Habilidades Técnicas":
-        show_habilidades_tecnicas()
-    elif selected == "Aspectos Táticos":
-        show_aspectos_taticos()
-    elif selected == "Fatores Psicológicos":
-        show_fatores_psicologicos()
-    elif selected == "Recomendações":
-        show_recommendations()
+    with instrumentation.timed(f"page.{PAGE_STAGES.get(selected, 'other')}"):
+        if selected == "Home":
+            show_home()
+        elif selected == "Dados Físicos":
+            show_dados_fisicos()
+        elif selected == "Habilidades Técnicas":
+            show_habilidades_tecnicas()
+        elif selected == "Aspectos Táticos":
+            show_aspectos_taticos()
+        elif selected == "Fatores Psicológicos":
+            show_fatores_psicologicos()
+        elif selected == "Recomendações":
+            show_recommendations()
+    
+    report_import_profile()
+
+def report_import_profile():
+    """Registra o perfil de importação uma vez por processo, no modo de perfil"""
+    profiler = get_import_profiler()
+    if profiler is not None and not profiler.reported:
+        profiler.reported = True
+        print(profiler.report())
 
 if __name__ == "__main__":
     # Esconder menu hamburger e outros elementos do Streamlit
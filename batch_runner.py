@@ -0,0 +1,225 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from utils import json_output
+from utils.cohort import athletes_to_frame, cohort_recommendation_lists
+from utils.event_catalog import get_event_catalog
+from utils.test_processor import process_test_results_frame
+
+DEFAULT_SHARD_SIZE = 1000
+
+# Coluna de identificação copiada da entrada para a saída
+ID_COLUMN = 'id'
+
+# Coluna interna com o erro de leitura das linhas JSONL inválidas
+INPUT_ERROR_COLUMN = '_input_error'
+
+
+def count_athletes(path: str) -> int:
+    """Número de atletas do arquivo (linhas não vazias, sem o cabeçalho do CSV)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = sum(1 for line in f if line.strip())
+    return lines - 1 if path.endswith('.csv') and lines else lines
+
+
+def read_shards(path: str, shard_size: int, skip: int = 0) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """
+    Lê o arquivo de atletas (CSV com as colunas de ATHLETE_FIELDS ou JSONL com um
+    user_data por linha) em blocos de `shard_size`, pulando os `skip` primeiros.
+    Retorna (índice do primeiro atleta do bloco, tabela do bloco). Linhas JSONL
+    inválidas ocupam sua posição no bloco, com o erro em INPUT_ERROR_COLUMN.
+    """
+    if path.endswith('.csv'):
+        start = 0
+        for chunk in pd.read_csv(path, chunksize=shard_size):
+            chunk = chunk.reset_index(drop=True)
+            if start + len(chunk) > skip:
+                offset = max(skip - start, 0)
+                yield start + offset, chunk.iloc[offset:].reset_index(drop=True)
+            start += len(chunk)
+        return
+
+    batch: List[Dict[str, Any]] = []
+    ids: List[Any] = []
+    errors: List[Any] = []
+    index = 0
+    first = skip
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if index >= skip:
+                athlete, error = _parse_line(line)
+                ids.append(athlete.get(ID_COLUMN))
+                errors.append(error)
+                batch.append(athlete)
+                if len(batch) == shard_size:
+                    yield first, athletes_to_frame(batch).assign(**{ID_COLUMN: ids, INPUT_ERROR_COLUMN: errors})
+                    first += len(batch)
+                    batch, ids, errors = [], [], []
+            index += 1
+    if batch:
+        yield first, athletes_to_frame(batch).assign(**{ID_COLUMN: ids, INPUT_ERROR_COLUMN: errors})
+
+
+def _parse_line(line: str) -> Tuple[Dict[str, Any], Any]:
+    """Atleta de uma linha JSONL e o erro de leitura (um atleta vazio quando a linha é inválida)"""
+    try:
+        athlete = json.loads(line)
+    except ValueError as e:
+        return {}, f"JSON inválido: {str(e)}"
+    if not isinstance(athlete, dict):
+        return {}, "A linha não é um objeto JSON no formato user_data"
+    return athlete, None
+
+
+def _clean_id(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _score_rows(athletes: pd.DataFrame) -> Tuple[List[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Recomendações e scores dos testes de cada linha da tabela, na ordem da entrada"""
+    recommendations = cohort_recommendation_lists(athletes)
+    scores = process_test_results_frame(athletes).to_dict('records')
+    return recommendations, scores
+
+
+def score_shard(task: Tuple[int, pd.DataFrame]) -> Tuple[int, List[str]]:
+    """
+    Pontua um bloco de atletas e retorna as linhas JSON da saída, na ordem da entrada.
+    Se o bloco falhar, os atletas são pontuados um a um e cada atleta com erro
+    (ou linha de entrada inválida) recebe uma linha com "error" no lugar dos
+    resultados, sem interromper a execução. NaN é gravado como null.
+    """
+    start, athletes = task
+    athletes = athletes.reset_index(drop=True)
+    ids = athletes[ID_COLUMN].tolist() if ID_COLUMN in athletes.columns else [None] * len(athletes)
+    errors = athletes[INPUT_ERROR_COLUMN].tolist() if INPUT_ERROR_COLUMN in athletes.columns else [None] * len(athletes)
+
+    try:
+        recommendations, scores = _score_rows(athletes)
+        results = [{'scores': scores[row], 'recommendations': recommendations[row]}
+                   for row in range(len(athletes))]
+    except Exception:
+        results = []
+        for row in range(len(athletes)):
+            try:
+                recommendations, scores = _score_rows(athletes.iloc[[row]])
+                results.append({'scores': scores[0], 'recommendations': recommendations[0]})
+            except Exception as e:
+                results.append({'error': f"{type(e).__name__}: {str(e)}"})
+
+    lines = []
+    for row, result in enumerate(results):
+        if isinstance(errors[row], str):
+            result = {'error': errors[row]}
+        lines.append(json_output.dumps({
+            'index': start + row,
+            'id': _clean_id(ids[row]),
+            **result
+        }))
+    return len(athletes), lines
+
+
+def _init_worker() -> None:
+    """Carrega o catálogo uma vez por processo (já herdado quando o pool usa fork)"""
+    get_event_catalog()
+
+
+def completed_athletes(output_path: str) -> int:
+    """
+    Atletas já gravados na saída. Uma linha final incompleta (queda no meio da
+    gravação) é removida, e a execução continua a partir dela.
+    """
+    if not os.path.exists(output_path):
+        return 0
+    with open(output_path, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b'\n') + 1
+        if end != len(data):
+            f.truncate(end)
+    return data[:end].count(b'\n')
+
+
+def run_batch(input_path: str, output_path: str, workers: int = None, shard_size: int = DEFAULT_SHARD_SIZE,
+              resume: bool = False, progress=None) -> int:
+    """
+    Pontua todos os atletas do arquivo de entrada e grava uma linha JSON por atleta,
+    na mesma ordem da entrada. Com `resume`, continua uma execução interrompida.
+    Retorna o número de atletas processados nesta execução.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = count_athletes(input_path)
+    done = completed_athletes(output_path) if resume else 0
+    processed = 0
+
+    # Carregado antes do pool: com fork, os workers herdam o catálogo já construído
+    get_event_catalog()
+    shards = read_shards(input_path, shard_size, skip=done)
+
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as output:
+        def write(result):
+            nonlocal done, processed
+            count, lines = result
+            if lines:
+                output.write("\n".join(lines) + "\n")
+                output.flush()
+                os.fsync(output.fileno())
+            done += count
+            processed += count
+            if progress:
+                progress(done, total)
+
+        if workers == 1:
+            for task in shards:
+                write(score_shard(task))
+            return processed
+
+        method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        with multiprocessing.get_context(method).Pool(workers, initializer=_init_worker) as pool:
+            # Janela limitada de blocos em andamento; a gravação segue a ordem de envio
+            pending = deque()
+            for task in shards:
+                pending.append(pool.apply_async(score_shard, (task,)))
+                if len(pending) >= workers * 2:
+                    write(pending.popleft().get())
+            while pending:
+                write(pending.popleft().get())
+    return processed
+
+
+def _print_progress(started_at: float):
+    def progress(done: int, total: int) -> None:
+        elapsed = time.perf_counter() - started_at
+        print(f"\r{done}/{total} atletas ({elapsed:.1f}s)", end='', file=sys.stderr, flush=True)
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pontua uma turma de atletas em lote, com vários processos")
+    parser.add_argument('input', help="Arquivo de atletas (.csv com as colunas da tabela de atletas ou .jsonl)")
+    parser.add_argument('output', help="Arquivo JSONL de saída (uma linha por atleta, na ordem da entrada)")
+    parser.add_argument('--workers', type=int, default=None, help="Número de processos (padrão: CPUs)")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help="Atletas por bloco de trabalho")
+    parser.add_argument('--resume', action='store_true', help="Continua uma execução interrompida")
+    args = parser.parse_args(argv)
+
+    started_at = time.perf_counter()
+    processed = run_batch(args.input, args.output, args.workers, args.shard_size, args.resume,
+                          progress=_print_progress(started_at))
+    print(f"\n{processed} atletas processados em {time.perf_counter() - started_at:.1f}s -> {args.output}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from config.config import TESTS_CONFIG
+from generate_translations import traduzir_evento
+from utils import diagnostics
+from utils.age_adjusted_calculations import calculate_age_adjusted_frame, calculate_age_adjusted_score
+from utils.age_bands import AGE_PARAMETERS_PATH, METRICS, get_age_band_table
+from utils.cohort import (
+    CHUNK_SIZE, athletes_to_frame, athlete_component_scores, row_to_user_data,
+    _athlete_recommendations, _column
+)
+from utils.event_catalog import EventCatalog, DEFAULT_CATALOG_PATH, GENDERS, get_event_catalog
+from utils.requirement_profiles import get_requirement_matrix
+from utils.scoring_engine import athlete_biometric_matrix, physical_matrix, final_matrix, best_event_per_sport_matrix
+from utils.sport_helper import get_sport_recommendations
+from utils.synthetic_athletes import edge_case_athletes, synthetic_cohort
+from utils.test_processor import process_test_results, process_test_results_frame
+
+DEFAULT_SIZES = [1, 100, 10_000, 100_000]
+STAGES = ['load', 'filter', 'score', 'group', 'rank', 'translate']
+
+# Testes com parâmetros por idade em config/test_parameters.json
+AGE_ADJUSTED_TESTS = ['dados_fisicos', 'habilidades_tecnicas']
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    """Percentis de latência em milissegundos"""
+    values = np.asarray(samples) * 1000
+    return {
+        'count': int(values.size),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p90_ms': float(np.percentile(values, 90)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'max_ms': float(values.max())
+    }
+
+
+def _time_calls(function: Callable, arguments: List[tuple]) -> Dict[str, float]:
+    samples = []
+    for args in arguments:
+        start = time.perf_counter()
+        function(*args)
+        samples.append(time.perf_counter() - start)
+    return _percentiles(samples)
+
+
+def run_pipeline(athletes: List[Dict[str, Any]], catalog_path: str = DEFAULT_CATALOG_PATH) -> Dict[str, float]:
+    """
+    Executa o pipeline em lote (mesmos passos de cohort_recommendation_lists)
+    e retorna o tempo gasto em cada etapa, em segundos
+    """
+    stages = dict.fromkeys(STAGES, 0.0)
+
+    start = time.perf_counter()
+    catalog = EventCatalog.from_csv(catalog_path)
+    stages['load'] = time.perf_counter() - start
+
+    # Tradução a frio de todos os nomes do catálogo
+    start = time.perf_counter()
+    traduzir_evento.cache_clear()
+    for genero in GENDERS:
+        for name in catalog.partition(genero).names:
+            traduzir_evento(name)
+    stages['translate'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = athletes_to_frame(athletes)
+    is_male = (frame['genero'] == 'Masculino').to_numpy()
+    groups = [('Masculino', np.flatnonzero(is_male)), ('Feminino', np.flatnonzero(~is_male))]
+    stages['filter'] = time.perf_counter() - start
+
+    for genero, positions in groups:
+        partition = catalog.partition(genero)
+        arrays = partition.arrays
+        for chunk_start in range(0, len(positions), CHUNK_SIZE):
+            start = time.perf_counter()
+            chunk = frame.iloc[positions[chunk_start:chunk_start + CHUNK_SIZE]]
+            stages['filter'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            components = athlete_component_scores(chunk)
+            physical = physical_matrix(components['velocity'], components['strength_upper'],
+                                       components['strength_lower'], arrays)
+            physical = np.where(components['has_physical'][:, None], physical, 50.0)
+            biometric = athlete_biometric_matrix(_column(chunk, 'altura', np.nan), _column(chunk, 'peso', np.nan),
+                                                 _column(chunk, 'idade', np.nan),
+                                                 chunk['genero'].to_numpy(dtype=object), arrays)
+            scores = final_matrix(biometric, physical, components['technical'], components['team'], arrays)
+            stages['score'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            best_idx, best_scores = best_event_per_sport_matrix(scores, arrays)
+            stages['group'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            for row, record in enumerate(chunk.to_dict('records')):
+                _athlete_recommendations(row_to_user_data(record), partition, best_idx[row], best_scores[row])
+            stages['rank'] += time.perf_counter() - start
+    return stages
+
+
+def measure_latencies(athletes: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Latência por chamada das funções públicas, atleta a atleta"""
+    age_adjusted_calls = [
+        (athlete[test_type][test_name], test_type, test_name, athlete['idade'], athlete['genero'])
+        for athlete in athletes
+        for test_type in AGE_ADJUSTED_TESTS
+        for test_name in TESTS_CONFIG[test_type]['tests']
+    ]
+    names = sorted({str(n) for genero in GENDERS for n in get_event_catalog().partition(genero).names})
+    traduzir_evento.cache_clear()
+    return {
+        'get_sport_recommendations': _time_calls(get_sport_recommendations, [(a,) for a in athletes]),
+        'process_test_results': _time_calls(process_test_results, [(a,) for a in athletes]),
+        'calculate_age_adjusted_score': _time_calls(calculate_age_adjusted_score, age_adjusted_calls),
+        'traduzir_evento_cold': _time_calls(traduzir_evento, [(n,) for n in names]),
+        'traduzir_evento_warm': _time_calls(traduzir_evento, [(n,) for n in names]),
+    }
+
+
+def check_age_adjusted_parity(athletes: List[Dict[str, Any]]) -> float:
+    """
+    Compara calculate_age_adjusted_frame com calculate_age_adjusted_score célula a
+    célula (testes numéricos informados) e retorna a maior diferença absoluta
+    """
+    frame = calculate_age_adjusted_frame(athletes_to_frame(athletes))
+    worst = 0.0
+    for row, athlete in enumerate(athletes):
+        for test_type in AGE_ADJUSTED_TESTS:
+            for test_name, value in (athlete.get(test_type) or {}).items():
+                if not isinstance(value, (int, float)) or athlete.get('idade') is None:
+                    continue
+                expected = calculate_age_adjusted_score(value, test_type, test_name,
+                                                        athlete['idade'], athlete['genero'])
+                worst = max(worst, abs(frame[test_name].iloc[row] - expected))
+    return worst
+
+
+def _band_by_walk(params: Dict[str, Any], genero, idade, metric: str, value):
+    """Faixa de um valor percorrendo o JSON de faixas por idade (referência para a verificação)"""
+    if genero is None or idade is None or value is None:
+        return None
+    age = min(max(int(idade), 10), 18)
+    for age_key, metrics in params.get(str(genero).lower(), {}).items():
+        first, _, last = age_key.partition('-')
+        if int(first) <= age <= int(last or first):
+            bands = list(metrics[metric].items())
+            for name, (low, high) in bands:
+                if value < high:
+                    return name
+            return bands[-1][0]
+    return None
+
+
+def check_age_band_parity(athletes: List[Dict[str, Any]]) -> int:
+    """
+    Compara a classificação vetorizada de biotipo por idade com a busca no JSON
+    atleta a atleta e retorna o número de divergências
+    """
+    with open(AGE_PARAMETERS_PATH, 'r', encoding='utf-8') as f:
+        params = json.load(f)
+    frame = athletes_to_frame(athletes)
+    classified = get_age_band_table().classify_cohort(frame)
+    mismatches = 0
+    for row, athlete in enumerate(athletes):
+        for metric in METRICS:
+            value = (athlete.get('biotipo') or {}).get(metric)
+            expected = _band_by_walk(params, athlete.get('genero'), athlete.get('idade'), metric, value)
+            mismatches += classified[f'{metric}_faixa'].iloc[row] != expected
+    return int(mismatches)
+
+
+def check_requirement_similarity_parity(athletes: List[Dict[str, Any]]) -> float:
+    """
+    Compara a similaridade de requisitos da turma (produto de matrizes) com o
+    cosseno ponderado calculado atleta a atleta e esporte a esporte e retorna a
+    maior diferença absoluta
+    """
+    requirements = get_requirement_matrix()
+    cohort = requirements.match_cohort(athletes_to_frame(athletes)).to_numpy()
+    worst = 0.0
+    for row, athlete in enumerate(athletes):
+        profile = requirements.athlete_vector(athlete)
+        measured = ~np.isnan(profile)
+        weights = requirements.weights[measured]
+        values = profile[measured]
+        relative = values - (weights * values).sum() / weights.sum() if weights.sum() else values * 0
+        for sport in range(len(requirements.names)):
+            demands = requirements.centered[sport][measured]
+            norm = np.sqrt((weights * relative ** 2).sum()) * np.sqrt((weights * demands ** 2).sum())
+            expected = (weights * relative * demands).sum() / norm if norm > 0 else 0.0
+            worst = max(worst, abs(cohort[row, sport] - expected))
+    return worst
+
+
+def _peak_memory(function: Callable, *args) -> float:
+    """Pico de memória alocada (MB) durante a chamada, medido com tracemalloc"""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_size(size: int, latency_samples: int, measure_memory: bool, seed: int) -> Dict[str, Any]:
+    athletes = synthetic_cohort(size, seed)
+    stages = run_pipeline(athletes)
+    total = sum(stages.values())
+    result = {
+        'size': size,
+        'stages_s': stages,
+        'total_s': total,
+        'throughput_athletes_per_s': size / total if total else None,
+        'latency': measure_latencies(athletes[:latency_samples]),
+    }
+    if measure_memory:
+        result['peak_memory_mb'] = _peak_memory(run_pipeline, athletes)
+    return result
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run_benchmarks(sizes: List[int], latency_samples: int = 200, measure_memory: bool = True,
+                   seed: int = 42) -> Dict[str, Any]:
+    # Aquece o catálogo compartilhado (e o cache binário) antes das medições
+    get_event_catalog()
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'seed': seed,
+        },
+        'results': [benchmark_size(size, latency_samples, measure_memory, seed) for size in sizes]
+    }
+
+
+def format_report(report: Dict[str, Any], baseline: Dict[str, Any] = None) -> str:
+    """Tabela resumida; com uma linha de base, mostra a razão atual/base do tempo total"""
+    baseline_totals = {r['size']: r['total_s'] for r in (baseline or {}).get('results', [])}
+    lines = [f"Commit {report['meta']['commit'] or '?'} ({report['meta']['timestamp']})"]
+    header = f"{'atletas':>8} " + " ".join(f"{s:>9}" for s in STAGES) + \
+             f" {'total (s)':>10} {'atletas/s':>10} {'pico MB':>8}"
+    if baseline_totals:
+        header += f" {'vs base':>8}"
+    lines.append(header)
+    for result in report['results']:
+        line = f"{result['size']:>8} " + " ".join(f"{result['stages_s'][s]:>9.4f}" for s in STAGES)
+        line += f" {result['total_s']:>10.4f} {result['throughput_athletes_per_s'] or 0:>10.0f}"
+        line += f" {result.get('peak_memory_mb', float('nan')):>8.1f}"
+        if result['size'] in baseline_totals:
+            line += f" {result['total_s'] / baseline_totals[result['size']]:>7.2f}x"
+        lines.append(line)
+
+    lines.append("")
+    lines.append(f"{'latência (ms)':<30} {'p50':>8} {'p90':>8} {'p99':>8}")
+    for name, stats in report['results'][-1]['latency'].items():
+        lines.append(f"{name:<30} {stats['p50_ms']:>8.3f} {stats['p90_ms']:>8.3f} {stats['p99_ms']:>8.3f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de scoring e recomendação (sem Streamlit)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Tamanhos das turmas sintéticas")
+    parser.add_argument('--latency-samples', type=int, default=200,
+                        help="Atletas usados na medição de latência por chamada")
+    parser.add_argument('--no-memory', action='store_true', help="Não mede o pico de memória (tracemalloc)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help="Arquivo JSON com os resultados")
+    parser.add_argument('--baseline', default=None, help="JSON de uma execução anterior para comparação")
+    parser.add_argument('--check', action='store_true',
+                        help="Apenas verifica a paridade das versões vetorizadas com as escalares")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        # A paridade de process_test_results_frame é verificada em tests/test_test_processor.py
+        worst = check_age_adjusted_parity(synthetic_cohort(max(args.sizes), args.seed) + edge_case_athletes())
+        print(f"calculate_age_adjusted_frame: maior diferença {worst:.3g}")
+        mismatches = check_age_band_parity(synthetic_cohort(max(args.sizes), args.seed) + edge_case_athletes())
+        print(f"faixas de biotipo por idade: {mismatches} divergências")
+        # Referência atleta a atleta: amostra limitada para manter a verificação rápida
+        worst_requirements = check_requirement_similarity_parity(
+            synthetic_cohort(min(max(args.sizes), 1000), args.seed) + edge_case_athletes())
+        print(f"similaridade de requisitos: maior diferença {worst_requirements:.3g}")
+        worst = max(worst, worst_requirements)
+        if worst > 1e-9 or mismatches:
+            sys.exit(1)
+        return
+
+    # Mensagens de diagnóstico por atleta distorceriam as medições
+    diagnostics.set_diagnostics_sink(diagnostics.DiagnosticsSink())
+    report = run_benchmarks(args.sizes, args.latency_samples, not args.no_memory, args.seed)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print(format_report(report, baseline))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Resultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,3 @@
-import streamlit as st
-
 # OpenAI Configuration
 OPENAI_MODEL = "gpt-4-turbo-preview"
 
@@ -9,6 +7,9 @@ APP_ICON = "🏃‍♂️"
 APP_VERSION = "1.0.0"
 
 # Configurações dos Testes
+# "min"/"max" são os limites de entrada; "score" é a faixa usada para normalizar o
+# resultado em 0-100 (utils/normalization.py). "compatibility_score", quando
+# presente, substitui "score" no cálculo de compatibilidade com os esportes.
 TESTS_CONFIG = {
     "dados_fisicos": {
         "name": "Dados Físicos",
@@ -20,6 +21,7 @@ TESTS_CONFIG = {
                 "description": "Tempo para percorrer 20 metros em linha reta",
                 "min": 3.0,
                 "max": 6.0,
+                "score": {"min": 2.5, "max": 5.0, "inverse": True},
                 "reference": {
                     "iniciante": ">4.0s",
                     "intermediario": "3.5-4.0s",
@@ -32,6 +34,7 @@ TESTS_CONFIG = {
                 "description": "Número máximo de flexões em 1 minuto",
                 "min": 0,
                 "max": 50,
+                "score": {"min": 0, "max": 50, "inverse": False},
                 "reference": {
                     "iniciante": "10-15",
                     "intermediario": "16-25",
@@ -44,6 +47,7 @@ TESTS_CONFIG = {
                 "description": "Número máximo de agachamentos em 1 minuto",
                 "min": 0,
                 "max": 60,
+                "score": {"min": 0, "max": 60, "inverse": False},
                 "reference": {
                     "iniciante": "20-30",
                     "intermediario": "31-40",
@@ -62,6 +66,7 @@ TESTS_CONFIG = {
                 "description": "Número de alternâncias em 30 segundos",
                 "min": 0,
                 "max": 50,
+                "score": {"min": 0, "max": 50, "inverse": False},
                 "reference": {
                     "iniciante": "<20",
                     "intermediario": "20-30",
@@ -74,6 +79,7 @@ TESTS_CONFIG = {
                 "description": "Número de acertos em 10 tentativas",
                 "min": 0,
                 "max": 10,
+                "score": {"min": 0, "max": 10, "inverse": False},
                 "reference": {
                     "iniciante": "3-4",
                     "intermediario": "5-7",
@@ -86,6 +92,7 @@ TESTS_CONFIG = {
                 "description": "Tempo no teste do quadrado 4x4m",
                 "min": 8,
                 "max": 15,
+                "score": {"min": 5, "max": 15, "inverse": True},
                 "reference": {
                     "iniciante": ">12s",
                     "intermediario": "10-12s",
@@ -98,6 +105,7 @@ TESTS_CONFIG = {
                 "description": "Tempo em equilíbrio em uma perna",
                 "min": 0,
                 "max": 120,
+                "score": {"min": 0, "max": 60, "inverse": False},
                 "reference": {
                     "iniciante": "<20s",
                     "intermediario": "20-40s",
@@ -116,6 +124,7 @@ TESTS_CONFIG = {
                 "description": "Acertos em teste de reação",
                 "min": 0,
                 "max": 10,
+                "score": {"min": 0, "max": 10, "inverse": False},
                 "reference": {
                     "iniciante": "3-4",
                     "intermediario": "5-7",
@@ -128,6 +137,7 @@ TESTS_CONFIG = {
                 "description": "Acertos em teste de memorização",
                 "min": 0,
                 "max": 10,
+                "score": {"min": 0, "max": 10, "inverse": False},
                 "reference": {
                     "iniciante": "3-4",
                     "intermediario": "5-7",
@@ -140,6 +150,7 @@ TESTS_CONFIG = {
                 "description": "Precisão no posicionamento",
                 "min": 1,
                 "max": 10,
+                "score": {"min": 1, "max": 10, "inverse": False},
                 "reference": {
                     "iniciante": "1-3",
                     "intermediario": "4-7",
@@ -155,6 +166,8 @@ TESTS_CONFIG = {
             "motivacao": {
                 "name": "Motivação",
                 "unit": "escala",
+                "score": {"min": 0, "max": 10, "inverse": False},
+                "compatibility_score": {"min": 1, "max": 10, "inverse": False},
                 "components": {
                     "dedicacao": {
                         "name": "Dedicação aos treinos",
@@ -176,6 +189,8 @@ TESTS_CONFIG = {
             "resiliencia": {
                 "name": "Resiliência",
                 "unit": "escala",
+                "score": {"min": 0, "max": 10, "inverse": False},
+                "compatibility_score": {"min": 1, "max": 10, "inverse": False},
                 "components": {
                     "derrotas": {
                         "name": "Lidar com derrotas",
@@ -197,6 +212,8 @@ TESTS_CONFIG = {
             "trabalho_equipe": {
                 "name": "Trabalho em Equipe",
                 "unit": "escala",
+                "score": {"min": 0, "max": 10, "inverse": False},
+                "compatibility_score": {"min": 1, "max": 10, "inverse": False},
                 "components": {
                     "comunicacao": {
                         "name": "Comunicação em grupo",
@@ -240,6 +257,7 @@ RECOMMENDATION_CONFIG = {
     "min_compatibility": 70,  # Compatibilidade mínima para recomendar um esporte
     "max_recommendations": 5,  # Número máximo de recomendações
     "confidence_threshold": 0.8,  # Limiar de confiança para recomendações
+    "age_adjusted_biometric_weight": 0.0,  # Peso do score biométrico ajustado pela idade (0 = desligado)
     "sports_data_path": "data/sport_profiles.json"  # Caminho para o arquivo de perfis dos esportes
 }
 
@@ -1,30 +1,35 @@
-import pandas as pd
+import argparse
+import hashlib
 import json
+import os
+import re
+from functools import lru_cache
+import pandas as pd
+
+# Mapeamento de categorias (a primeira encontrada, na ordem do dicionário, é usada)
+CATEGORIAS = {
+    'Middleweight': 'Peso Médio',
+    'Lightweight': 'Peso Leve',
+    'Heavyweight': 'Peso Pesado',
+    'Featherweight': 'Peso Pena',
+    'Flyweight': 'Peso Mosca',
+    'Welterweight': 'Peso Meio-Médio',
+    'Light Heavyweight': 'Peso Meio-Pesado',
+    'Super Heavyweight': 'Peso Super-Pesado',
+    'Discus Throw': 'Lançamento de Disco',
+    'Javelin Throw': 'Lançamento de Dardo',
+    'Shot Put': 'Arremesso de Peso',
+    'Hammer Throw': 'Lançamento de Martelo',
+    'Long Jump': 'Salto em Distância',
+    'High Jump': 'Salto em Altura',
+    'Triple Jump': 'Salto Triplo',
+    'Pole Vault': 'Salto com Vara'
+}
 
 def format_sport_name(sport_name: str) -> str:
     """Formata o nome do esporte com suas especificações"""
-    # Mapeamento de categorias
-    categorias = {
-        'Middleweight': 'Peso Médio',
-        'Lightweight': 'Peso Leve',
-        'Heavyweight': 'Peso Pesado',
-        'Featherweight': 'Peso Pena',
-        'Flyweight': 'Peso Mosca',
-        'Welterweight': 'Peso Meio-Médio',
-        'Light Heavyweight': 'Peso Meio-Pesado',
-        'Super Heavyweight': 'Peso Super-Pesado',
-        'Discus Throw': 'Lançamento de Disco',
-        'Javelin Throw': 'Lançamento de Dardo',
-        'Shot Put': 'Arremesso de Peso',
-        'Hammer Throw': 'Lançamento de Martelo',
-        'Long Jump': 'Salto em Distância',
-        'High Jump': 'Salto em Altura',
-        'Triple Jump': 'Salto Triplo',
-        'Pole Vault': 'Salto com Vara'
-    }
-    
     # Traduzir especificações (mantendo a ordem correta em português)
-    for en, pt in categorias.items():
+    for en, pt in CATEGORIAS.items():
         if en in sport_name:
             # Remover a especificação em inglês
             sport_name = sport_name.replace(en, '')
@@ -39,6 +44,14 @@ def format_sport_name(sport_name: str) -> str:
     
     return sport_name
 
+def _remove_repeated_words(text: str) -> str:
+    """Remove palavras consecutivas repetidas"""
+    clean_words = []
+    for word in text.split():
+        if not clean_words or word != clean_words[-1]:
+            clean_words.append(word)
+    return " ".join(clean_words)
+
 def clean_event_name(event_name: str) -> str:
     """Remove duplicações e limpa o nome do evento"""
     # Guardar o gênero
@@ -52,42 +65,107 @@ def clean_event_name(event_name: str) -> str:
     event_name = event_name.replace("Men's ", "").replace("Women's ", "")
     
     # Remover duplicações
-    words = event_name.split()
-    clean_words = []
-    for word in words:
-        if not clean_words or word != clean_words[-1]:
-            clean_words.append(word)
+    cleaned_name = _remove_repeated_words(event_name)
     
     # Reconstruir o nome com o gênero original
-    cleaned_name = " ".join(clean_words)
     if gender:
         cleaned_name = f"{gender} {cleaned_name}"
     
     return cleaned_name
 
+# Lista de esportes compostos
+COMPOSITE_SPORTS = {
+    "Beach Volleyball",
+    "Water Polo",
+    "Table Tennis",
+    "Figure Skating",
+    "Speed Skating"
+}
+
 def get_base_sport_name(event_name: str) -> str:
     """Extrai o nome base do esporte do evento"""
     # Remover gênero
     event_name = event_name.replace("Men's ", "").replace("Women's ", "")
     
-    # Lista de esportes compostos
-    composite_sports = [
-        "Beach Volleyball",
-        "Water Polo",
-        "Table Tennis",
-        "Figure Skating",
-        "Speed Skating"
-    ]
-    
     # Verificar se é um esporte composto
     words = event_name.split()
     if len(words) >= 2:
         two_word_sport = f"{words[0]} {words[1]}"
-        if two_word_sport in composite_sports:
+        if two_word_sport in COMPOSITE_SPORTS:
             return two_word_sport
     
     return words[0] if words else event_name
 
+# Dicionário de traduções básicas dos esportes
+TRADUCOES = {
+    'Swimming': 'Natação',
+    'Athletics': 'Atletismo',
+    'Gymnastics': 'Ginástica',
+    'Basketball': 'Basquete',
+    'Volleyball': 'Vôlei',
+    'Beach Volleyball': 'Vôlei de Praia',
+    'Water Polo': 'Polo Aquático',
+    'Football': 'Futebol',
+    'Handball': 'Handebol',
+    'Rugby': 'Rugby',
+    'Tennis': 'Tênis',
+    'Table Tennis': 'Tênis de Mesa',
+    'Boxing': 'Boxe',
+    'Wrestling': 'Luta Livre',
+    'Judo': 'Judô',
+    'Taekwondo': 'Taekwondo',
+    'Karate': 'Karatê',
+    'Fencing': 'Esgrima',
+    'Shooting': 'Tiro',
+    'Archery': 'Tiro com Arco',
+    'Cycling': 'Ciclismo',
+    'Rowing': 'Remo',
+    'Sailing': 'Vela',
+    'Canoe': 'Canoagem',
+    'Equestrian': 'Hipismo',
+    
+    # Eventos específicos
+    'Singles': 'Individual',
+    'Doubles': 'Duplas',
+    'Mixed Doubles': 'Duplas Mistas',
+    'Team': 'Equipe',
+    'Relay': 'Revezamento',
+    'Marathon': 'Maratona',
+    'Race': 'Corrida',
+    'Sprint': 'Velocidade',
+    
+    # Estilos de natação
+    'Freestyle': 'Livre',
+    'Backstroke': 'Costas',
+    'Breaststroke': 'Peito',
+    'Butterfly': 'Borboleta',
+    'Medley': 'Medley',
+    
+    # Unidades de medida
+    'metres': 'metros',
+    'm': 'm',
+    'km': 'km'
+}
+
+def _compile_translation_rules(traducoes: dict):
+    """
+    Compila o dicionário em uma única expressão regular com alternância.
+    As traduções eram aplicadas em sequência na ordem do dicionário, então uma
+    chave que contém uma chave anterior nunca chega a ser aplicada (ex.: 'Beach
+    Volleyball' depois de 'Volleyball') e traduções idênticas não alteram o texto;
+    ambas ficam de fora e as demais mantêm a ordem original na alternância.
+    """
+    rules = {}
+    for en, pt in traducoes.items():
+        if en == pt or any(previous in en for previous in rules):
+            continue
+        rules[en] = pt
+    pattern = re.compile("|".join(re.escape(en) for en in rules))
+    return pattern, rules
+
+_TRANSLATION_PATTERN, _TRANSLATION_RULES = _compile_translation_rules(TRADUCOES)
+
+@lru_cache(maxsize=4096)
 def traduzir_evento(evento: str) -> str:
     """Traduz eventos olímpicos de inglês para português"""
     # Guardar o gênero
@@ -98,68 +176,11 @@ def traduzir_evento(evento: str) -> str:
     evento = clean_event_name(evento)
     evento = evento.replace("Men's ", "").replace("Women's ", "")
     
-    # Dicionário de traduções básicas dos esportes
-    traducoes = {
-        'Swimming': 'Natação',
-        'Athletics': 'Atletismo',
-        'Gymnastics': 'Ginástica',
-        'Basketball': 'Basquete',
-        'Volleyball': 'Vôlei',
-        'Beach Volleyball': 'Vôlei de Praia',
-        'Water Polo': 'Polo Aquático',
-        'Football': 'Futebol',
-        'Handball': 'Handebol',
-        'Rugby': 'Rugby',
-        'Tennis': 'Tênis',
-        'Table Tennis': 'Tênis de Mesa',
-        'Boxing': 'Boxe',
-        'Wrestling': 'Luta Livre',
-        'Judo': 'Judô',
-        'Taekwondo': 'Taekwondo',
-        'Karate': 'Karatê',
-        'Fencing': 'Esgrima',
-        'Shooting': 'Tiro',
-        'Archery': 'Tiro com Arco',
-        'Cycling': 'Ciclismo',
-        'Rowing': 'Remo',
-        'Sailing': 'Vela',
-        'Canoe': 'Canoagem',
-        'Equestrian': 'Hipismo',
-        
-        # Eventos específicos
-        'Singles': 'Individual',
-        'Doubles': 'Duplas',
-        'Mixed Doubles': 'Duplas Mistas',
-        'Team': 'Equipe',
-        'Relay': 'Revezamento',
-        'Marathon': 'Maratona',
-        'Race': 'Corrida',
-        'Sprint': 'Velocidade',
-        
-        # Estilos de natação
-        'Freestyle': 'Livre',
-        'Backstroke': 'Costas',
-        'Breaststroke': 'Peito',
-        'Butterfly': 'Borboleta',
-        'Medley': 'Medley',
-        
-        # Unidades de medida
-        'metres': 'metros',
-        'm': 'm',
-        'km': 'km'
-    }
-    
-    # Traduzir usando o dicionário (do maior para o menor para evitar substituições parciais)
-    for en, pt in sorted(traducoes.items(), key=len, reverse=True):
-        evento = evento.replace(en, pt)
+    # Traduzir todos os termos em uma única passada
+    evento = _TRANSLATION_PATTERN.sub(lambda match: _TRANSLATION_RULES[match.group(0)], evento)
     
     # Remover duplicações após tradução
-    words = evento.split()
-    clean_words = []
-    for word in words:
-        if not clean_words or word != clean_words[-1]:
-            clean_words.append(word)
-    evento = " ".join(clean_words)
+    evento = _remove_repeated_words(evento)
     
     # Adicionar gênero
     if is_male:
@@ -169,3 +190,120 @@ def traduzir_evento(evento: str) -> str:
     
     # Formatar o nome final
     return format_sport_name(evento)
+
+def translate_many(names) -> list:
+    """Traduz uma sequência de nomes de eventos, traduzindo cada nome distinto uma única vez"""
+    translated = {name: traduzir_evento(name) for name in dict.fromkeys(names)}
+    return [translated[name] for name in names]
+
+# Categorias de peso, da mais específica para a mais genérica
+_WEIGHT_CLASS_PATTERN = re.compile("|".join(
+    re.escape(en) for en in sorted((k for k in CATEGORIAS if k.endswith('weight')), key=len, reverse=True)
+))
+
+SOURCE_CATALOG_PATH = os.path.join('data', 'perfil_eventos_olimpicos_verao.csv')
+
+def derived_catalog_path(source_path: str) -> str:
+    """Caminho do catálogo derivado gerado a partir do CSV de origem"""
+    root, ext = os.path.splitext(source_path)
+    return f"{root}_catalogo{ext}"
+
+# Primeira linha do catálogo derivado: hashes do CSV de origem e das regras usadas para gerá-lo
+CATALOG_HEADER_PREFIX = '# '
+
+def source_hash(source_path: str) -> str:
+    """Hash do conteúdo do CSV de origem (independente do mtime, que um checkout não preserva)"""
+    with open(source_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def rules_hash() -> str:
+    """
+    Hash das regras que definem as colunas derivadas: traduções (TRADUCOES,
+    CATEGORIAS), esportes compostos e regras de atributos (utils.event_tags)
+    """
+    from utils.event_tags import TAG_RULES
+
+    rules = {
+        'traducoes': TRADUCOES,
+        'categorias': CATEGORIAS,
+        'composite_sports': sorted(COMPOSITE_SPORTS),
+        'tag_rules': [[rule.tag.name, list(rule.keywords), rule.case_sensitive] for rule in TAG_RULES],
+    }
+    payload = json.dumps(rules, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def catalog_hashes(source_path: str) -> dict:
+    """Hashes que identificam o catálogo derivado esperado para o CSV de origem e as regras atuais"""
+    return {'source_sha256': source_hash(source_path), 'rules_sha256': rules_hash()}
+
+def read_catalog_hashes(derived_path: str):
+    """Hashes gravados no cabeçalho do catálogo derivado, ou None (arquivo ausente ou sem cabeçalho)"""
+    try:
+        with open(derived_path, 'r', encoding='utf-8') as f:
+            first_line = f.readline().rstrip('\r\n')
+    except OSError:
+        return None
+    if not first_line.startswith(CATALOG_HEADER_PREFIX):
+        return None
+    fields = [field.partition('=') for field in first_line[len(CATALOG_HEADER_PREFIX):].split()]
+    return {key: value for key, sep, value in fields if sep}
+
+def get_event_gender(event_name: str) -> str:
+    """Gênero do evento a partir do nome em inglês"""
+    if "Men's" in event_name:
+        return 'Masculino'
+    if "Women's" in event_name:
+        return 'Feminino'
+    return 'Misto'
+
+def get_weight_class(event_name: str) -> str:
+    """Categoria de peso do evento (em inglês) ou string vazia"""
+    match = _WEIGHT_CLASS_PATTERN.search(event_name)
+    return match.group(0) if match else ''
+
+def build_catalog_frame(olympic_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Acrescenta ao CSV olímpico as colunas derivadas usadas pelo app:
+    name_pt, base_sport, base_sport_pt, is_team, gender e weight_class
+    """
+    from utils.event_tags import EventTag, has_tag
+
+    catalog = olympic_data.copy()
+    names = catalog['Event'].tolist()
+    base_sports = [get_base_sport_name(n) for n in names]
+
+    catalog['name_pt'] = translate_many(names)
+    catalog['base_sport'] = base_sports
+    catalog['base_sport_pt'] = [
+        t.replace(" Masculino", "").replace(" Feminino", "") for t in translate_many(base_sports)
+    ]
+    catalog['is_team'] = [has_tag(s, EventTag.TEAM) for s in base_sports]
+    catalog['gender'] = [get_event_gender(n) for n in names]
+    catalog['weight_class'] = [get_weight_class(n) for n in names]
+    return catalog
+
+def build_catalog(source_path: str = SOURCE_CATALOG_PATH, output_path: str = None) -> str:
+    """Gera o arquivo do catálogo derivado e retorna o caminho gravado"""
+    output_path = output_path or derived_catalog_path(source_path)
+    catalog = build_catalog_frame(pd.read_csv(source_path))
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        header = ' '.join(f"{key}={value}" for key, value in catalog_hashes(source_path).items())
+        f.write(f"{CATALOG_HEADER_PREFIX}{header}\n")
+        catalog.to_csv(f, index=False)
+    return output_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ferramentas de tradução do catálogo de eventos olímpicos")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build-catalog', help="Gera o catálogo derivado com nomes traduzidos")
+    build.add_argument('--source', default=SOURCE_CATALOG_PATH, help="CSV de perfis olímpicos")
+    build.add_argument('--output', default=None, help="Arquivo de saída (padrão: <source>_catalogo.csv)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'build-catalog':
+        output_path = build_catalog(args.source, args.output)
+        print(f"Catálogo derivado gravado em {output_path}")
+
+if __name__ == "__main__":
+    main()
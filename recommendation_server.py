@@ -0,0 +1,349 @@
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import math
+import multiprocessing
+import os
+import sys
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import diagnostics, instrumentation, json_output
+from utils.athlete_record import ATHLETE_FIELDS
+from utils.cohort import athletes_to_frame, cohort_recommendation_lists
+from utils.event_catalog import get_event_catalog
+from utils.recommendation_cache import fingerprint, get_recommendation_cache
+
+# Tempo de espera para agrupar pedidos simultâneos em um único lote
+DEFAULT_BATCH_WINDOW = 0.005
+
+# Um lote é enviado ao pool sem esperar a janela quando atinge este tamanho
+DEFAULT_MAX_BATCH = 256
+
+# Limite do corpo das requisições (o endpoint de lote recebe turmas inteiras)
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+MAX_BATCH_ATHLETES = 10_000
+
+GENEROS = ('Masculino', 'Feminino')
+
+# Campos de user_data sem os quais não há recomendação possível
+REQUIRED_FIELDS = ('altura', 'peso')
+
+
+class RequestError(Exception):
+    """Erro de requisição devolvido ao cliente com o status indicado"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringError(Exception):
+    """Falha no scoring de um único atleta do lote"""
+
+
+def _score(athletes: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    return cohort_recommendation_lists(athletes_to_frame(athletes))
+
+
+def score_athletes(athletes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Recomendações de um lote de atletas (executado nos processos do pool), na
+    ordem da entrada. Se o lote falhar, os atletas são pontuados um a um e cada
+    atleta com erro recebe {"error": ...} no lugar de {"recommendations": ...}.
+    """
+    try:
+        return [{'recommendations': recommendations} for recommendations in _score(athletes)]
+    except Exception:
+        results = []
+        for athlete in athletes:
+            try:
+                results.append({'recommendations': _score([athlete])[0]})
+            except Exception as e:
+                results.append({'error': f"{type(e).__name__}: {str(e)}"})
+        return results
+
+
+def _init_worker() -> None:
+    """Carrega o catálogo uma vez por processo (já herdado quando o pool usa fork)"""
+    get_event_catalog()
+
+
+def _cache_key(user_data: Dict[str, Any]) -> str:
+    # O app guarda outro formato de resultado para o mesmo user_data; as chaves não podem coincidir
+    return fingerprint({'service': 'recommendations', 'user_data': user_data})
+
+
+class RecommendationBatcher:
+    """
+    Agrupa os pedidos de recomendação que chegam dentro de `window` segundos em
+    um único lote vetorizado (utils.cohort), executado no pool de workers.
+    Pedidos idênticos em andamento compartilham o mesmo resultado, e resultados
+    já calculados são servidos pelo cache de recomendações.
+    """
+
+    def __init__(self, executor: concurrent.futures.Executor, window: float = DEFAULT_BATCH_WINDOW,
+                 max_batch: int = DEFAULT_MAX_BATCH, cache=None):
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+        self.cache = cache if cache is not None else get_recommendation_cache()
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def recommend(self, user_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Recomendações de um atleta, no formato de get_sport_recommendations"""
+        key = _cache_key(user_data)
+        future = self._in_flight.get(key)
+        if future is not None:
+            instrumentation.increment('service.deduplicated')
+            return await asyncio.shield(future)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._in_flight[key] = future
+        self._pending.append((key, user_data))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            instrumentation.increment('service.batches')
+            instrumentation.increment('service.batched_athletes', len(batch))
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        keys = [key for key, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, score_athletes, [user_data for _, user_data in batch]
+            )
+        except Exception as e:
+            diagnostics.error(f"Erro no lote de recomendações: {str(e)}")
+            for key in keys:
+                future = self._in_flight.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, result in zip(keys, results):
+            future = self._in_flight.pop(key)
+            if 'error' in result:
+                diagnostics.error(f"Erro na recomendação de esportes: {result['error']}")
+                if not future.done():
+                    future.set_exception(ScoringError(result['error']))
+                continue
+            recommendations = result['recommendations']
+            if recommendations:
+                self.cache.put(key, recommendations)
+            if not future.done():
+                future.set_result(recommendations)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _athlete(value: Any) -> Dict[str, Any]:
+    """
+    Valida um atleta no formato user_data: genero, idade e biotipo (altura e
+    peso) são obrigatórios; os demais testes podem faltar ou ser null, mas quando
+    informados devem ser numéricos
+    """
+    if not isinstance(value, dict):
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Cada atleta deve ser um objeto JSON no formato user_data")
+    if value.get('genero') not in GENEROS:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f'"genero" deve ser um de: {", ".join(GENEROS)}')
+    if not _is_number(value.get('idade')):
+        raise RequestError(HTTPStatus.BAD_REQUEST, '"idade" deve ser numérico')
+
+    for column, path in ATHLETE_FIELDS.items():
+        parent = value
+        for depth, key in enumerate(path[:-1], 1):
+            parent = parent.get(key)
+            if parent is None:
+                break
+            if not isinstance(parent, dict):
+                raise RequestError(HTTPStatus.BAD_REQUEST, f'"{".".join(path[:depth])}" deve ser um objeto JSON')
+        name = '.'.join(path)
+        field = parent.get(path[-1]) if parent is not None else None
+        if column in REQUIRED_FIELDS and field is None:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f'Campo obrigatório ausente: "{name}"')
+        if field is not None and not _is_number(field):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f'"{name}" deve ser numérico')
+    return value
+
+
+class RecommendationService:
+    """
+    Servidor HTTP/JSON (asyncio, sem dependências externas) com os endpoints:
+      GET  /health                  estado do serviço e do cache
+      POST /recommendations         {user_data} -> {"recommendations": [...]}
+      POST /recommendations/batch   {"athletes": [user_data, ...]} -> {"results": [[...], ...]}
+    No endpoint de lote, um atleta cuja pontuação falhou recebe {"error": ...}
+    na sua posição de "results". Valores ausentes (NaN) são enviados como null.
+    """
+
+    def __init__(self, batcher: RecommendationBatcher):
+        self.batcher = batcher
+
+    async def handle_request(self, method: str, path: str, body: bytes) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        instrumentation.increment('service.requests')
+        if path == '/health':
+            if method != 'GET':
+                raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+            return HTTPStatus.OK, {'status': 'ok', 'cache': self.batcher.cache.stats()}
+
+        if path not in ('/recommendations', '/recommendations/batch'):
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Endpoint não encontrado: {path}")
+        if method != 'POST':
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Corpo da requisição não é um JSON válido")
+
+        if path == '/recommendations':
+            recommendations = await self.batcher.recommend(_athlete(payload))
+            return HTTPStatus.OK, {'recommendations': recommendations}
+
+        athletes = payload.get('athletes') if isinstance(payload, dict) else None
+        if not isinstance(athletes, list):
+            raise RequestError(HTTPStatus.BAD_REQUEST, 'O corpo deve ter a lista "athletes"')
+        if len(athletes) > MAX_BATCH_ATHLETES:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                               f"No máximo {MAX_BATCH_ATHLETES} atletas por requisição")
+        athletes = [_athlete(a) for a in athletes]
+        results = await asyncio.gather(*(self.batcher.recommend(a) for a in athletes), return_exceptions=True)
+        for result in results:
+            # Falhas do lote inteiro (ex.: pool de workers encerrado) continuam sendo erro da requisição
+            if isinstance(result, BaseException) and not isinstance(result, ScoringError):
+                raise result
+        return HTTPStatus.OK, {'results': [
+            {'error': "Erro ao calcular as recomendações do atleta"} if isinstance(result, ScoringError) else result
+            for result in results
+        ]}
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """Lê uma requisição HTTP/1.1; retorna None quando o cliente fecha a conexão"""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Linha de requisição inválida")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Content-Length inválido")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo da requisição muito grande")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target.split('?', 1)[0], headers, body
+
+    @staticmethod
+    def _response(status: HTTPStatus, payload: Dict[str, Any], keep_alive: bool) -> bytes:
+        body = json_output.dumps(payload).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode('latin-1') + body
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atende as requisições de uma conexão (keep-alive) até o cliente encerrá-la"""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    status, payload = await self.handle_request(method, path, body)
+                except RequestError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    diagnostics.error(f"Erro no serviço de recomendações: {str(e)}")
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Erro interno"}
+
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+
+def create_executor(workers: int) -> concurrent.futures.Executor:
+    """Pool de processos para o scoring (com 0 workers, uma thread no próprio processo)"""
+    if workers <= 0:
+        return concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    return concurrent.futures.ProcessPoolExecutor(
+        workers, mp_context=multiprocessing.get_context(method), initializer=_init_worker
+    )
+
+
+async def serve(host: str, port: int, workers: int, window: float = DEFAULT_BATCH_WINDOW,
+                max_batch: int = DEFAULT_MAX_BATCH) -> None:
+    # Carregado antes do pool: com fork, os workers herdam o catálogo já construído
+    get_event_catalog()
+    with create_executor(workers) as executor:
+        service = RecommendationService(RecommendationBatcher(executor, window, max_batch))
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        addresses = ', '.join(str(s.getsockname()) for s in server.sockets)
+        print(f"Serviço de recomendações em {addresses}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON de recomendação de esportes")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Processos de scoring (0 = thread no próprio processo)")
+    parser.add_argument('--batch-window', type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="Janela de agrupamento de pedidos, em milissegundos")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="Atletas por lote")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.batch_window / 1000, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# Os testes importam os módulos do app a partir da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import diagnostics
+
+
+@pytest.fixture(autouse=True)
+def quiet_diagnostics():
+    """Descarta as mensagens de diagnóstico dos testes que passam por atletas com erro"""
+    previous = diagnostics.set_diagnostics_sink(diagnostics.DiagnosticsSink())
+    yield
+    diagnostics.set_diagnostics_sink(previous)
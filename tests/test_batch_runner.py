@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+import batch_runner
+from utils.cohort import athletes_to_frame
+from utils.synthetic_athletes import synthetic_cohort
+
+
+@pytest.fixture
+def athletes_csv(tmp_path):
+    """CSV de 25 atletas com um teste em branco na linha 17"""
+    frame = athletes_to_frame(synthetic_cohort(25, seed=3))
+    frame['id'] = [f"a{i}" for i in range(len(frame))]
+    frame['forca_superior'] = frame['forca_superior'].astype(object)
+    frame.loc[17, 'forca_superior'] = ''
+    path = tmp_path / 'atletas.csv'
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+def _reject_constant(name):
+    raise ValueError(f"JSON inválido: {name}")
+
+
+def _read_lines(path):
+    # Leitura estrita: NaN e Infinity não são JSON válido para outras ferramentas
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line, parse_constant=_reject_constant) for line in f]
+
+
+def test_run_batch_continues_past_incomplete_row(athletes_csv, tmp_path):
+    output = str(tmp_path / 'saida.jsonl')
+    assert batch_runner.run_batch(athletes_csv, output, workers=1, shard_size=10) == 25
+
+    lines = _read_lines(output)
+    assert [line['index'] for line in lines] == list(range(25))
+    assert [line['id'] for line in lines] == [f"a{i}" for i in range(25)]
+    assert all('recommendations' in line for line in lines)
+
+
+def test_resume_after_interruption(athletes_csv, tmp_path):
+    expected_path = str(tmp_path / 'completa.jsonl')
+    batch_runner.run_batch(athletes_csv, expected_path, workers=1, shard_size=10)
+    with open(expected_path, 'rb') as f:
+        expected = f.read()
+
+    # Execução interrompida no meio da gravação da linha 13
+    output = str(tmp_path / 'saida.jsonl')
+    end = 0
+    for _ in range(12):
+        end = expected.index(b'\n', end) + 1
+    with open(output, 'wb') as f:
+        f.write(expected[:end + 20])
+
+    assert batch_runner.run_batch(athletes_csv, output, workers=1, shard_size=10, resume=True) == 13
+    with open(output, 'rb') as f:
+        assert f.read() == expected
+
+
+def test_failing_row_gets_error_line(athletes_csv, tmp_path, monkeypatch):
+    score_rows = batch_runner._score_rows
+
+    def failing_on_a17(athletes):
+        if 'a17' in athletes['id'].tolist():
+            raise ValueError("atleta inválido")
+        return score_rows(athletes)
+
+    monkeypatch.setattr(batch_runner, '_score_rows', failing_on_a17)
+    output = str(tmp_path / 'saida.jsonl')
+    assert batch_runner.run_batch(athletes_csv, output, workers=1, shard_size=10) == 25
+
+    lines = _read_lines(output)
+    assert [line['index'] for line in lines] == list(range(25))
+    assert lines[17] == {'index': 17, 'id': 'a17', 'error': "ValueError: atleta inválido"}
+    assert all('recommendations' in line for i, line in enumerate(lines) if i != 17)
+
+    # A execução retomada depois da linha com erro também termina
+    with open(output, 'rb') as f:
+        data = f.read()
+    with open(output, 'wb') as f:
+        f.write(data[:data.index(b'"index": 18') - 1])
+    assert batch_runner.run_batch(athletes_csv, output, workers=1, shard_size=10, resume=True) == 7
+    assert [line['index'] for line in _read_lines(output)] == list(range(25))
+
+
+def test_malformed_jsonl_line_gets_error_line(tmp_path):
+    athletes = synthetic_cohort(12, seed=4)
+    lines = [json.dumps({**athlete, 'id': f"a{i}"}) for i, athlete in enumerate(athletes)]
+    lines[5] = lines[5][:40]
+    lines[9] = '[1, 2]'
+    input_path = tmp_path / 'atletas.jsonl'
+    input_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    output = str(tmp_path / 'saida.jsonl')
+
+    assert batch_runner.run_batch(str(input_path), output, workers=1, shard_size=4) == 12
+    results = _read_lines(output)
+    assert [line['index'] for line in results] == list(range(12))
+    assert set(results[5]) == {'index', 'id', 'error'} and results[5]['error'].startswith("JSON inválido")
+    assert set(results[9]) == {'index', 'id', 'error'}
+    assert all('recommendations' in line for i, line in enumerate(results) if i not in (5, 9))
+
+    # Retomada a partir da linha inválida
+    with open(output, 'rb') as f:
+        data = f.read()
+    with open(output, 'wb') as f:
+        f.write(data[:data.index(b'"index": 5') - 1])
+    assert batch_runner.run_batch(str(input_path), output, workers=1, shard_size=4, resume=True) == 7
+    assert _read_lines(output) == results
@@ -0,0 +1,82 @@
+import json
+import random
+
+from utils.cohort import athletes_to_frame, cohort_recommendation_lists
+from utils.sport_helper import create_sport_recommendation, get_sport_recommendations
+from utils.synthetic_athletes import synthetic_athlete
+
+
+def _json(value):
+    return json.loads(json.dumps(value))
+
+
+def mixed_cohort():
+    """Atletas completos intercalados com atletas com testes ausentes ou vazios"""
+    rng = random.Random(7)
+    athletes = []
+    for i in range(24):
+        athlete = synthetic_athlete(rng)
+        if i % 2:
+            category, test = [
+                ('dados_fisicos', 'velocidade'), ('dados_fisicos', 'forca_superior'),
+                ('habilidades_tecnicas', 'coordenacao'), ('habilidades_tecnicas', 'precisao'),
+                ('aspectos_taticos', 'tomada_decisao'), ('aspectos_taticos', 'visao_jogo'),
+            ][i // 2 % 6]
+            athlete[category][test] = None if i % 4 == 1 else ''
+        athletes.append(athlete)
+    # Sem biotipo: get_sport_recommendations não gera recomendações
+    athletes.append({'genero': 'Feminino', 'idade': 12})
+    return athletes
+
+
+def test_cohort_matches_per_athlete_with_incomplete_athletes():
+    athletes = mixed_cohort()
+    cohort = cohort_recommendation_lists(athletes_to_frame(athletes))
+    assert len(cohort) == len(athletes)
+    for athlete, recommendations in zip(athletes, cohort):
+        assert _json(recommendations) == _json(get_sport_recommendations(athlete))
+    # Testes ausentes não impedem as recomendações do atleta
+    assert any(cohort[i] for i in range(1, 24, 2))
+    assert cohort[-1] == []
+
+
+def string_valued_cohort():
+    """Atletas com testes em texto (numérico ou não), como chegam de formulários e CSVs"""
+    rng = random.Random(11)
+    athletes = []
+    for i in range(40):
+        athlete = synthetic_athlete(rng)
+        tatico = athlete['aspectos_taticos']
+        equipe = athlete['fatores_psicologicos']['trabalho_equipe']
+        if i % 4 == 0:
+            tatico['visao_jogo'] = str(tatico['visao_jogo'])
+            equipe['comunicacao'] = str(equipe['comunicacao'])
+        elif i % 4 == 1:
+            tatico['tomada_decisao'] = f" {tatico['tomada_decisao']} "
+            equipe['contribuicao'] = 'alta'
+        elif i % 4 == 2:
+            athlete['dados_fisicos']['velocidade'] = str(athlete['dados_fisicos']['velocidade'])
+            athlete['habilidades_tecnicas']['precisao'] = 'boa'
+        athletes.append(athlete)
+    return athletes
+
+
+def test_cohort_matches_per_athlete_with_string_values():
+    athletes = string_valued_cohort()
+    cohort = cohort_recommendation_lists(athletes_to_frame(athletes))
+    for athlete, recommendations in zip(athletes, cohort):
+        assert _json(recommendations) == _json(get_sport_recommendations(athlete))
+
+
+def test_create_sport_recommendation_with_missing_tests():
+    athlete = synthetic_athlete(random.Random(1))
+    athlete['dados_fisicos'] = {'velocidade': None, 'forca_superior': ''}
+    athlete['habilidades_tecnicas'] = {}
+    event = {'Event': "Athletics Men's 100 metres", 'idade_media': 24.0, 'altura_media': 180.0,
+             'peso_media': 75.0, 'total_atletas': 10}
+    recommendation = create_sport_recommendation('Athletics', event, 80.0, athlete,
+                                                 sport_pt='Atletismo', event_pt='100 metros')
+    assert "Velocidade excepcional para Atletismo" not in recommendation['strengths']
+    assert recommendation['development'][:3] == [
+        "Melhorar velocidade", "Desenvolver força superior", "Aprimorar coordenação motora"
+    ]
@@ -0,0 +1,91 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import generate_translations
+from generate_translations import SOURCE_CATALOG_PATH, build_catalog, build_catalog_frame
+from utils import diagnostics
+from utils.columnar_cache import load_columnar_cache
+from utils.event_catalog import EventCatalog, load_catalog_frame
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RecordingSink(diagnostics.DiagnosticsSink):
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, message: str) -> None:
+        self.warnings.append(message)
+
+
+@pytest.fixture
+def warnings():
+    sink = RecordingSink()
+    previous = diagnostics.set_diagnostics_sink(sink)
+    yield sink
+    diagnostics.set_diagnostics_sink(previous)
+
+
+@pytest.fixture
+def catalog_files(tmp_path):
+    """Cópia do CSV de origem e o catálogo derivado gerado a partir dela"""
+    source = str(tmp_path / 'eventos.csv')
+    shutil.copyfile(os.path.join(ROOT, SOURCE_CATALOG_PATH), source)
+    return source, build_catalog(source)
+
+
+def _was_rebuilt(sink) -> bool:
+    return any('desatualizado' in message for message in sink.warnings)
+
+
+def test_derived_catalog_used_when_source_only_touched(catalog_files, warnings):
+    source, derived = catalog_files
+    # Checkouts e cópias não preservam o mtime: o arquivo de origem mais novo não invalida o derivado
+    os.utime(derived, (1, 1))
+    catalog = load_catalog_frame(source)
+    assert not _was_rebuilt(warnings)
+    pd.testing.assert_frame_equal(catalog, build_catalog_frame(pd.read_csv(source)))
+
+
+def test_derived_catalog_rebuilt_when_source_changes(catalog_files, warnings):
+    source, derived = catalog_files
+    frame = pd.read_csv(source)
+    frame = frame.iloc[:-1]
+    frame.to_csv(source, index=False)
+    # O derivado continua mais novo que a origem, mas foi gerado de outro conteúdo
+    os.utime(source, (1, 1))
+    catalog = load_catalog_frame(source)
+    assert _was_rebuilt(warnings)
+    assert len(catalog) == len(frame)
+
+
+def _is_mapped(values) -> bool:
+    while values is not None and not isinstance(values, np.memmap):
+        values = values.base
+    return values is not None
+
+
+def test_derived_catalog_rebuilt_when_rules_change(catalog_files, warnings, monkeypatch):
+    source, _ = catalog_files
+    # Tradução editada depois de gerar o catálogo derivado
+    monkeypatch.setitem(generate_translations.TRADUCOES, 'Swimming', 'Nado')
+    load_catalog_frame(source)
+    assert _was_rebuilt(warnings)
+
+
+def test_columnar_cache_is_shared_readable_and_mapped(catalog_files, tmp_path):
+    source, derived = catalog_files
+    cache_dir = str(tmp_path / 'cache')
+    table = load_columnar_cache([source, derived], lambda: load_catalog_frame(source),
+                                group_by='gender', cache_dir=cache_dir)
+    # Workers de outros usuários precisam ler o diretório do cache
+    assert os.stat(table.path).st_mode & 0o777 == 0o755
+
+    partition = EventCatalog.from_table(table, source=source).partition('Masculino')
+    for values in (partition.names, partition.names_pt, partition.arrays['altura']):
+        assert _is_mapped(values)
@@ -0,0 +1,53 @@
+import math
+import os
+import pickle
+import time
+
+from utils.recommendation_cache import RecommendationCache, fingerprint
+
+
+def _recommendations():
+    return [{'name': 'Atletismo 100 metros Masculino', 'compatibility': 81.5,
+             'strengths': ['Velocidade excepcional para Atletismo'], 'development': [],
+             'olympic_data': {'idade_media': 24.0, 'altura_media': float('nan'), 'total_atletas': 3}}]
+
+
+def test_disk_tier_round_trips_json(tmp_path):
+    key = fingerprint({'genero': 'Masculino', 'idade': 15})
+    RecommendationCache(disk_dir=str(tmp_path)).put(key, ({'dados_fisicos': 55.0}, _recommendations()))
+    assert os.listdir(tmp_path) == [f"{key}.json"]
+
+    # Outro processo (cache em memória vazio) lê a entrada gravada em disco
+    cache = RecommendationCache(disk_dir=str(tmp_path))
+    scores, recommendations = cache.get(key)
+    assert scores == {'dados_fisicos': 55.0}
+    assert recommendations[0]['strengths'] == _recommendations()[0]['strengths']
+    assert math.isnan(recommendations[0]['olympic_data']['altura_media'])
+    assert cache.stats()['disk_hits'] == 1
+
+
+def test_disk_tier_never_unpickles(tmp_path):
+    key = fingerprint({'genero': 'Feminino', 'idade': 12})
+    with open(tmp_path / f"{key}.pkl", 'wb') as f:
+        pickle.dump(_recommendations(), f)
+    with open(tmp_path / f"{key}.json", 'wb') as f:
+        f.write(pickle.dumps(_recommendations()))
+
+    cache = RecommendationCache(disk_dir=str(tmp_path))
+    assert cache.get(key) is None
+    # O formato antigo é removido na poda
+    cache.prune_disk()
+    assert not os.path.exists(tmp_path / f"{key}.pkl")
+
+
+def test_prune_disk_limits_entries_and_age(tmp_path):
+    cache = RecommendationCache(ttl=60, disk_dir=str(tmp_path), max_disk_entries=5)
+    now = time.time()
+    for i in range(8):
+        cache.put(f"chave{i}", _recommendations())
+        os.utime(tmp_path / f"chave{i}.json", (now - 10 + i, now - 10 + i))
+    os.utime(tmp_path / "chave0.json", (now - 3600, now - 3600))
+
+    # chave0 expirou; das 7 restantes, as 2 mais antigas passam do limite
+    assert cache.prune_disk() == 3
+    assert sorted(os.listdir(tmp_path)) == [f"chave{i}.json" for i in range(3, 8)]
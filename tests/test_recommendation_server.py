@@ -0,0 +1,137 @@
+import asyncio
+import concurrent.futures
+import copy
+import json
+from http import HTTPStatus
+
+import pytest
+
+import recommendation_server
+from recommendation_server import (RecommendationBatcher, RecommendationService, RequestError,
+                                   ScoringError, _athlete)
+from utils.cohort import athletes_to_frame, cohort_recommendation_lists
+from utils.recommendation_cache import RecommendationCache
+from utils.synthetic_athletes import synthetic_cohort
+
+
+def _service(executor, window=0.05):
+    return RecommendationService(RecommendationBatcher(executor, window=window, cache=RecommendationCache()))
+
+
+def _as_json(results):
+    # olympic_data pode conter NaN, que não é igual a si mesmo
+    return json.dumps(results, sort_keys=True)
+
+
+def _invalid_athletes():
+    athlete = synthetic_cohort(1, seed=5)[0]
+    cases = []
+    for change in (
+        lambda a: a.pop('genero'),
+        lambda a: a.update(idade='vinte'),
+        lambda a: a['biotipo'].pop('peso'),
+        lambda a: a.update(biotipo=[180, 75]),
+        lambda a: a['dados_fisicos'].update(velocidade='rápido'),
+        lambda a: a['fatores_psicologicos'].update(motivacao=5),
+    ):
+        invalid = copy.deepcopy(athlete)
+        change(invalid)
+        cases.append(invalid)
+    return cases
+
+
+def test_athlete_accepts_complete_and_partial_athletes():
+    for athlete in synthetic_cohort(20, seed=5):
+        assert _athlete(athlete) is athlete
+    assert _athlete({'genero': 'Feminino', 'idade': 14, 'biotipo': {'altura': 160, 'peso': 50},
+                     'dados_fisicos': {'velocidade': None}})
+
+
+@pytest.mark.parametrize('athlete', _invalid_athletes())
+def test_athlete_rejects_invalid_fields(athlete):
+    with pytest.raises(RequestError) as error:
+        _athlete(athlete)
+    assert error.value.status == HTTPStatus.BAD_REQUEST
+
+
+def test_invalid_athlete_fails_only_its_own_request():
+    athletes = synthetic_cohort(4, seed=9)
+    invalid = _invalid_athletes()[2]
+
+    async def run():
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            service = _service(executor)
+            requests = [service.handle_request('POST', '/recommendations', json.dumps(a).encode())
+                        for a in athletes + [invalid]]
+            return await asyncio.gather(*requests, return_exceptions=True)
+
+    *valid, rejected = asyncio.run(run())
+    assert isinstance(rejected, RequestError) and rejected.status == HTTPStatus.BAD_REQUEST
+    expected = cohort_recommendation_lists(athletes_to_frame(athletes))
+    assert _as_json([payload['recommendations'] for _, payload in valid]) == _as_json(expected)
+
+
+@pytest.fixture
+def failing_age(monkeypatch):
+    """Faz o scoring falhar para qualquer lote que contenha um atleta com a idade devolvida"""
+    score = recommendation_server._score
+
+    def failing_score(batch):
+        if any(a['idade'] == 99 for a in batch):
+            raise ValueError("atleta inválido")
+        return score(batch)
+
+    monkeypatch.setattr(recommendation_server, '_score', failing_score)
+    return 99
+
+
+def test_scoring_error_fails_only_its_own_future(failing_age):
+    athletes = synthetic_cohort(6, seed=11)
+    athletes[3]['idade'] = failing_age
+
+    async def run():
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = RecommendationBatcher(executor, window=0.05, cache=RecommendationCache())
+            return await asyncio.gather(*(batcher.recommend(a) for a in athletes), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert isinstance(results[3], ScoringError)
+    valid = athletes[:3] + athletes[4:]
+    assert _as_json(results[:3] + results[4:]) == _as_json(cohort_recommendation_lists(athletes_to_frame(valid)))
+
+
+def test_batch_endpoint_reports_scoring_error_per_athlete(failing_age):
+    athletes = synthetic_cohort(6, seed=11)
+    athletes[3]['idade'] = failing_age
+
+    async def run():
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            body = json.dumps({'athletes': athletes}).encode()
+            return await _service(executor).handle_request('POST', '/recommendations/batch', body)
+
+    status, payload = asyncio.run(run())
+    assert status == HTTPStatus.OK
+    results = payload['results']
+    assert list(results[3]) == ['error']
+    valid = athletes[:3] + athletes[4:]
+    assert _as_json(results[:3] + results[4:]) == _as_json(cohort_recommendation_lists(athletes_to_frame(valid)))
+
+
+def _reject_constant(name):
+    raise ValueError(f"JSON inválido: {name}")
+
+
+def test_response_is_strict_json():
+    athletes = synthetic_cohort(6, seed=11)
+
+    async def run():
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            body = json.dumps({'athletes': athletes}).encode()
+            return await _service(executor).handle_request('POST', '/recommendations/batch', body)
+
+    status, payload = asyncio.run(run())
+    response = RecommendationService._response(status, payload, keep_alive=False)
+    body = json.loads(response.split(b'\r\n\r\n', 1)[1], parse_constant=_reject_constant)
+    olympic_data = [r['olympic_data'] for results in body['results'] for r in results]
+    # As médias ausentes dos eventos chegam como null
+    assert any(value is None for data in olympic_data for value in data.values())
@@ -0,0 +1,42 @@
+import pytest
+
+from utils.cohort import athletes_to_frame
+from utils.synthetic_athletes import edge_case_athletes, synthetic_cohort
+from utils.test_processor import process_test_results, process_test_results_frame
+
+
+def incomplete_athletes():
+    """Atletas com testes ausentes, vazios, em texto e categorias faltando"""
+    athletes = edge_case_athletes()
+    base = synthetic_cohort(1, seed=5)[0]
+    athletes.append({**base, 'dados_fisicos': {'velocidade': 'rápido', 'forca_superior': float('nan')}})
+    athletes.append({**base, 'aspectos_taticos': {'tomada_decisao': '7', 'visao_jogo': None}})
+    athletes.append({**base, 'fatores_psicologicos': {
+        'motivacao': {'dedicacao': 'alta', 'frequencia': '', 'comprometimento': None},
+        'trabalho_equipe': {'comunicacao': 8},
+    }})
+    return athletes
+
+
+def _assert_rows_match(athletes):
+    frame = process_test_results_frame(athletes_to_frame(athletes))
+    assert len(frame) == len(athletes)
+    for row, athlete in enumerate(athletes):
+        expected = process_test_results(athlete)
+        assert set(frame.columns) == set(expected)
+        for category, value in expected.items():
+            assert frame[category].iloc[row] == pytest.approx(value, abs=1e-9), (row, category)
+
+
+def test_frame_matches_scalar_for_complete_athletes():
+    _assert_rows_match(synthetic_cohort(500, seed=11))
+
+
+def test_frame_matches_scalar_with_missing_and_non_numeric_values():
+    _assert_rows_match(synthetic_cohort(50, seed=12) + incomplete_athletes())
+
+
+@pytest.mark.parametrize('athlete', incomplete_athletes())
+def test_single_row_frame_matches_scalar(athlete):
+    # Em uma tabela de uma linha, colunas só de texto não têm dtype object
+    _assert_rows_match([athlete])
@@ -1,6 +1,17 @@
 import json
 import os
-from typing import Dict, Any
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Tuple, Optional
+from utils.normalization import TEST_SPEC
+
+LEVELS = ['excelente', 'otimo', 'bom', 'regular', 'fraco']
+
+TEST_PARAMETERS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'config', 'test_parameters.json'
+)
 
 def get_age_group(age: int) -> str:
     """
@@ -18,32 +29,227 @@ def load_test_parameters():
     Carrega os parâmetros de teste do arquivo de configuração
     """
     try:
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        config_path = os.path.join(current_dir, 'config', 'test_parameters.json')
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
+        with open(TEST_PARAMETERS_PATH, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
         print(f"Erro ao carregar parâmetros de teste: {str(e)}")
         return None
 
+def _level_keys(thresholds, inverse) -> np.ndarray:
+    """
+    Limiares convertidos em chaves crescentes para busca binária. O sinal é
+    invertido nos testes em que maior é melhor, e o máximo acumulado torna a
+    sequência ordenada sem mudar o primeiro nível atingido: o nível i é o primeiro
+    atingido pelo valor v exatamente quando i é a primeira chave >= v (com o mesmo sinal).
+    Limiares têm os níveis no último eixo; os demais eixos fazem broadcasting.
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    inverse = np.asarray(inverse, dtype=bool)[..., None]
+    return np.maximum.accumulate(np.where(inverse, thresholds, -thresholds), axis=-1)
+
+def _first_level_reached(values, keys, scores, fraco_score, inverse) -> np.ndarray:
+    """
+    Score do primeiro nível (de excelente a fraco) atingido por cada valor, ou o score
+    de fraco quando nenhum é atingido. Um nível é atingido quando o valor é maior ou
+    igual ao limiar (maior é melhor) ou menor ou igual a ele (testes inversos).
+    `keys` vem de _level_keys; com uma única tabela a busca é np.searchsorted, e com
+    uma tabela por elemento (matrizes do cálculo em lote) a mesma posição é a
+    contagem de chaves menores que o valor.
+    """
+    values = np.asarray(values, dtype=float)
+    query = np.where(inverse, values, -values)
+    levels = keys.shape[-1]
+    if keys.ndim == 1:
+        idx = np.searchsorted(keys, query, side='left')
+    else:
+        idx = np.where(np.isnan(query), levels, (keys < query[..., None]).sum(axis=-1))
+    scores = np.broadcast_to(scores, np.broadcast_shapes(np.shape(scores), idx.shape + (levels,)))
+    score = np.take_along_axis(scores, np.minimum(idx, levels - 1)[..., None], axis=-1)[..., 0]
+    return np.where(idx < levels, score, fraco_score)
+
+def _is_inverse(test_name: str, valores: np.ndarray) -> bool:
+    """
+    Direção do teste: a da especificação de normalização quando o teste está nela;
+    caso contrário, limiares crescentes de excelente para fraco indicam menor é melhor
+    """
+    if test_name in TEST_SPEC.index:
+        return TEST_SPEC.range(test_name)[2]
+    return bool(np.all(np.diff(valores) > 0))
+
+class ThresholdTable:
+    """
+    Limiares e scores de um teste na ordem dos níveis (de excelente a fraco),
+    com a direção do teste (inverse: menor é melhor, ex. velocidade e agilidade)
+    """
+    __slots__ = ('thresholds', 'scores', 'fraco_score', 'inverse', 'keys')
+
+    def __init__(self, test_params: Dict[str, Dict[str, float]], inverse: Optional[bool] = None):
+        self.thresholds = np.array([test_params[level]['valor'] for level in LEVELS], dtype=float)
+        self.scores = np.array([test_params[level]['score'] for level in LEVELS], dtype=float)
+        self.fraco_score = float(test_params['fraco']['score'])
+        self.inverse = bool(np.all(np.diff(self.thresholds) > 0)) if inverse is None else bool(inverse)
+        self.keys = _level_keys(self.thresholds, self.inverse)
+
+    def lookup(self, values) -> np.ndarray:
+        """Score de cada valor: o primeiro nível atingido, de excelente a fraco"""
+        return _first_level_reached(values, self.keys, self.scores, self.fraco_score, self.inverse)
+
+class ParameterStore:
+    """
+    Parâmetros de teste compilados em tabelas indexadas por
+    (gênero, grupo de idade, categoria, teste) e em matrizes densas
+    [grupo (gênero, idade), teste, nível] para o cálculo em lote
+    """
+
+    def __init__(self, params: Dict[str, Any], mtime: Optional[float] = None):
+        self.mtime = mtime
+        self.tables: Dict[Tuple[str, str, str, str], ThresholdTable] = {}
+        self.groups: Dict[Tuple[str, str], int] = {}
+        self.tests: Dict[Tuple[str, str], int] = {}
+        inverse: Dict[Tuple[str, str], bool] = {}
+        for gender, age_groups in params.items():
+            for age_group, categories in age_groups.items():
+                self.groups.setdefault((gender, age_group), len(self.groups))
+                for test_type, tests in categories.items():
+                    for test_name, test_params in tests.items():
+                        self.tests.setdefault((test_type, test_name), len(self.tests))
+                        valores = np.array([test_params[level]['valor'] for level in LEVELS], dtype=float)
+                        test_inverse = inverse.setdefault((test_type, test_name), _is_inverse(test_name, valores))
+                        key = (gender, age_group, test_type, test_name)
+                        self.tables[key] = ThresholdTable(test_params, test_inverse)
+
+        shape = (len(self.groups), len(self.tests), len(LEVELS))
+        self.thresholds = np.full(shape, np.nan)
+        self.scores = np.full(shape, np.nan)
+        self.fraco_scores = np.full(shape[:2], np.nan)
+        self.inverse = np.array([inverse[test] for test in self.tests], dtype=bool)
+        for (gender, age_group, test_type, test_name), table in self.tables.items():
+            group, test = self.groups[(gender, age_group)], self.tests[(test_type, test_name)]
+            self.thresholds[group, test] = table.thresholds
+            self.scores[group, test] = table.scores
+            self.fraco_scores[group, test] = table.fraco_score
+        self.keys = _level_keys(self.thresholds, self.inverse[None, :])
+
+    def table(self, gender: str, age_group: str, test_type: str, test_name: str) -> ThresholdTable:
+        return self.tables[(gender.lower(), age_group, test_type, test_name)]
+
+    def group_index(self, ages, genders) -> np.ndarray:
+        """Índice do grupo (gênero, idade) de cada atleta; -1 quando não há parâmetros"""
+        ages = np.asarray(ages, dtype=float)
+        genders = np.broadcast_to(np.asarray(genders, dtype=object), ages.shape)
+        age_groups = np.where(ages <= 12, "10-12", np.where(ages <= 15, "13-15", "16-18"))
+        return np.array([
+            self.groups.get((str(gender).lower(), age_group), -1) if age == age else -1
+            for gender, age_group, age in zip(genders.ravel(), age_groups.ravel(), ages.ravel())
+        ], dtype=np.intp).reshape(ages.shape)
+
+    def score_matrix(self, values, tests: List[Tuple[str, str]], ages, genders) -> np.ndarray:
+        """
+        Scores ajustados pela idade de uma matriz (atletas x testes) em uma única
+        passada. `tests` lista (categoria, teste) de cada coluna. Valores ausentes (NaN),
+        gêneros desconhecidos e testes sem parâmetros resultam em NaN.
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        groups = self.group_index(np.broadcast_to(np.asarray(ages, dtype=float), values.shape[:1]), genders)
+        columns = np.array([self.tests.get(tuple(test), -1) for test in tests], dtype=np.intp)
+
+        rows = np.maximum(groups, 0)[:, None]
+        cols = np.maximum(columns, 0)[None, :]
+        scores = _first_level_reached(values, self.keys[rows, cols], self.scores[rows, cols],
+                                      self.fraco_scores[rows, cols], self.inverse[cols])
+        valid = (groups >= 0)[:, None] & (columns >= 0)[None, :] & ~np.isnan(values)
+        return np.where(valid, scores, np.nan)
+
+_store: Optional[ParameterStore] = None
+_store_lock = threading.Lock()
+
+def get_parameter_store() -> Optional[ParameterStore]:
+    """
+    Retorna o store de parâmetros em cache, recarregando-o quando o
+    arquivo de configuração é modificado
+    """
+    global _store
+    try:
+        mtime = os.stat(TEST_PARAMETERS_PATH).st_mtime
+    except OSError as e:
+        print(f"Erro ao carregar parâmetros de teste: {str(e)}")
+        return None
+
+    store = _store
+    if store is not None and store.mtime == mtime:
+        return store
+
+    with _store_lock:
+        if _store is None or _store.mtime != mtime:
+            params = load_test_parameters()
+            if not params:
+                return None
+            _store = ParameterStore(params, mtime)
+        return _store
+
 def calculate_age_adjusted_score(value: float, test_type: str, test_name: str, age: int, gender: str) -> float:
     """
     Calcula o score ajustado pela idade para um teste específico
     """
-    params = load_test_parameters()
-    if not params:
+    store = get_parameter_store()
+    if not store:
         return 50  # valor padrão em caso de erro
         
     age_group = get_age_group(age)
-    test_params = params[gender.lower()][age_group][test_type][test_name]
-    
-    # Encontra a classificação mais próxima
-    for level in ['excelente', 'otimo', 'bom', 'regular', 'fraco']:
-        if value >= test_params[level]['valor']:
-            return test_params[level]['score']
-    
-    return test_params['fraco']['score']
+    table = store.table(gender, age_group, test_type, test_name)
+    return float(table.lookup(value))
+
+def calculate_age_adjusted_scores(values, test_type: str, test_name: str, ages, genders) -> np.ndarray:
+    """
+    Versão vetorizada de calculate_age_adjusted_score: recebe arrays de valores,
+    idades e gêneros e classifica cada grupo (gênero, idade) com uma única busca
+    """
+    values = np.asarray(values, dtype=float)
+    store = get_parameter_store()
+    if not store:
+        return np.full(values.shape, 50.0)
+
+    ages = np.broadcast_to(np.asarray(ages), values.shape)
+    genders = np.broadcast_to(np.asarray(genders, dtype=object), values.shape)
+    age_groups = np.where(ages <= 12, "10-12", np.where(ages <= 15, "13-15", "16-18"))
+    gender_keys = np.array([str(g).lower() for g in genders.ravel()], dtype=object).reshape(values.shape)
+
+    scores = np.empty(values.shape)
+    for gender in np.unique(gender_keys):
+        for age_group in np.unique(age_groups):
+            mask = (gender_keys == gender) & (age_groups == age_group)
+            if mask.any():
+                table = store.table(gender, age_group, test_type, test_name)
+                scores[mask] = table.lookup(values[mask])
+    return scores
+
+def calculate_age_adjusted_matrix(values, tests: List[Tuple[str, str]], ages, genders) -> np.ndarray:
+    """
+    Versão em lote de calculate_age_adjusted_score: recebe uma matriz (atletas x testes),
+    a lista (categoria, teste) das colunas e as idades e gêneros dos atletas, e
+    retorna a matriz de scores (NaN para valores ausentes ou sem parâmetros)
+    """
+    store = get_parameter_store()
+    if not store:
+        return np.full(np.atleast_2d(np.asarray(values, dtype=float)).shape, 50.0)
+    return store.score_matrix(values, tests, ages, genders)
+
+def calculate_age_adjusted_frame(athletes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Scores ajustados pela idade de uma turma (colunas genero, idade e uma coluna por
+    teste, como na tabela de atletas de utils.cohort), com uma coluna por teste que
+    tem parâmetros por idade
+    """
+    store = get_parameter_store()
+    tests = list(store.tests) if store else []
+    values = np.column_stack([
+        pd.to_numeric(athletes[name], errors='coerce').to_numpy(dtype=float)
+        if name in athletes.columns else np.full(len(athletes), np.nan)
+        for _, name in tests
+    ]) if tests else np.empty((len(athletes), 0))
+    ages = pd.to_numeric(athletes['idade'], errors='coerce').to_numpy(dtype=float)
+    scores = calculate_age_adjusted_matrix(values, tests, ages, athletes['genero'].to_numpy(dtype=object))
+    return pd.DataFrame(scores, columns=[name for _, name in tests], index=athletes.index)
 
 def get_development_potential(age: int, current_scores: Dict[str, float]) -> float:
     """
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+AGE_PARAMETERS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'config', 'age_parameters.json'
+)
+
+GENDERS = ('masculino', 'feminino')
+METRICS = ('altura', 'peso', 'envergadura')
+
+# Idades cobertas pelo arquivo; idades fora da faixa usam o grupo mais próximo
+MIN_AGE = 10
+MAX_AGE = 18
+
+N_BANDS = 5
+
+_GENDER_INDEX = {gender: i for i, gender in enumerate(GENDERS)}
+
+
+def _expand_age_key(key: str) -> List[int]:
+    """Idades de uma chave do arquivo: "14" -> [14], "17-18" -> [17, 18]"""
+    if '-' in key:
+        first, last = key.split('-')
+        return list(range(int(first), int(last) + 1))
+    return [int(key)]
+
+
+class AgeBandTable:
+    """
+    Faixas de biotipo por idade compiladas em um array denso de limites
+    [gênero, idade, métrica, limite], com N_BANDS + 1 limites por faixa etária.
+    A faixa b de uma métrica vai de limite[b] (inclusive) a limite[b + 1].
+    """
+
+    def __init__(self, params: Dict, mtime: Optional[float] = None):
+        self.mtime = mtime
+        n_ages = MAX_AGE - MIN_AGE + 1
+        self.edges = np.full((len(GENDERS), n_ages, len(METRICS), N_BANDS + 1), np.nan)
+        self.labels: Dict[str, List[str]] = {}
+
+        for g, gender in enumerate(GENDERS):
+            for age_key, metrics in params.get(gender, {}).items():
+                for m, metric in enumerate(METRICS):
+                    bands = metrics[metric]
+                    self.labels.setdefault(metric, list(bands))
+                    limits = [band[0] for band in bands.values()] + [list(bands.values())[-1][1]]
+                    for age in _expand_age_key(age_key):
+                        self.edges[g, age - MIN_AGE, m] = limits
+
+    def _rows(self, genders, ages, metric: str) -> np.ndarray:
+        """Limites de cada atleta (atletas x N_BANDS + 1); NaN para gênero ou idade desconhecidos"""
+        genders = np.atleast_1d(np.asarray(genders, dtype=object))
+        ages = np.broadcast_to(np.asarray(ages, dtype=float), genders.shape)
+        gender_idx = np.array([_GENDER_INDEX.get(str(g).lower(), -1) for g in genders], dtype=np.intp)
+        valid = (gender_idx >= 0) & ~np.isnan(ages)
+        age_idx = np.clip(np.nan_to_num(ages, nan=MIN_AGE).astype(int), MIN_AGE, MAX_AGE) - MIN_AGE
+        rows = self.edges[np.maximum(gender_idx, 0), age_idx, METRICS.index(metric)]
+        return np.where(valid[:, None], rows, np.nan)
+
+    def classify(self, genders, ages, metric: str, values) -> np.ndarray:
+        """Índice da faixa (0 = mais baixa) de cada valor; -1 quando não há como classificar"""
+        edges = self._rows(genders, ages, metric)
+        values = np.broadcast_to(np.asarray(values, dtype=float), edges.shape[:1])
+        with np.errstate(invalid='ignore'):
+            bands = (values[:, None] >= edges[:, 1:N_BANDS]).sum(axis=1)
+        return np.where(np.isnan(values) | np.isnan(edges[:, 0]), -1, bands)
+
+    def band_names(self, genders, ages, metric: str, values) -> np.ndarray:
+        """Nome da faixa de cada valor (ex.: "medio_alto"); None quando não há como classificar"""
+        bands = self.classify(genders, ages, metric, values)
+        names = np.array(self.labels[metric] + [None], dtype=object)
+        return names[bands]
+
+    def percentile(self, genders, ages, metric: str, values) -> np.ndarray:
+        """
+        Posição do valor em 0-100 entre as faixas da idade: cada faixa ocupa 100 / N_BANDS
+        pontos, com interpolação linear dentro da faixa
+        """
+        edges = self._rows(genders, ages, metric)
+        values = np.broadcast_to(np.asarray(values, dtype=float), edges.shape[:1])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bands = np.clip((values[:, None] >= edges[:, 1:N_BANDS]).sum(axis=1), 0, N_BANDS - 1)
+            low = np.take_along_axis(edges, bands[:, None], axis=1)[:, 0]
+            high = np.take_along_axis(edges, bands[:, None] + 1, axis=1)[:, 0]
+            fraction = np.clip((values - low) / (high - low), 0.0, 1.0)
+        return (bands + fraction) * (100.0 / N_BANDS)
+
+    def value_at_percentile(self, genders, ages, metric: str, percentiles) -> np.ndarray:
+        """Inversa de percentile: valor correspondente à posição em 0-100 na faixa da idade"""
+        edges = self._rows(genders, ages, metric)
+        position = np.clip(np.asarray(percentiles, dtype=float), 0.0, 100.0) * (N_BANDS / 100.0)
+        bands = np.clip(np.nan_to_num(np.floor(position)).astype(int), 0, N_BANDS - 1)
+        low = np.take_along_axis(edges, bands[:, None], axis=1)[:, 0]
+        high = np.take_along_axis(edges, bands[:, None] + 1, axis=1)[:, 0]
+        return low + (position - bands) * (high - low)
+
+    def project_adult(self, genders, ages, metric: str, values) -> np.ndarray:
+        """
+        Valor equivalente na idade adulta (MAX_AGE), na mesma posição das faixas.
+        Atletas cuja faixa etária já é a adulta mantêm o valor; sem faixa, o valor
+        original é mantido.
+        """
+        genders = np.atleast_1d(np.asarray(genders, dtype=object))
+        values = np.broadcast_to(np.asarray(values, dtype=float), genders.shape)
+        position = self.percentile(genders, ages, metric, values)
+        projected = self.value_at_percentile(genders, MAX_AGE, metric, position)
+        same_bands = np.all(self._rows(genders, ages, metric) == self._rows(genders, MAX_AGE, metric), axis=1)
+        return np.where(same_bands | np.isnan(projected), values, projected)
+
+    def classify_cohort(self, athletes: pd.DataFrame) -> pd.DataFrame:
+        """
+        Classifica o biotipo de uma turma inteira (colunas genero, idade, altura,
+        peso e envergadura): faixa e posição percentual de cada métrica
+        """
+        genders = athletes['genero'].to_numpy(dtype=object)
+        ages = pd.to_numeric(athletes['idade'], errors='coerce').to_numpy(dtype=float)
+        result = {}
+        for metric in METRICS:
+            if metric not in athletes.columns:
+                continue
+            values = pd.to_numeric(athletes[metric], errors='coerce').to_numpy(dtype=float)
+            result[f'{metric}_faixa'] = pd.Series(self.band_names(genders, ages, metric, values),
+                                                  index=athletes.index, dtype=object)
+            result[f'{metric}_percentil'] = self.percentile(genders, ages, metric, values)
+        return pd.DataFrame(result, index=athletes.index)
+
+
+_table: Optional[AgeBandTable] = None
+_table_lock = threading.Lock()
+
+
+def get_age_band_table() -> Optional[AgeBandTable]:
+    """
+    Retorna as faixas compiladas em cache, recarregando-as quando o arquivo de
+    configuração é modificado
+    """
+    global _table
+    try:
+        mtime = os.stat(AGE_PARAMETERS_PATH).st_mtime
+    except OSError as e:
+        print(f"Erro ao carregar parâmetros por idade: {str(e)}")
+        return None
+
+    table = _table
+    if table is not None and table.mtime == mtime:
+        return table
+
+    with _table_lock:
+        if _table is None or _table.mtime != mtime:
+            try:
+                with open(AGE_PARAMETERS_PATH, 'r', encoding='utf-8') as f:
+                    _table = AgeBandTable(json.load(f), mtime)
+            except Exception as e:
+                print(f"Erro ao carregar parâmetros por idade: {str(e)}")
+                return None
+        return _table
@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional
+
+# Colunas da tabela de atletas e o caminho correspondente no dicionário user_data
+ATHLETE_FIELDS = {
+    'altura': ('biotipo', 'altura'),
+    'peso': ('biotipo', 'peso'),
+    'envergadura': ('biotipo', 'envergadura'),
+    'velocidade': ('dados_fisicos', 'velocidade'),
+    'forca_superior': ('dados_fisicos', 'forca_superior'),
+    'forca_inferior': ('dados_fisicos', 'forca_inferior'),
+    'coordenacao': ('habilidades_tecnicas', 'coordenacao'),
+    'precisao': ('habilidades_tecnicas', 'precisao'),
+    'agilidade': ('habilidades_tecnicas', 'agilidade'),
+    'equilibrio': ('habilidades_tecnicas', 'equilibrio'),
+    'tomada_decisao': ('aspectos_taticos', 'tomada_decisao'),
+    'visao_jogo': ('aspectos_taticos', 'visao_jogo'),
+    'posicionamento': ('aspectos_taticos', 'posicionamento'),
+    'dedicacao': ('fatores_psicologicos', 'motivacao', 'dedicacao'),
+    'frequencia': ('fatores_psicologicos', 'motivacao', 'frequencia'),
+    'comprometimento': ('fatores_psicologicos', 'motivacao', 'comprometimento'),
+    'derrotas': ('fatores_psicologicos', 'resiliencia', 'derrotas'),
+    'criticas': ('fatores_psicologicos', 'resiliencia', 'criticas'),
+    'erros': ('fatores_psicologicos', 'resiliencia', 'erros'),
+    'comunicacao': ('fatores_psicologicos', 'trabalho_equipe', 'comunicacao'),
+    'opinioes': ('fatores_psicologicos', 'trabalho_equipe', 'opinioes'),
+    'contribuicao': ('fatores_psicologicos', 'trabalho_equipe', 'contribuicao'),
+}
+
+# Todas as colunas da tabela de atletas, na ordem de athletes_to_frame
+ATHLETE_COLUMNS = ('genero', 'idade') + tuple(ATHLETE_FIELDS)
+
+
+def _clean(value):
+    """Valor da tabela como no dicionário user_data: NaN vira None e escalares numpy viram tipos Python"""
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _lookup(user_data: Dict[str, Any], path) -> Any:
+    value = user_data
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+class AthleteRecord:
+    """
+    Atleta em um registro compacto de campos fixos (uma entrada por coluna de
+    ATHLETE_COLUMNS), no lugar do dicionário aninhado user_data.
+    Campos não informados ficam vazios e são lidos como None; to_user_data
+    reconstrói apenas os campos informados.
+    """
+
+    __slots__ = ATHLETE_COLUMNS
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def __getattr__(self, name: str):
+        # Chamado apenas para campos não informados
+        if name in ATHLETE_COLUMNS:
+            return None
+        raise AttributeError(name)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AthleteRecord):
+            return NotImplemented
+        return self.fields() == other.fields()
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{name}={value!r}" for name, value in self.fields().items())
+        return f"AthleteRecord({values})"
+
+    def is_set(self, name: str) -> bool:
+        """Se o campo foi informado (mesmo que com None)"""
+        try:
+            object.__getattribute__(self, name)
+        except AttributeError:
+            return False
+        return True
+
+    def fields(self) -> Dict[str, Any]:
+        """Campos informados, na ordem de ATHLETE_COLUMNS"""
+        return {name: getattr(self, name) for name in ATHLETE_COLUMNS if self.is_set(name)}
+
+    def get(self, name: str, default=None):
+        value = getattr(self, name)
+        return default if value is None else value
+
+    @classmethod
+    def from_user_data(cls, user_data: Dict[str, Any]) -> 'AthleteRecord':
+        """Registro a partir do dicionário user_data (chaves fora de ATHLETE_FIELDS são ignoradas)"""
+        record = cls(genero=user_data.get('genero'), idade=user_data.get('idade'))
+        for column, path in ATHLETE_FIELDS.items():
+            parent = _lookup(user_data, path[:-1])
+            if isinstance(parent, dict) and path[-1] in parent:
+                setattr(record, column, parent[path[-1]])
+        return record
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'AthleteRecord':
+        """Registro a partir de uma linha da tabela de atletas (colunas ausentes ficam vazias)"""
+        record = cls(genero=row.get('genero'), idade=_clean(row.get('idade')))
+        for column in ATHLETE_FIELDS:
+            if column in row:
+                setattr(record, column, _clean(row[column]))
+        return record
+
+    def to_user_data(self) -> Dict[str, Any]:
+        """Dicionário user_data equivalente, no formato usado pelos scorers e pelo app"""
+        user_data = {'genero': self.genero, 'idade': self.idade}
+        for column, path in ATHLETE_FIELDS.items():
+            if not self.is_set(column):
+                continue
+            target = user_data
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = getattr(self, column)
+        return user_data
+
+
+class AthleteBatch:
+    """
+    Turma de atletas em formato colunar: um array por coluna de
+    ATHLETE_COLUMNS. Colunas numéricas usam float/int (NaN para valores
+    ausentes); colunas com texto ou valores mistos são mantidas como object,
+    preservando os valores originais.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns: Dict[str, np.ndarray] = dict(columns)
+        self.size = len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> AthleteRecord:
+        return self.record(index)
+
+    @staticmethod
+    def _column(values: List[Any]) -> np.ndarray:
+        """Array de uma coluna com o mesmo tipo inferido pela tabela de atletas"""
+        series = pd.Series(values)
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            return series.to_numpy()
+        return np.array(values, dtype=object)
+
+    @classmethod
+    def from_user_data(cls, athletes: Iterable[Dict[str, Any]]) -> 'AthleteBatch':
+        """Turma a partir de dicionários user_data, sem montar uma tabela intermediária por linha"""
+        athletes = list(athletes)
+        columns = {
+            'genero': cls._column([a.get('genero') for a in athletes]),
+            'idade': cls._column([a.get('idade') for a in athletes]),
+        }
+        for column, path in ATHLETE_FIELDS.items():
+            columns[column] = cls._column([_lookup(a, path) for a in athletes])
+        return cls(columns)
+
+    @classmethod
+    def from_records(cls, records: Iterable[AthleteRecord]) -> 'AthleteBatch':
+        records = list(records)
+        return cls({name: cls._column([getattr(r, name) for r in records]) for name in ATHLETE_COLUMNS})
+
+    @classmethod
+    def from_frame(cls, athletes: pd.DataFrame) -> 'AthleteBatch':
+        """Turma a partir da tabela de atletas (apenas as colunas de ATHLETE_COLUMNS presentes)"""
+        return cls({name: athletes[name].to_numpy() for name in ATHLETE_COLUMNS if name in athletes.columns})
+
+    def record(self, index: int) -> AthleteRecord:
+        """Registro do atleta na posição `index`"""
+        return AthleteRecord.from_row({name: values[index] for name, values in self.columns.items()})
+
+    def records(self) -> List[AthleteRecord]:
+        return [self.record(i) for i in range(self.size)]
+
+    def to_user_data(self) -> List[Dict[str, Any]]:
+        """Dicionários user_data de todos os atletas"""
+        return [self.record(i).to_user_data() for i in range(self.size)]
+
+    def to_frame(self, index: Optional[pd.Index] = None) -> pd.DataFrame:
+        """Tabela de atletas usada pelas funções de turma (utils.cohort)"""
+        return pd.DataFrame(self.columns, index=index)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays (sem contar os objetos referenciados por colunas object)"""
+        return sum(values.nbytes for values in self.columns.values())
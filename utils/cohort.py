@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any
+from utils import diagnostics
+from utils.athlete_record import ATHLETE_FIELDS, AthleteBatch, AthleteRecord
+from utils.event_catalog import get_event_catalog
+from utils.normalization import COMPATIBILITY_SPEC
+from utils.scoring_engine import (
+    athlete_biometric_matrix, physical_matrix, final_matrix, best_event_per_sport_matrix
+)
+from utils.sport_helper import TECHNICAL_TESTS, TopKRecommendations, _build_recommendations
+
+CHUNK_SIZE = 2048
+
+
+def athletes_to_frame(athletes: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Converte uma lista de dicionários user_data em uma tabela de atletas"""
+    return AthleteBatch.from_user_data(athletes).to_frame()
+
+
+def row_to_user_data(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Reconstrói o dicionário user_data de uma linha da tabela de atletas"""
+    return AthleteRecord.from_row(row).to_user_data()
+
+
+def _column(athletes: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """
+    Coluna numérica da tabela (mesma regra de normalization.numeric_value), ou o
+    valor padrão quando a coluna não existe
+    """
+    if name in athletes.columns:
+        return pd.to_numeric(athletes[name], errors='coerce').to_numpy(dtype=float)
+    return np.full(len(athletes), default, dtype=float)
+
+
+def _has_category(athletes: pd.DataFrame, category: str) -> bool:
+    return any(path[0] == category and column in athletes.columns
+               for column, path in ATHLETE_FIELDS.items())
+
+
+def athlete_component_scores(athletes: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Scores que dependem apenas do atleta (um valor por linha), calculados com as
+    mesmas regras de calculate_technical_score, calculate_team_sport_compatibility
+    e calculate_physical_compatibility
+    """
+    n_athletes = len(athletes)
+
+    # Físico: velocidade e força normalizadas com peso de 1.5
+    if _has_category(athletes, 'dados_fisicos'):
+        physical = np.column_stack([_column(athletes, 'velocidade', 5.0),
+                                    _column(athletes, 'forca_superior', 0),
+                                    _column(athletes, 'forca_inferior', 0)])
+        physical = COMPATIBILITY_SPEC.normalize_columns(
+            physical, ('velocidade', 'forca_superior', 'forca_inferior')) * 1.5
+        velocity, strength_upper, strength_lower = physical.T
+        has_physical = np.ones(n_athletes, dtype=bool)
+    else:
+        velocity = strength_upper = strength_lower = np.zeros(n_athletes)
+        has_physical = np.zeros(n_athletes, dtype=bool)
+
+    # Técnico: média dos testes presentes na tabela
+    technical_columns = [c for c in TECHNICAL_TESTS if c in athletes.columns]
+    if technical_columns:
+        values = np.column_stack([_column(athletes, c, np.nan) for c in technical_columns])
+        normalized = COMPATIBILITY_SPEC.normalize_columns(values, technical_columns)
+        total = np.zeros(n_athletes)
+        for column in range(len(technical_columns)):
+            total = total + normalized[:, column]
+        technical = total / len(technical_columns)
+    else:
+        technical = np.full(n_athletes, 50.0)
+
+    # Coletivo: trabalho em equipe e aspectos táticos
+    team = np.full(n_athletes, 70.0)
+    if _has_category(athletes, 'fatores_psicologicos') and \
+            any(c in athletes.columns for c in ('comunicacao', 'opinioes', 'contribuicao')):
+        team_avg = (_column(athletes, 'comunicacao', 5) +
+                    _column(athletes, 'opinioes', 5) +
+                    _column(athletes, 'contribuicao', 5)) / 3
+        team += np.where(team_avg >= 7, 15, np.where(team_avg >= 5, 10, 0))
+    if _has_category(athletes, 'aspectos_taticos'):
+        team += np.where(_column(athletes, 'visao_jogo', 0) >= 7, 10, 0)
+        team += np.where(_column(athletes, 'tomada_decisao', 0) >= 7, 10, 0)
+    team = np.minimum(team, 100.0)
+
+    return {
+        'velocity': velocity,
+        'strength_upper': strength_upper,
+        'strength_lower': strength_lower,
+        'has_physical': has_physical,
+        'technical': technical,
+        'team': team,
+    }
+
+
+def _score_partition(athletes: pd.DataFrame, components: Dict[str, np.ndarray], partition):
+    """Melhor evento e score por modalidade para os atletas de uma partição"""
+    arrays = partition.arrays
+    physical = physical_matrix(components['velocity'], components['strength_upper'],
+                               components['strength_lower'], arrays)
+    physical = np.where(components['has_physical'][:, None], physical, 50.0)
+    biometric = athlete_biometric_matrix(_column(athletes, 'altura', np.nan),
+                                         _column(athletes, 'peso', np.nan),
+                                         _column(athletes, 'idade', np.nan),
+                                         athletes['genero'].to_numpy(dtype=object), arrays)
+    scores = final_matrix(biometric, physical, components['technical'], components['team'], arrays)
+    return best_event_per_sport_matrix(scores, arrays)
+
+
+def _athlete_recommendations(user_data: Dict[str, Any], partition, best_idx: np.ndarray,
+                             best_scores: np.ndarray) -> List[Dict[str, Any]]:
+    """Aplica a seleção final (melhor geral + 70/30) às modalidades de um atleta"""
+    ranking = TopKRecommendations()
+    for code in np.flatnonzero((best_idx >= 0) & (best_scores >= 70)):
+        ranking.push(int(code), float(best_scores[code]), partition.sport_is_team[code])
+    return _build_recommendations(ranking.select(), partition, best_idx, user_data)
+
+
+def cohort_recommendation_lists(athletes: pd.DataFrame, top_n: int = 5) -> List[List[Dict[str, Any]]]:
+    """
+    Recomendações de cada atleta da tabela, no mesmo formato de
+    get_sport_recommendations (uma lista de dicionários por atleta)
+    """
+    catalog = get_event_catalog()
+    athletes = athletes.reset_index(drop=True)
+    results: List[List[Dict[str, Any]]] = [[] for _ in range(len(athletes))]
+    is_male = (athletes['genero'] == 'Masculino').to_numpy()
+    # get_sport_recommendations não gera recomendações sem idade, altura e peso numéricos
+    has_biometrics = ~np.isnan(_column(athletes, 'idade', np.nan) + _column(athletes, 'altura', np.nan)
+                               + _column(athletes, 'peso', np.nan))
+
+    for genero, mask in (('Masculino', is_male), ('Feminino', ~is_male)):
+        partition = catalog.partition(genero)
+        positions = np.flatnonzero(mask)
+        for start in range(0, len(positions), CHUNK_SIZE):
+            chunk_positions = positions[start:start + CHUNK_SIZE]
+            chunk = athletes.iloc[chunk_positions]
+            components = athlete_component_scores(chunk)
+            best_idx, best_scores = _score_partition(chunk, components, partition)
+
+            records = chunk.to_dict('records')
+            for row, position in enumerate(chunk_positions):
+                if not has_biometrics[position]:
+                    continue
+                user_data = row_to_user_data(records[row])
+                # Como em get_sport_recommendations, um atleta com dados inválidos
+                # recebe uma lista vazia sem interromper a turma
+                try:
+                    results[position] = _athlete_recommendations(
+                        user_data, partition, best_idx[row], best_scores[row]
+                    )[:top_n]
+                except Exception as e:
+                    diagnostics.error(f"Erro na recomendação de esportes: {str(e)}")
+                    results[position] = []
+    return results
+
+
+def recommend_cohort(athletes: pd.DataFrame, top_n: int = 5) -> pd.DataFrame:
+    """
+    Gera as recomendações de uma turma inteira de atletas em uma única passada
+    vetorizada sobre o catálogo de eventos.
+
+    `athletes` tem uma linha por atleta com as colunas genero, idade e as colunas
+    de ATHLETE_FIELDS. Retorna uma linha por recomendação, com o índice original
+    do atleta e a posição (rank) no ranking.
+    """
+    rows = []
+    for athlete, recommendations in zip(athletes.index, cohort_recommendation_lists(athletes, top_n)):
+        for rank, recommendation in enumerate(recommendations, start=1):
+            row = {
+                'athlete': athlete,
+                'rank': rank,
+                'name': recommendation['name'],
+                'compatibility': recommendation['compatibility'],
+                'strengths': recommendation['strengths'],
+                'development': recommendation['development'],
+            }
+            row.update(recommendation['olympic_data'])
+            rows.append(row)
+    return pd.DataFrame(rows, columns=[
+        'athlete', 'rank', 'name', 'compatibility', 'strengths', 'development',
+        'idade_media', 'altura_media', 'peso_media', 'total_atletas'
+    ])
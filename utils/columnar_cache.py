@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# Incrementar quando o formato ou as colunas derivadas mudarem
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'data', '.cache'
+)
+
+
+def files_hash(paths: List[str], salt: str = '') -> str:
+    """
+    Hash SHA-256 do conteúdo dos arquivos e da versão do formato do cache; `salt`
+    identifica outras entradas da geração que não estão em arquivos
+    """
+    digest = hashlib.sha256(f"v{CACHE_FORMAT_VERSION}{salt}".encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _column_to_array(values: pd.Series) -> np.ndarray:
+    """Converte uma coluna em array de layout fixo, mapeável em memória"""
+    if values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+        return np.array(values.fillna('').astype(str).tolist(), dtype=str)
+    return values.to_numpy()
+
+
+class ColumnarTable:
+    """
+    Tabela somente leitura com uma coluna por arquivo .npy mapeado em memória.
+    As linhas são agrupadas por uma coluna (ordem estável), de modo que cada
+    grupo é uma fatia contígua de todas as colunas.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.path = path
+        self.source_hash: str = meta['source_hash']
+        self.column_names: List[str] = meta['columns']
+        self.groups: Dict[str, Tuple[int, int]] = {k: tuple(v) for k, v in meta['groups'].items()}
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(os.path.join(path, f"{i}.npy"), mmap_mode='r')
+            for i, name in enumerate(self.column_names)
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns[self.column_names[0]]) if self.column_names else 0
+
+    def group(self, key: str) -> Dict[str, np.ndarray]:
+        """Colunas do grupo como fatias (views) dos arrays mapeados"""
+        start, stop = self.groups.get(key, (0, 0))
+        return {name: values[start:stop] for name, values in self.columns.items()}
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: np.asarray(values) for name, values in self.columns.items()})
+
+
+def write_columnar_cache(frame: pd.DataFrame, path: str, source_hash: str, group_by: str) -> None:
+    """Grava a tabela em um diretório de arquivos .npy, de forma atômica"""
+    # Ordenação estável: dentro de cada grupo a ordem original das linhas é mantida
+    frame = frame.sort_values(group_by, kind='stable').reset_index(drop=True)
+    groups = {}
+    for key, rows in frame.groupby(group_by, sort=False).indices.items():
+        groups[str(key)] = [int(rows[0]), int(rows[-1]) + 1]
+
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+    try:
+        for i, name in enumerate(frame.columns):
+            np.save(os.path.join(tmp_dir, f"{i}.npy"), _column_to_array(frame[name]))
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CACHE_FORMAT_VERSION,
+                'source_hash': source_hash,
+                'columns': list(frame.columns),
+                'groups': groups
+            }, f, ensure_ascii=False)
+        # mkdtemp cria o diretório com modo 0700; o cache é lido por workers de outros usuários
+        os.chmod(tmp_dir, 0o755)
+        try:
+            os.rename(tmp_dir, path)
+        except OSError:
+            # Outro processo gravou o mesmo cache primeiro
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def _remove_stale_caches(cache_dir: str, stem: str, keep: str) -> None:
+    """Remove caches antigos do mesmo arquivo (melhor esforço)"""
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(f"{stem}-") and entry != keep:
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+
+
+def load_columnar_cache(source_paths: List[str], build_frame, group_by: str,
+                        cache_dir: Optional[str] = None, salt: str = '') -> ColumnarTable:
+    """
+    Retorna a tabela binária correspondente aos arquivos de origem, gerando-a com
+    `build_frame()` quando o hash do conteúdo (ou `salt`) muda. Os arrays
+    (numéricos e de texto de largura fixa) são mapeados em memória, então
+    processos no mesmo host compartilham as mesmas páginas físicas.
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    source_hash = files_hash(source_paths, salt)
+    stem = os.path.splitext(os.path.basename(source_paths[0]))[0]
+    entry = f"{stem}-{source_hash[:16]}"
+    path = os.path.join(cache_dir, entry)
+
+    if not os.path.exists(os.path.join(path, 'meta.json')):
+        write_columnar_cache(build_frame(), path, source_hash, group_by)
+        _remove_stale_caches(cache_dir, stem, entry)
+    return ColumnarTable(path)
@@ -0,0 +1,73 @@
+import logging
+from typing import Optional
+
+logger = logging.getLogger('sport_talent_analyzer')
+
+
+class DiagnosticsSink:
+    """
+    Destino das mensagens de diagnóstico e progresso do núcleo de scoring.
+    A implementação base descarta tudo, o que mantém o núcleo sem dependência de UI.
+    """
+
+    def info(self, message: str) -> None:
+        pass
+
+    def warning(self, message: str) -> None:
+        pass
+
+    def error(self, message: str) -> None:
+        pass
+
+    def progress(self, done: int, total: int) -> None:
+        pass
+
+
+class LoggingSink(DiagnosticsSink):
+    """Encaminha as mensagens para o módulo logging (uso headless e em lote)"""
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        self.log = log or logger
+
+    def info(self, message: str) -> None:
+        self.log.info(message)
+
+    def warning(self, message: str) -> None:
+        self.log.warning(message)
+
+    def error(self, message: str) -> None:
+        self.log.error(message)
+
+    def progress(self, done: int, total: int) -> None:
+        self.log.debug("Progresso: %d/%d", done, total)
+
+
+_sink: DiagnosticsSink = LoggingSink()
+
+
+def set_diagnostics_sink(sink: Optional[DiagnosticsSink]) -> DiagnosticsSink:
+    """Define o destino das mensagens do processo e retorna o anterior"""
+    global _sink
+    previous = _sink
+    _sink = sink if sink is not None else DiagnosticsSink()
+    return previous
+
+
+def get_diagnostics_sink() -> DiagnosticsSink:
+    return _sink
+
+
+def info(message: str) -> None:
+    _sink.info(message)
+
+
+def warning(message: str) -> None:
+    _sink.warning(message)
+
+
+def error(message: str) -> None:
+    _sink.error(message)
+
+
+def progress(done: int, total: int) -> None:
+    _sink.progress(done, total)
@@ -0,0 +1,212 @@
+import functools
+import os
+import threading
+import unicodedata
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from generate_translations import build_catalog_frame, catalog_hashes, derived_catalog_path, read_catalog_hashes, rules_hash
+from utils import diagnostics
+from utils.scoring_engine import prepare_events
+from utils.columnar_cache import ColumnarTable, load_columnar_cache
+from utils.event_index import EventIndex
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'data', 'perfil_eventos_olimpicos_verao.csv'
+)
+
+GENDERS = ('Masculino', 'Feminino')
+
+# Colunas agregadas por modalidade em aggregate_by_sport
+AGGREGATE_COLUMNS = ('idade_media', 'altura_media', 'peso_media', 'total_atletas')
+
+
+def _freeze(value):
+    """Marca arrays numpy como somente leitura"""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    return value
+
+
+def load_catalog_frame(path: str = DEFAULT_CATALOG_PATH) -> pd.DataFrame:
+    """
+    Carrega o catálogo derivado (gerado por `python generate_translations.py
+    build-catalog`) quando os hashes gravados nele correspondem ao conteúdo atual
+    do CSV de origem e às regras de tradução e de atributos; caso contrário
+    calcula as colunas derivadas a partir do CSV
+    """
+    derived_path = derived_catalog_path(path)
+    if read_catalog_hashes(derived_path) == catalog_hashes(path):
+        # round_trip preserva exatamente os valores gravados a partir do CSV de origem
+        catalog = pd.read_csv(derived_path, skiprows=1, float_precision='round_trip')
+        catalog['weight_class'] = catalog['weight_class'].fillna('')
+        return catalog
+
+    if os.path.exists(derived_path):
+        diagnostics.warning(
+            f"Catálogo derivado desatualizado: {derived_path}. "
+            "Execute `python generate_translations.py build-catalog`."
+        )
+    return build_catalog_frame(pd.read_csv(path))
+
+
+def sport_key(name) -> str:
+    """Chave normalizada de uma modalidade: minúsculas, sem acentos e sem espaços repetidos"""
+    text = unicodedata.normalize('NFKD', str(name))
+    return ' '.join(''.join(c for c in text if not unicodedata.combining(c)).lower().split())
+
+
+def aggregate_by_sport(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agregados dos eventos por modalidade base e gênero, indexados por
+    (sport_key da modalidade em inglês, gênero): médias de idade, altura e peso
+    (ignorando valores ausentes), total de atletas e número de eventos.
+    As linhas com gênero '' agregam todos os eventos da modalidade.
+    """
+    if 'gender' not in events.columns or 'base_sport' not in events.columns:
+        events = build_catalog_frame(events)
+    frame = events[list(AGGREGATE_COLUMNS)].assign(
+        sport_key=[sport_key(s) for s in events['base_sport']],
+        gender=events['gender'].to_numpy(dtype=object),
+        eventos=1
+    )
+    columns = {c: (c, 'sum' if c in ('total_atletas', 'eventos') else 'mean')
+               for c in AGGREGATE_COLUMNS + ('eventos',)}
+    by_gender = frame.groupby(['sport_key', 'gender'], sort=True).agg(**columns)
+    overall = frame.assign(gender='').groupby(['sport_key', 'gender'], sort=True).agg(**columns)
+    return pd.concat([by_gender, overall]).sort_index()
+
+
+class EventPartition:
+    """
+    Eventos de um gênero em formato colunar, com agrupamento por modalidade
+    base, marcação coletivo/individual e nomes traduzidos pré-calculados
+    """
+
+    def __init__(self, events):
+        """`events` é um DataFrame ou um mapeamento coluna -> array (ex.: fatias do cache binário)"""
+        arrays = prepare_events(events)
+        self.arrays: Dict[str, Any] = {k: _freeze(v) for k, v in arrays.items()}
+        self.names: np.ndarray = self.arrays['names']
+        self.sports: List[str] = list(arrays['sports'])
+        self.sport_codes: np.ndarray = self.arrays['sport_codes']
+        self.sport_is_team: np.ndarray = self.arrays['sport_is_team']
+
+        self.total_atletas: np.ndarray = _freeze(np.asarray(events['total_atletas'], dtype=np.int64))
+        # Nomes traduzidos de largura fixa (cache binário) ficam mapeados, sem cópia por processo
+        names_pt = np.asarray(events['name_pt'])
+        if names_pt.dtype.kind != 'U':
+            names_pt = np.array([str(n) for n in names_pt], dtype=object)
+        self.names_pt: np.ndarray = _freeze(names_pt)
+        sports_pt = np.asarray(events['base_sport_pt'])
+        first_events = self.arrays['sport_order'][self.arrays['sport_starts']] if len(self.names) else []
+        self.sports_pt: np.ndarray = _freeze(np.array([str(n) for n in sports_pt[first_events]], dtype=object))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @functools.cached_property
+    def biometric_index(self) -> EventIndex:
+        """Índice espacial dos eventos por altura, peso e idade médios (construído no primeiro uso)"""
+        return EventIndex(self.arrays)
+
+    def event_record(self, idx: int) -> Dict[str, Any]:
+        """Reconstrói o dicionário de um evento no formato da linha do CSV"""
+        return {
+            'Event': str(self.names[idx]),
+            'idade_media': self.arrays['idade'][idx],
+            'altura_media': self.arrays['altura'][idx],
+            'peso_media': self.arrays['peso'][idx],
+            'total_atletas': self.total_atletas[idx]
+        }
+
+
+class EventCatalog:
+    """
+    Catálogo imutável dos eventos olímpicos, carregado uma vez por processo
+    e particionado por gênero
+    """
+
+    def __init__(self, partitions: Dict[str, EventPartition], total_events: int,
+                 source: Optional[str] = None):
+        self.source = source
+        self.total_events = total_events
+        self._partitions: Dict[str, EventPartition] = dict(partitions)
+
+    @classmethod
+    def from_frame(cls, olympic_data: pd.DataFrame, source: Optional[str] = None) -> 'EventCatalog':
+        if 'gender' not in olympic_data.columns:
+            olympic_data = build_catalog_frame(olympic_data)
+        partitions = {
+            genero: EventPartition(olympic_data[olympic_data['gender'] == genero])
+            for genero in GENDERS
+        }
+        return cls(partitions, len(olympic_data), source)
+
+    @classmethod
+    def from_table(cls, table: ColumnarTable, source: Optional[str] = None) -> 'EventCatalog':
+        """Catálogo sobre as fatias mapeadas em memória do cache binário"""
+        partitions = {genero: EventPartition(table.group(genero)) for genero in GENDERS}
+        return cls(partitions, len(table), source)
+
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_CATALOG_PATH, use_cache: bool = True) -> 'EventCatalog':
+        """
+        Carrega o catálogo pelo cache binário (gerado automaticamente quando o
+        conteúdo do CSV muda) ou, se ele não puder ser usado, diretamente do CSV
+        """
+        if use_cache:
+            sources = [path]
+            derived_path = derived_catalog_path(path)
+            if os.path.exists(derived_path):
+                sources.append(derived_path)
+            try:
+                # As regras entram na chave: com o catálogo derivado desatualizado, as
+                # colunas derivadas vêm das regras atuais, e não dos arquivos
+                table = load_columnar_cache(sources, lambda: load_catalog_frame(path), group_by='gender',
+                                            salt=rules_hash())
+                return cls.from_table(table, source=path)
+            except OSError as e:
+                diagnostics.warning(f"Cache binário do catálogo indisponível: {str(e)}")
+        return cls.from_frame(load_catalog_frame(path), source=path)
+
+    @functools.cached_property
+    def sport_aggregates(self) -> pd.DataFrame:
+        """aggregate_by_sport sobre os eventos das partições (calculado no primeiro uso)"""
+        frames = []
+        for genero, partition in self._partitions.items():
+            frames.append(pd.DataFrame({
+                'base_sport': np.asarray(partition.sports, dtype=object)[partition.sport_codes],
+                'gender': genero,
+                'idade_media': partition.arrays['idade'],
+                'altura_media': partition.arrays['altura'],
+                'peso_media': partition.arrays['peso'],
+                'total_atletas': partition.total_atletas,
+            }))
+        return aggregate_by_sport(pd.concat(frames, ignore_index=True))
+
+    def partition(self, genero: str) -> EventPartition:
+        """Retorna a partição do gênero (qualquer valor diferente de Masculino é Feminino)"""
+        return self._partitions['Masculino' if genero == 'Masculino' else 'Feminino']
+
+
+_catalogs: Dict[str, EventCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_event_catalog(path: str = DEFAULT_CATALOG_PATH) -> EventCatalog:
+    """
+    Retorna o catálogo compartilhado do processo, carregando-o na primeira chamada.
+    Sessões do Streamlit compartilham o mesmo processo e, portanto, o mesmo catálogo;
+    processos criados por fork depois do carregamento herdam a cópia já construída.
+    """
+    path = os.path.abspath(path)
+    catalog = _catalogs.get(path)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(path)
+            if catalog is None:
+                catalog = EventCatalog.from_csv(path)
+                _catalogs[path] = catalog
+    return catalog
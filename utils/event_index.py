@@ -0,0 +1,206 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Coordenadas de cada evento no índice, na mesma ordem de biometric_matrix
+DIMENSIONS = ('altura', 'peso', 'idade')
+
+# Unidade de cada dimensão na distância: um degrau de penalidade de
+# calculate_biometric_compatibility (10 cm, 10 kg e 3 anos)
+SCALES = (10.0, 10.0, 3.0)
+
+LEAF_SIZE = 16
+
+# Distância (em unidades de SCALES) somada por dimensão sem média no evento, para que
+# eventos com dados incompletos não pareçam mais próximos que os demais
+MISSING_DISTANCE = 1.0
+
+
+class KDTree:
+    """
+    Árvore k-d sobre um conjunto fixo de pontos, com busca dos k mais próximos e
+    busca por caixa. Os nós guardam a caixa envolvente dos seus pontos, usada para
+    descartar ramos; as folhas são comparadas de forma vetorizada.
+    Dimensões com peso 0 na consulta são ignoradas na distância.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = LEAF_SIZE):
+        self.points = np.ascontiguousarray(points, dtype=float)
+        self.leaf_size = max(1, leaf_size)
+        self.order = np.arange(len(self.points), dtype=np.intp)
+        # Por nó: (início, fim, mínimos, máximos, filho esquerdo, filho direito); folhas têm filhos -1
+        self.nodes: List[Tuple[int, int, np.ndarray, np.ndarray, int, int]] = []
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _build(self, start: int, end: int) -> int:
+        members = self.order[start:end]
+        coords = self.points[members]
+        node = len(self.nodes)
+        self.nodes.append((start, end, coords.min(axis=0), coords.max(axis=0), -1, -1))
+        if end - start <= self.leaf_size:
+            return node
+
+        # Divide pela mediana da dimensão de maior amplitude
+        dim = int(np.argmax(coords.max(axis=0) - coords.min(axis=0)))
+        middle = (end - start) // 2
+        self.order[start:end] = members[np.argpartition(coords[:, dim], middle, kind='introselect')]
+        left = self._build(start, start + middle)
+        right = self._build(start + middle, end)
+        self.nodes[node] = self.nodes[node][:4] + (left, right)
+        return node
+
+    @staticmethod
+    def _box_distance2(point: np.ndarray, weights: np.ndarray, low: np.ndarray, high: np.ndarray) -> float:
+        gap = np.maximum(low - point, 0.0) + np.maximum(point - high, 0.0)
+        return float(np.dot(gap * weights, gap * weights))
+
+    def query(self, point, k: int, weights=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Os k pontos mais próximos: (distâncias, índices), em ordem crescente de
+        distância e, em empates, de índice
+        """
+        point = np.asarray(point, dtype=float)
+        weights = np.ones_like(point) if weights is None else np.asarray(weights, dtype=float)
+        point = np.where(weights > 0, point, 0.0)
+        best_d2 = np.empty(0)
+        best_idx = np.empty(0, dtype=np.intp)
+        if not self.nodes or k <= 0:
+            return best_d2, best_idx
+
+        stack = [(0.0, 0)]
+        while stack:
+            bound, node = stack.pop()
+            if len(best_d2) == k and bound > best_d2[-1]:
+                continue
+            start, end, _, _, left, right = self.nodes[node]
+            if left < 0:
+                members = self.order[start:end]
+                diff = (self.points[members] - point) * weights
+                d2 = np.einsum('ij,ij->i', diff, diff)
+                d2 = np.concatenate([best_d2, d2])
+                idx = np.concatenate([best_idx, members])
+                keep = np.lexsort((idx, d2))[:k]
+                best_d2, best_idx = d2[keep], idx[keep]
+                continue
+            children = [(self._box_distance2(point, weights, self.nodes[c][2], self.nodes[c][3]), c)
+                        for c in (left, right)]
+            # O filho mais próximo é visitado primeiro
+            children.sort(reverse=True)
+            stack.extend(children)
+        return np.sqrt(best_d2), best_idx
+
+    def query_box(self, point, radius, weights=None) -> np.ndarray:
+        """Índices dos pontos com |ponto - point| <= radius em todas as dimensões com peso"""
+        point = np.asarray(point, dtype=float)
+        weights = np.ones_like(point) if weights is None else np.asarray(weights, dtype=float)
+        active = weights > 0
+        low = np.where(active, point - radius, -np.inf)
+        high = np.where(active, point + radius, np.inf)
+        found = []
+        stack = [0] if self.nodes else []
+        while stack:
+            start, end, node_low, node_high, left, right = self.nodes[stack.pop()]
+            if np.any(node_low > high) or np.any(node_high < low):
+                continue
+            if left < 0 or (np.all(node_low >= low) and np.all(node_high <= high)):
+                members = self.order[start:end]
+                coords = self.points[members]
+                inside = np.all((coords >= low) & (coords <= high), axis=1)
+                found.append(members[inside])
+                continue
+            stack.extend((left, right))
+        return np.concatenate(found) if found else np.empty(0, dtype=np.intp)
+
+
+class EventIndex:
+    """
+    Índice espacial dos eventos de uma partição pelas médias de altura, peso e idade,
+    em unidades de SCALES. Os eventos são agrupados pelas dimensões com média
+    disponível (diferente de 0 e NaN), com uma árvore por grupo; cada dimensão
+    ausente no evento soma `missing_distance` à distância.
+    """
+
+    def __init__(self, arrays: Dict[str, Any], scales: Sequence[float] = SCALES, leaf_size: int = LEAF_SIZE,
+                 missing_distance: float = MISSING_DISTANCE):
+        self.scales = np.asarray(scales, dtype=float)
+        self.missing_distance = missing_distance
+        coords = np.column_stack([np.asarray(arrays[d], dtype=float) for d in DIMENSIONS]) / self.scales
+        valid = (coords != 0) & ~np.isnan(coords)
+        self.size = len(coords)
+        self.groups: List[Tuple[np.ndarray, np.ndarray, Optional[KDTree]]] = []
+        for mask in np.unique(valid, axis=0):
+            events = np.flatnonzero(np.all(valid == mask, axis=1))
+            dims = np.flatnonzero(mask)
+            tree = KDTree(coords[events][:, dims], leaf_size) if len(dims) else None
+            self.groups.append((events, dims, tree))
+
+    def _query_point(self, altura, peso, idade) -> Tuple[np.ndarray, np.ndarray]:
+        point = np.array([altura, peso, idade], dtype=float) / self.scales
+        weights = (~np.isnan(point)).astype(float)
+        return np.nan_to_num(point), weights
+
+    def _missing2(self, dims: np.ndarray, weights: np.ndarray) -> float:
+        """Parcela quadrática das dimensões informadas pelo atleta e ausentes no evento"""
+        missing = np.ones(len(DIMENSIONS), dtype=bool)
+        missing[dims] = False
+        return float((weights[missing] > 0).sum()) * self.missing_distance ** 2
+
+    def nearest(self, altura, peso, idade, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Os k eventos mais próximos do atleta: (índices dos eventos, distâncias), em
+        ordem crescente de distância (empates pelo índice do evento). Valores do
+        atleta ausentes (None/NaN) são ignorados.
+        """
+        point, weights = self._query_point(altura, peso, idade)
+        distances, events = [], []
+        for group_events, dims, tree in self.groups:
+            if tree is None:
+                group_distance = np.zeros(min(k, len(group_events)))
+                group_idx = group_events[:k]
+            else:
+                group_distance, local = tree.query(point[dims], k, weights[dims])
+                group_idx = group_events[local]
+            distances.append(np.sqrt(group_distance ** 2 + self._missing2(dims, weights)))
+            events.append(group_idx)
+        if not distances:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        distances, events = np.concatenate(distances), np.concatenate(events)
+        keep = np.lexsort((events, distances))[:k]
+        return events[keep], distances[keep]
+
+    def within(self, altura, peso, idade, tolerance: Sequence[float] = SCALES) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Eventos cuja diferença para o atleta não passa da tolerância (mesmas unidades
+        de DIMENSIONS) em nenhuma dimensão disponível: (índices, distâncias), em
+        ordem crescente de distância
+        """
+        point, weights = self._query_point(altura, peso, idade)
+        radius = np.asarray(tolerance, dtype=float) / self.scales
+        found = []
+        for group_events, dims, tree in self.groups:
+            if tree is None:
+                found.append(group_events)
+                continue
+            local = tree.query_box(point[dims], radius[dims], weights[dims])
+            found.append(group_events[local])
+        events = np.concatenate(found) if found else np.empty(0, dtype=np.intp)
+        distances = self.distances(events, altura, peso, idade)
+        order = np.lexsort((events, distances))
+        return events[order], distances[order]
+
+    def distances(self, events: np.ndarray, altura, peso, idade) -> np.ndarray:
+        """Distância contínua do atleta a cada evento indicado (busca linear)"""
+        point, weights = self._query_point(altura, peso, idade)
+        distances = np.zeros(len(events))
+        for group_events, dims, tree in self.groups:
+            positions = np.flatnonzero(np.isin(events, group_events))
+            d2 = np.full(len(positions), self._missing2(dims, weights))
+            if tree is not None:
+                local = np.searchsorted(group_events, events[positions])
+                diff = (tree.points[local] - point[dims]) * weights[dims]
+                d2 += np.einsum('ij,ij->i', diff, diff)
+            distances[positions] = np.sqrt(d2)
+        return distances
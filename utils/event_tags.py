@@ -0,0 +1,97 @@
+import enum
+import numpy as np
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple
+
+
+class EventTag(enum.IntFlag):
+    """Atributos de um evento, combináveis como bits de um inteiro"""
+    VELOCITY = enum.auto()        # velocidade relevante (compatibilidade física)
+    STRENGTH = enum.auto()        # força relevante (compatibilidade física)
+    HEIGHT = enum.auto()          # altura favorece o atleta
+    COMPACT = enum.auto()         # faixa de altura de ginástica/luta
+    WEIGHT_CLASS = enum.auto()    # esporte disputado por categoria de peso
+    HEAVYWEIGHT = enum.auto()
+    MIDDLEWEIGHT = enum.auto()
+    LIGHTWEIGHT = enum.auto()
+    WINGSPAN = enum.auto()        # envergadura favorece o atleta
+    POWER = enum.auto()           # ajuste de força do score base
+    SPEED = enum.auto()           # ajuste de velocidade do score base
+    BALANCE = enum.auto()         # ajuste de equilíbrio do score base
+    SPRINT = enum.auto()          # provas de velocidade (process_events_batch)
+    THROW = enum.auto()           # provas de lançamento/levantamento (process_events_batch)
+    BALANCE_EVENT = enum.auto()   # provas de equilíbrio (process_events_batch)
+    INDIVIDUAL = enum.auto()      # evento individual (pesos do score base)
+    REACH = enum.auto()           # envergadura como ponto forte
+    HEAVY_BUILD = enum.auto()     # biotipo pesado como ponto forte
+    ATHLETICS = enum.auto()       # atletismo (áreas de desenvolvimento)
+    TEAM = enum.auto()            # esporte coletivo
+
+
+class TagRule(NamedTuple):
+    tag: EventTag
+    keywords: List[str]
+    case_sensitive: bool = False
+
+
+# Regras que definem cada atributo: o evento recebe o atributo quando o nome
+# contém alguma das palavras-chave
+TAG_RULES = [
+    TagRule(EventTag.VELOCITY, ['Athletics', 'Swimming', 'Cycling', 'Sprint'], case_sensitive=True),
+    TagRule(EventTag.STRENGTH, ['Weightlifting', 'Wrestling', 'Judo', 'Boxing'], case_sensitive=True),
+    TagRule(EventTag.HEIGHT, ['basketball', 'volleyball']),
+    TagRule(EventTag.COMPACT, ['gymnastics', 'wrestling']),
+    TagRule(EventTag.WEIGHT_CLASS, ['boxing', 'wrestling', 'judo']),
+    TagRule(EventTag.HEAVYWEIGHT, ['heavyweight']),
+    TagRule(EventTag.MIDDLEWEIGHT, ['middleweight']),
+    TagRule(EventTag.LIGHTWEIGHT, ['lightweight']),
+    TagRule(EventTag.WINGSPAN, ['swimming', 'boxing', 'basketball']),
+    TagRule(EventTag.POWER, ['weightlifting', 'wrestling', 'boxing']),
+    TagRule(EventTag.SPEED, ['athletics', 'swimming', 'cycling']),
+    TagRule(EventTag.BALANCE, ['gymnastics']),
+    TagRule(EventTag.SPRINT, ['sprint', 'running', '100m', '200m']),
+    TagRule(EventTag.THROW, ['throw', 'weightlifting', 'shot put']),
+    TagRule(EventTag.BALANCE_EVENT, ['gymnastics', 'beam', 'balance']),
+    TagRule(EventTag.INDIVIDUAL, ['Individual'], case_sensitive=True),
+    TagRule(EventTag.REACH, ['swimming', 'boxing']),
+    TagRule(EventTag.HEAVY_BUILD, ['rugby', 'wrestling']),
+    TagRule(EventTag.ATHLETICS, ['athletics']),
+    TagRule(EventTag.TEAM, [
+        'Volleyball', 'Beach Volleyball', 'Basketball', 'Football',
+        'Handball', 'Water Polo', 'Rugby', 'Hockey', 'Baseball',
+        'Softball', 'Vôlei', 'Basquete', 'Futebol', 'Handebol',
+        'Polo Aquático', 'Vôlei de Praia'
+    ]),
+]
+
+_COMPILED_RULES = [
+    (rule.tag, rule.keywords if rule.case_sensitive else [k.lower() for k in rule.keywords], rule.case_sensitive)
+    for rule in TAG_RULES
+]
+
+
+@lru_cache(maxsize=8192)
+def event_tags(name: str) -> int:
+    """Bitset de atributos de um nome de evento ou esporte"""
+    lower = name.lower()
+    tags = 0
+    for tag, keywords, case_sensitive in _COMPILED_RULES:
+        text = name if case_sensitive else lower
+        if any(k in text for k in keywords):
+            tags |= tag
+    return tags
+
+
+def has_tag(name: str, tag: EventTag) -> bool:
+    """Indica se o nome possui o atributo"""
+    return bool(event_tags(name) & tag)
+
+
+def build_tag_index(names: Iterable[str]) -> np.ndarray:
+    """Índice de atributos: um bitset (uint32) por nome"""
+    return np.array([event_tags(str(n)) for n in names], dtype=np.uint32)
+
+
+def tag_mask(index: np.ndarray, tag: EventTag) -> np.ndarray:
+    """Máscara booleana dos eventos do índice que possuem o atributo"""
+    return (index & np.uint32(tag)) != 0
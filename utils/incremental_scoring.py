@@ -0,0 +1,179 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from utils import diagnostics, instrumentation
+from utils.event_catalog import get_event_catalog
+from utils.normalization import COMPATIBILITY_SPEC
+from utils.scoring_engine import (
+    biometric_scores, physical_matrix, physical_scores, final_matrix,
+    best_event_per_sport, best_event_for_sports
+)
+from utils.sport_helper import (
+    TopKRecommendations, _build_recommendations,
+    calculate_technical_score, calculate_team_sport_compatibility
+)
+
+# Acima desta fração de modalidades afetadas, o agrupamento é refeito de uma vez
+REGROUP_FRACTION = 0.25
+
+
+class IncrementalRecommender:
+    """
+    Mantém os resultados intermediários de get_sport_recommendations para um
+    atleta (scores por componente e por evento, melhor evento por modalidade e a
+    seleção final) e, a cada chamada, recalcula apenas o que depende das entradas
+    alteradas. O resultado é sempre igual ao de get_sport_recommendations.
+
+    Dependências de cada etapa:
+      - biométrico (por evento): altura, peso e idade
+      - físico (por evento): velocidade (eventos de velocidade) e força (eventos de força)
+      - técnico (por atleta): habilidades técnicas
+      - coletivo (por atleta): trabalho em equipe e aspectos táticos (eventos coletivos)
+      - melhor evento: apenas as modalidades com algum evento recalculado
+      - seleção: refeita apenas quando muda o melhor score de uma modalidade candidata (>= 70)
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta o estado; a próxima chamada recalcula tudo"""
+        self._partition = None
+        self._keys: Dict[str, Any] = {}
+        self._biometric: Optional[np.ndarray] = None
+        self._physical: Optional[np.ndarray] = None
+        self._scores: Optional[np.ndarray] = None
+        self._best_idx: Optional[np.ndarray] = None
+        self._best_scores: Optional[np.ndarray] = None
+        self._selected: List[Dict] = []
+        self._candidates = 0
+        self.last_update: Dict[str, Any] = {}
+
+    @staticmethod
+    def _input_keys(user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Valores de entrada de cada etapa, já reduzidos ao que a etapa lê"""
+        biotipo = user_data['biotipo']
+        dados_fisicos = user_data.get('dados_fisicos')
+        if dados_fisicos:
+            physical = (
+                COMPATIBILITY_SPEC.normalize('velocidade', dados_fisicos.get('velocidade', 5.0)) * 1.5,
+                COMPATIBILITY_SPEC.normalize('forca_superior', dados_fisicos.get('forca_superior', 0)) * 1.5,
+                COMPATIBILITY_SPEC.normalize('forca_inferior', dados_fisicos.get('forca_inferior', 0)) * 1.5,
+            )
+        else:
+            physical = None
+        return {
+            'biometric': (float(biotipo['altura']), float(biotipo['peso']), float(user_data['idade'])),
+            'physical': physical,
+            'technical': calculate_technical_score(user_data),
+            'team': calculate_team_sport_compatibility(user_data),
+        }
+
+    def _full_update(self, user_data: Dict[str, Any], keys: Dict[str, Any]) -> Tuple[int, int]:
+        arrays = self._partition.arrays
+        self._biometric = biometric_scores(user_data, arrays)
+        self._physical = physical_scores(user_data, arrays)
+        self._scores = final_matrix(self._biometric, self._physical, keys['technical'], keys['team'], arrays)
+        best_idx, best_scores = best_event_per_sport(self._scores, arrays)
+        self._best_idx, self._best_scores = best_idx.copy(), best_scores.copy()
+        return len(self._scores), len(self._best_scores)
+
+    def _dirty_events(self, user_data: Dict[str, Any], keys: Dict[str, Any]) -> np.ndarray:
+        """Atualiza os componentes por evento afetados e retorna a máscara de eventos a repontuar"""
+        arrays = self._partition.arrays
+        previous = self._keys
+        dirty = np.zeros(len(self._scores), dtype=bool)
+
+        if keys['biometric'] != previous['biometric']:
+            self._biometric = biometric_scores(user_data, arrays)
+            dirty[:] = True
+
+        old_physical, physical = previous['physical'], keys['physical']
+        if physical != old_physical:
+            if physical is None or old_physical is None:
+                self._physical = physical_scores(user_data, arrays)
+                dirty[:] = True
+            else:
+                changed = np.zeros_like(dirty)
+                if physical[0] != old_physical[0]:
+                    changed |= arrays['velocity']
+                if physical[1:] != old_physical[1:]:
+                    changed |= arrays['strength']
+                idx = np.flatnonzero(changed)
+                if len(idx):
+                    subset = {'velocity': arrays['velocity'][idx], 'strength': arrays['strength'][idx]}
+                    self._physical[idx] = physical_matrix([physical[0]], [physical[1]], [physical[2]], subset)[0]
+                dirty |= changed
+
+        if keys['technical'] != previous['technical']:
+            dirty[:] = True
+        if keys['team'] != previous['team']:
+            dirty |= arrays['sport_is_team'][arrays['sport_codes']]
+        return dirty
+
+    def _patch(self, dirty: np.ndarray, keys: Dict[str, Any]) -> Tuple[int, int, bool]:
+        """
+        Repontua os eventos marcados e refaz o melhor evento das modalidades afetadas.
+        Retorna (eventos repontuados, modalidades reagrupadas, se a seleção precisa ser refeita)
+        """
+        arrays = self._partition.arrays
+        if dirty.all():
+            self._scores = final_matrix(self._biometric, self._physical, keys['technical'], keys['team'], arrays)
+        else:
+            idx = np.flatnonzero(dirty)
+            subset = {'sport_is_team': arrays['sport_is_team'], 'sport_codes': arrays['sport_codes'][idx]}
+            self._scores[idx] = final_matrix(self._biometric[idx], self._physical[idx],
+                                             keys['technical'], keys['team'], subset)
+
+        codes = np.unique(arrays['sport_codes'][dirty])
+        previous = self._best_scores[codes].copy()
+        if len(codes) > REGROUP_FRACTION * len(self._best_scores):
+            best_idx, best_scores = best_event_per_sport(self._scores, arrays)
+            self._best_idx, self._best_scores = best_idx.copy(), best_scores.copy()
+        else:
+            best_event_for_sports(self._scores, arrays, codes, self._best_idx, self._best_scores)
+
+        # Só as modalidades candidatas (score >= 70) antes ou depois afetam a seleção
+        current = self._best_scores[codes]
+        affects_ranking = ((previous != current) & ((previous >= 70) | (current >= 70))).any()
+        return int(dirty.sum()), len(codes), bool(affects_ranking)
+
+    def _select(self) -> None:
+        ranking = TopKRecommendations()
+        for code in np.flatnonzero((self._best_idx >= 0) & (self._best_scores >= 70)):
+            ranking.push(int(code), float(self._best_scores[code]), self._partition.sport_is_team[code])
+        self._selected = ranking.select()
+        self._candidates = ranking.total
+
+    @instrumentation.instrumented('recommendations.incremental')
+    def recommend(self, user_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Recomendações do atleta, recalculando apenas as etapas afetadas desde a última chamada"""
+        try:
+            partition = get_event_catalog().partition(user_data['genero'])
+            keys = self._input_keys(user_data)
+
+            if partition is not self._partition:
+                self._partition = partition
+                events, sports = self._full_update(user_data, keys)
+                full = rerank = True
+            else:
+                dirty = self._dirty_events(user_data, keys)
+                events, sports, rerank = self._patch(dirty, keys) if dirty.any() else (0, 0, False)
+                full = False
+            self._keys = keys
+
+            if rerank:
+                self._select()
+
+            self.last_update = {'full': full, 'events': events, 'sports': sports, 'reranked': rerank}
+            instrumentation.increment('recommendations.incremental.events', events)
+
+            if not self._candidates:
+                diagnostics.warning("Não foram encontradas recomendações que atendam aos critérios mínimos.")
+                return []
+            # Pontos fortes e áreas de desenvolvimento dependem de todas as entradas
+            return _build_recommendations(self._selected, partition, self._best_idx, user_data)
+
+        except Exception as e:
+            self.reset()
+            diagnostics.error(f"Erro na recomendação de esportes: {str(e)}")
+            return []
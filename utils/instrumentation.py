@@ -0,0 +1,265 @@
+import contextlib
+import functools
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Type
+
+logger = logging.getLogger('sport_talent_analyzer.metrics')
+
+METRICS_ENV_VAR = 'SPORT_ANALYZER_METRICS'
+
+
+class MetricsSink:
+    """
+    Destino dos tempos por etapa e dos contadores do pipeline.
+    A implementação base descarta tudo; com ela a instrumentação fica desligada.
+    """
+
+    def record(self, stage: str, seconds: float) -> None:
+        pass
+
+    def increment(self, name: str, value: int = 1) -> None:
+        pass
+
+
+class LoggingMetricsSink(MetricsSink):
+    """Uma linha de log por medição"""
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        self.log = log or logger
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.log.info("etapa=%s ms=%.3f", stage, seconds * 1000)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.log.info("contador=%s valor=%d", name, value)
+
+
+class _Aggregates:
+    """Soma, contagem e máximo por etapa, e totais por contador"""
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        stats = self.stages.get(stage)
+        if stats is None:
+            self.stages[stage] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def increment(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+
+class RingBufferSink(MetricsSink):
+    """Guarda as últimas medições em memória (exibidas na página de administração)"""
+
+    def __init__(self, capacity: int = 500):
+        self.events: deque = deque(maxlen=capacity)
+        self._aggregates = _Aggregates()
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.events.append((time.time(), stage, seconds))
+            self._aggregates.record(stage, seconds)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._aggregates.increment(name, value)
+
+    def recent(self) -> List[Tuple[float, str, float]]:
+        """Medições mais recentes primeiro: (timestamp, etapa, segundos)"""
+        with self._lock:
+            return list(reversed(self.events))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Contagem, média e máximo (ms) de cada etapa desde o início do processo"""
+        with self._lock:
+            return {
+                stage: {'count': count, 'mean_ms': total / count * 1000, 'max_ms': peak * 1000}
+                for stage, (count, total, peak) in sorted(self._aggregates.stages.items())
+            }
+
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(sorted(self._aggregates.counters.items()))
+
+
+class PrometheusFileSink(MetricsSink):
+    """
+    Mantém os agregados e os grava em formato texto do Prometheus (para o
+    textfile collector do node_exporter), no máximo a cada `flush_interval` segundos
+    """
+
+    def __init__(self, path: str, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._aggregates = _Aggregates()
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._aggregates.record(stage, seconds)
+        self._maybe_flush()
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._aggregates.increment(name, value)
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def render(self) -> str:
+        with self._lock:
+            stages = sorted(self._aggregates.stages.items())
+            counters = sorted(self._aggregates.counters.items())
+        lines = [
+            "# HELP sport_analyzer_stage_seconds Tempo gasto em cada etapa do pipeline",
+            "# TYPE sport_analyzer_stage_seconds summary",
+        ]
+        for stage, (count, total, _) in stages:
+            lines.append(f'sport_analyzer_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'sport_analyzer_stage_seconds_count{{stage="{stage}"}} {count}')
+        lines.extend([
+            "# HELP sport_analyzer_events_total Contadores do pipeline",
+            "# TYPE sport_analyzer_events_total counter",
+        ])
+        for name, value in counters:
+            lines.append(f'sport_analyzer_events_total{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        """Grava o arquivo de forma atômica (melhor esforço)"""
+        self._last_flush = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Não foi possível gravar as métricas em %s: %s", self.path, e)
+
+
+class CompositeSink(MetricsSink):
+    """Encaminha cada medição para vários destinos"""
+
+    def __init__(self, sinks: List[MetricsSink]):
+        self.sinks = list(sinks)
+
+    def record(self, stage: str, seconds: float) -> None:
+        for sink in self.sinks:
+            sink.record(stage, seconds)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        for sink in self.sinks:
+            sink.increment(name, value)
+
+
+_sink: MetricsSink = MetricsSink()
+_enabled = False
+
+
+def set_metrics_sink(sink: Optional[MetricsSink]) -> MetricsSink:
+    """Define o destino das métricas do processo e retorna o anterior (None desliga)"""
+    global _sink, _enabled
+    previous = _sink
+    _sink = sink if sink is not None else MetricsSink()
+    _enabled = type(_sink) is not MetricsSink
+    return previous
+
+
+def get_metrics_sink() -> MetricsSink:
+    return _sink
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def find_sink(sink_type: Type[MetricsSink]) -> Optional[MetricsSink]:
+    """Primeiro destino configurado do tipo pedido, inclusive dentro de um CompositeSink"""
+    sinks = _sink.sinks if isinstance(_sink, CompositeSink) else [_sink]
+    for sink in sinks:
+        if isinstance(sink, sink_type):
+            return sink
+    return None
+
+
+def configure_from_env() -> MetricsSink:
+    """
+    Liga a instrumentação conforme SPORT_ANALYZER_METRICS, uma lista separada por
+    vírgulas de destinos: `log`, `memory` e `prometheus:<arquivo>`
+    """
+    sinks: List[MetricsSink] = []
+    for spec in os.environ.get(METRICS_ENV_VAR, '').split(','):
+        spec = spec.strip()
+        if spec == 'log':
+            sinks.append(LoggingMetricsSink())
+        elif spec == 'memory':
+            sinks.append(RingBufferSink())
+        elif spec.startswith('prometheus:'):
+            sinks.append(PrometheusFileSink(spec[len('prometheus:'):]))
+        elif spec:
+            logger.warning("Destino de métricas desconhecido: %s", spec)
+
+    if not sinks:
+        set_metrics_sink(None)
+    else:
+        set_metrics_sink(sinks[0] if len(sinks) == 1 else CompositeSink(sinks))
+    return _sink
+
+
+class _Timer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _sink.record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def timed(stage: str):
+    """Context manager que mede a etapa; sem custo quando a instrumentação está desligada"""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(stage)
+
+
+def instrumented(stage: str):
+    """Decorador equivalente a envolver a função em `timed(stage)`"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Timer(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def increment(name: str, value: int = 1) -> None:
+    if _enabled:
+        _sink.increment(name, value)
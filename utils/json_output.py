@@ -0,0 +1,24 @@
+import json
+import math
+from typing import Any
+
+
+def json_safe(value: Any) -> Any:
+    """
+    Cópia do valor com apenas tipos JSON: escalares numpy viram tipos Python e
+    NaN/infinito viram None (os registros dos eventos olímpicos têm médias ausentes)
+    """
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if hasattr(value, 'tolist') and not isinstance(value, (str, bytes)):
+        return json_safe(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def dumps(value: Any) -> str:
+    """JSON estrito (sem NaN ou Infinity), legível por qualquer cliente"""
+    return json.dumps(json_safe(value), ensure_ascii=False, allow_nan=False)
@@ -0,0 +1,124 @@
+import builtins
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+PROFILE_ENV_VAR = 'SPORT_ANALYZER_PROFILE_IMPORTS'
+
+
+class LazyModule:
+    """
+    Referência a um módulo que só é importado no primeiro acesso a um atributo
+    """
+    __slots__ = ('_name', '_module')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'carregado' if self._module is not None else 'não carregado'
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Retorna o módulo já carregado ou uma referência que o importa sob demanda"""
+    module = LazyModule(name)
+    if name in sys.modules:
+        module._module = sys.modules[name]
+    return module
+
+
+class ImportProfiler:
+    """
+    Mede o custo de importação de cada módulo carregado pela primeira vez,
+    com tempo total (incluindo dependências) e tempo próprio
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.started_at = time.perf_counter()
+        self._original_import = None
+        self._local = threading.local()
+        self.reported = False
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        try:
+            absolute = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__')) \
+                if level else name
+        except (ImportError, ValueError):
+            absolute = name
+        if absolute in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            if absolute not in self.timings:
+                self.timings[absolute] = (elapsed, elapsed - children)
+
+    def install(self) -> 'ImportProfiler':
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+        return self
+
+    def uninstall(self) -> None:
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def report(self, top: int = 20) -> str:
+        """Tabela com os módulos mais caros, ordenados pelo tempo total"""
+        rows: List[Tuple[str, Tuple[float, float]]] = sorted(
+            self.timings.items(), key=lambda item: item[1][0], reverse=True
+        )
+        lines = [
+            f"Perfil de importação: {len(self.timings)} módulos, "
+            f"{(time.perf_counter() - self.started_at) * 1000:.1f} ms desde o início",
+            f"{'total (ms)':>11} {'próprio (ms)':>13}  módulo"
+        ]
+        for name, (total, own) in rows[:top]:
+            lines.append(f"{total * 1000:>11.1f} {own * 1000:>13.1f}  {name}")
+        return "\n".join(lines)
+
+
+_profiler = None
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get(PROFILE_ENV_VAR, '').lower() in ('1', 'true', 'yes')
+
+
+def start_import_profile() -> ImportProfiler:
+    """Instala o profiler de importações do processo (uma única vez)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler().install()
+    return _profiler
+
+
+def get_import_profiler():
+    return _profiler
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence, Tuple
+from config.config import TESTS_CONFIG
+
+
+def normalize_value(value, min_val, max_val, inverse=False, missing=50.0) -> float:
+    """
+    Normaliza um valor para escala 0-100, limitado à faixa. Valores ausentes,
+    vazios, NaN ou não numéricos (regra de numeric_value) recebem `missing`.
+    """
+    value = numeric_value(value)
+    if value is None:
+        return missing
+    if inverse:
+        if value <= min_val:
+            return 100.0
+        elif value >= max_val:
+            return 0.0
+        return ((max_val - value) / (max_val - min_val)) * 100.0
+    else:
+        if value >= max_val:
+            return 100.0
+        elif value <= min_val:
+            return 0.0
+        return ((value - min_val) / (max_val - min_val)) * 100.0
+
+
+def numeric_value(value):
+    """
+    Valor numérico de um teste com a mesma regra das colunas da tabela de atletas
+    (pd.to_numeric com errors='coerce'): números e texto numérico contam; ausentes,
+    vazios, NaN e texto não numérico retornam None
+    """
+    if isinstance(value, (bool, int, float, np.number)):
+        number = float(value)
+    elif isinstance(value, str):
+        number = float(pd.to_numeric(value, errors='coerce'))
+    else:
+        return None
+    return number if number == number else None
+
+
+def normalize_array(values, min_val, max_val, inverse=False, missing=50.0) -> np.ndarray:
+    """
+    Versão vetorizada de normalize_value; valores ausentes (NaN) recebem `missing`.
+    min_val, max_val e inverse podem ser arrays, com broadcasting sobre `values`
+    (ex.: uma faixa por coluna de uma matriz atletas x testes).
+    """
+    values = np.asarray(values, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        span = max_val - min_val
+        inverse_scores = np.where(values <= min_val, 100.0,
+                                  np.where(values >= max_val, 0.0, ((max_val - values) / span) * 100.0))
+        direct_scores = np.where(values >= max_val, 100.0,
+                                 np.where(values <= min_val, 0.0, ((values - min_val) / span) * 100.0))
+        scores = np.where(inverse, inverse_scores, direct_scores)
+    return np.where(np.isnan(values), missing, scores)
+
+
+def numeric_column(athletes: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Valores de um teste da tabela de atletas como float (regra de numeric_value);
+    ausentes, vazios e não numéricos viram NaN
+    """
+    if column not in athletes.columns:
+        return np.full(len(athletes), np.nan)
+    return pd.to_numeric(athletes[column], errors='coerce').to_numpy(dtype=float)
+
+
+def raw_number_column(athletes: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Valores brutos para test_processor.calculate_average: apenas números contam,
+    texto (mesmo numérico) é ignorado
+    """
+    if column not in athletes.columns:
+        return np.full(len(athletes), np.nan)
+    values = athletes[column]
+    # Colunas só de texto podem ter dtype de string em vez de object
+    if not pd.api.types.is_numeric_dtype(values.dtype):
+        values = values.where(values.map(lambda v: isinstance(v, (int, float))))
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+
+
+def mean_present(columns: List[np.ndarray]) -> np.ndarray:
+    """Média por linha ignorando NaN (0 quando não há valores), como calculate_average"""
+    total = np.zeros(len(columns[0]))
+    count = np.zeros(len(columns[0]))
+    for values in columns:
+        present = ~np.isnan(values)
+        total = total + np.where(present, values, 0.0)
+        count = count + present
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, 0.0)
+
+
+class NormalizationSpec:
+    """
+    Tabela compilada de faixas de normalização: nomes dos testes e arrays
+    contíguos de mínimo, máximo e direção (inverso = menor é melhor)
+    """
+
+    def __init__(self, ranges: Dict[str, Tuple[float, float, bool]]):
+        self.names: List[str] = list(ranges)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.mins = np.ascontiguousarray([ranges[n][0] for n in self.names], dtype=float)
+        self.maxs = np.ascontiguousarray([ranges[n][1] for n in self.names], dtype=float)
+        self.inverse = np.ascontiguousarray([ranges[n][2] for n in self.names], dtype=bool)
+        self._ranges = {n: (ranges[n][0], ranges[n][1], bool(ranges[n][2])) for n in self.names}
+
+    def range(self, name: str) -> Tuple[float, float, bool]:
+        return self._ranges[name]
+
+    def normalize(self, name: str, value, missing=50.0) -> float:
+        """Normaliza um único valor do teste"""
+        min_val, max_val, inverse = self._ranges[name]
+        return normalize_value(value, min_val, max_val, inverse, missing)
+
+    def normalize_columns(self, values, names: Sequence[str], missing=50.0) -> np.ndarray:
+        """Normaliza uma matriz (linhas x testes) em uma única passada vetorizada"""
+        columns = np.array([self.index[n] for n in names], dtype=np.intp)
+        return normalize_array(values, self.mins[columns], self.maxs[columns], self.inverse[columns], missing)
+
+
+def build_spec(tests_config: Dict = TESTS_CONFIG, key: str = 'score') -> NormalizationSpec:
+    """
+    Compila as faixas `key` de cada teste da configuração (com "score" como
+    alternativa quando o teste não define a faixa pedida)
+    """
+    ranges = {}
+    for category in tests_config.values():
+        for name, test in category['tests'].items():
+            spec = test.get(key) or test.get('score')
+            if spec:
+                ranges[name] = (spec['min'], spec['max'], spec.get('inverse', False))
+    return NormalizationSpec(ranges)
+
+
+# Faixas dos scores dos testes (perfil/radar)
+TEST_SPEC = build_spec(TESTS_CONFIG, 'score')
+
+# Faixas usadas na compatibilidade com os esportes
+COMPATIBILITY_SPEC = build_spec(TESTS_CONFIG, 'compatibility_score')
+
+
+def category_tests(category: str, tests_config: Dict = TESTS_CONFIG) -> List[str]:
+    """Nomes dos testes normalizados de uma categoria, na ordem da configuração"""
+    return [name for name, test in tests_config[category]['tests'].items() if 'score' in test]
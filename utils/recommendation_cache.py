@@ -0,0 +1,278 @@
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Incrementar quando a lógica de recomendação mudar de forma a invalidar resultados gravados
+# (2: entradas em JSON e regras de testes ausentes/em texto alinhadas entre os caminhos de scoring)
+CACHE_VERSION = 2
+
+CACHE_DIR_ENV_VAR = 'SPORT_ANALYZER_CACHE_DIR'
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Arquivos de dados, configuração e código de scoring dos quais as recomendações
+# dependem: mudar qualquer um deles invalida os resultados gravados
+VERSIONED_FILES = [
+    os.path.join(_ROOT, 'data', 'perfil_eventos_olimpicos_verao.csv'),
+    os.path.join(_ROOT, 'data', 'perfil_eventos_olimpicos_verao_catalogo.csv'),
+    os.path.join(_ROOT, 'config', 'config.py'),
+    os.path.join(_ROOT, 'config', 'test_parameters.json'),
+    os.path.join(_ROOT, 'config', 'age_parameters.json'),
+    os.path.join(_ROOT, 'generate_translations.py'),
+] + [
+    os.path.join(_ROOT, 'utils', f"{module}.py") for module in (
+        'sport_helper', 'scoring_engine', 'cohort', 'normalization', 'test_processor',
+        'age_adjusted_calculations', 'age_bands', 'event_catalog', 'event_tags', 'incremental_scoring',
+    )
+]
+
+# Número máximo de arquivos da camada em disco; os mais antigos são removidos primeiro
+DEFAULT_MAX_DISK_ENTRIES = 10_000
+
+# A camada em disco é podada a cada PRUNE_INTERVAL gravações do processo
+PRUNE_INTERVAL = 100
+
+_version_lock = threading.Lock()
+_version_state: Tuple[Tuple, str] = ((), '')
+
+
+def data_version(paths: List[str] = None) -> str:
+    """
+    Versão do catálogo e da configuração: hash do conteúdo dos arquivos,
+    recalculado apenas quando o mtime de algum deles muda
+    """
+    global _version_state
+    paths = paths or VERSIONED_FILES
+    stamps = tuple(
+        (path, os.path.getmtime(path)) if os.path.exists(path) else (path, None)
+        for path in paths
+    )
+    with _version_lock:
+        if _version_state[0] == stamps:
+            return _version_state[1]
+        digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+        for path, mtime in stamps:
+            digest.update(path.encode())
+            if mtime is not None:
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        version = digest.hexdigest()
+        _version_state = (stamps, version)
+        return version
+
+
+def _normalize_inputs(value):
+    """Forma canônica das entradas: números como float, chaves ordenadas, tipos numpy convertidos"""
+    if isinstance(value, dict):
+        return {str(k): _normalize_inputs(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_inputs(v) for v in value]
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, (int, float)):
+        value = float(value)
+        return None if value != value else value
+    return str(value)
+
+
+def fingerprint(inputs: Dict, version: Optional[str] = None) -> str:
+    """Hash estável das entradas normalizadas do atleta e da versão dos dados"""
+    payload = json.dumps(
+        {'inputs': _normalize_inputs(inputs), 'version': version or data_version()},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _json_default(value):
+    """Escalares numpy dos resultados viram tipos Python"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+class RecommendationCache:
+    """
+    Cache LRU com expiração por tempo (TTL) para resultados de recomendação,
+    com uma camada opcional em disco compartilhada entre processos. As entradas
+    em disco são JSON (nunca código executável), expiram pelo mesmo TTL e são
+    limitadas a `max_disk_entries` arquivos.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0, disk_dir: Optional[str] = None,
+                 max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str):
+        """Lê a entrada gravada em disco; retorna None se ausente, expirada ou ilegível"""
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, value) -> None:
+        """Grava a entrada em disco de forma atômica (melhor esforço)"""
+        if not self.disk_dir:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(value, f, ensure_ascii=False, default=_json_default)
+                os.replace(tmp_path, self._disk_path(key))
+            except (TypeError, ValueError):
+                os.remove(tmp_path)
+                return
+        except OSError:
+            return
+
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % PRUNE_INTERVAL == 0
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self) -> int:
+        """
+        Remove da camada em disco as entradas expiradas, os arquivos temporários e
+        de formatos antigos abandonados e, acima de `max_disk_entries`, as entradas
+        mais antigas. Retorna o número de arquivos removidos.
+        """
+        if not self.disk_dir:
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+        try:
+            with os.scandir(self.disk_dir) as scan:
+                for entry in scan:
+                    try:
+                        if not entry.is_file():
+                            continue
+                        if entry.name.endswith('.pkl'):
+                            # Formato anterior (pickle), nunca mais lido
+                            expired = True
+                        elif entry.name.endswith('.json') or entry.name.startswith('.tmp-'):
+                            # Temporários recentes podem ser gravações em andamento de outro processo
+                            mtime = entry.stat().st_mtime
+                            expired = now - mtime > self.ttl
+                        else:
+                            continue
+                        if expired:
+                            os.remove(entry.path)
+                            removed += 1
+                        elif entry.name.endswith('.json'):
+                            entries.append((mtime, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            return removed
+
+        entries.sort()
+        for _, path in entries[:max(len(entries) - self.max_disk_entries, 0)]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _store(self, key: str, value) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        """Retorna uma cópia do valor em cache, ou None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if time.monotonic() - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is not None:
+                self.disk_hits += 1
+                self._store(key, value)
+                return copy.deepcopy(value)
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]):
+        """Retorna o valor em cache ou o calcula; resultados vazios não são guardados"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value:
+                self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_recommendation_cache() -> RecommendationCache:
+    """
+    Cache compartilhado do processo. A camada em disco é ativada definindo
+    SPORT_ANALYZER_CACHE_DIR com o diretório a ser usado.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RecommendationCache(disk_dir=os.environ.get(CACHE_DIR_ENV_VAR) or None)
+    return _cache
@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+from utils.cohort import athletes_to_frame
+from utils.normalization import TEST_SPEC, mean_present, numeric_column, raw_number_column
+from utils.test_processor import PSYCHOLOGICAL_FACTORS
+
+SPORT_PROFILES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'data', 'sport_profiles.json'
+)
+
+# Testes do atleta que medem cada requisito de sport_profiles.json (colunas da
+# tabela de atletas, utils.cohort.ATHLETE_FIELDS). Requisitos com vários testes
+# usam a média dos informados; requisitos sem teste ficam fora da comparação.
+ATTRIBUTE_TESTS: Dict[str, Tuple[str, ...]] = {
+    'velocity': ('velocidade',),
+    'strength': ('forca_superior', 'forca_inferior'),
+    'endurance': (),
+    'agility': ('agilidade',),
+    'coordination': ('coordenacao',),
+    'balance': ('equilibrio',),
+    'precision': ('precisao',),
+    'decision_making': ('tomada_decisao',),
+    'game_vision': ('visao_jogo',),
+    'positioning': ('posicionamento',),
+    'motivation': ('motivacao',),
+    'teamwork': ('trabalho_equipe',),
+    'resilience': ('resiliencia',),
+}
+
+# Escala dos requisitos no arquivo (0-10); os testes normalizados (0-100) são convertidos para ela
+REQUIREMENT_SCALE = 10.0
+
+
+def _athlete_test_scores(athletes: pd.DataFrame, test: str) -> np.ndarray:
+    """Score 0-100 de um teste (ou fator psicológico) por atleta; NaN quando não informado"""
+    if test in PSYCHOLOGICAL_FACTORS:
+        columns = [raw_number_column(athletes, c) for c in PSYCHOLOGICAL_FACTORS[test]]
+        present = np.any([~np.isnan(c) for c in columns], axis=0)
+        values = np.where(present, mean_present(columns), np.nan)
+    else:
+        values = numeric_column(athletes, test)
+    return TEST_SPEC.normalize_columns(values[:, None], [test], missing=np.nan)[:, 0]
+
+
+class RequirementMatrix:
+    """
+    Requisitos de sport_profiles.json compilados em uma matriz densa
+    (esportes x atributos), na escala 0-10 do arquivo.
+
+    A similaridade é o cosseno ponderado entre o perfil relativo do atleta
+    (cada atributo menos a média do próprio atleta) e o perfil distintivo do
+    esporte (cada requisito menos a média do requisito entre os esportes), ou
+    seja, se os pontos fortes do atleta são aquilo que o esporte exige mais que
+    os outros. Atributos sem valor do atleta não entram no cálculo.
+    """
+
+    def __init__(self, profiles: Dict, weights: Optional[Dict[str, float]] = None,
+                 mtime: Optional[float] = None):
+        self.mtime = mtime
+        sports = profiles['sports']
+        self.names: List[str] = [sport['name'] for sport in sports]
+        self.categories: List[str] = [sport['category'] for sport in sports]
+        self.attributes: List[str] = []
+        self.attribute_categories: List[str] = []
+        for category, attributes in sports[0]['requirements'].items() if sports else ():
+            for attribute in attributes:
+                self.attributes.append(attribute)
+                self.attribute_categories.append(category)
+
+        self.matrix = np.array([
+            [sport['requirements'][c].get(a, np.nan) for a, c in zip(self.attributes, self.attribute_categories)]
+            for sport in sports
+        ], dtype=float).reshape(len(sports), len(self.attributes))
+        self.means = np.nanmean(self.matrix, axis=0) if len(sports) else np.zeros(len(self.attributes))
+        self.centered = np.nan_to_num(self.matrix - self.means)
+
+        weights = weights or {}
+        self.weights = np.array([weights.get(a, 1.0) for a in self.attributes], dtype=float)
+
+    def athlete_matrix(self, athletes) -> np.ndarray:
+        """
+        Perfis dos atletas (atletas x atributos) na escala 0-10, a partir da tabela
+        de atletas (colunas de ATHLETE_FIELDS); NaN quando o atributo não foi medido
+        """
+        athletes = pd.DataFrame(athletes)
+        profile = np.full((len(athletes), len(self.attributes)), np.nan)
+        for column, attribute in enumerate(self.attributes):
+            tests = ATTRIBUTE_TESTS.get(attribute, ())
+            if tests:
+                scores = [_athlete_test_scores(athletes, test) for test in tests]
+                present = np.any([~np.isnan(s) for s in scores], axis=0)
+                profile[:, column] = np.where(present, mean_present(scores), np.nan)
+        return profile * (REQUIREMENT_SCALE / 100.0)
+
+    def athlete_vector(self, user_data: Dict[str, Any]) -> np.ndarray:
+        """Perfil de um atleta (dicionário user_data ou resultados dos testes)"""
+        return self.athlete_matrix(athletes_to_frame([user_data]))[0]
+
+    def _relative(self, profiles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Perfis centrados na média ponderada de cada atleta e peso efetivo de cada atributo"""
+        profiles = np.atleast_2d(np.asarray(profiles, dtype=float))
+        weights = np.where(np.isnan(profiles), 0.0, self.weights)
+        values = np.nan_to_num(profiles)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = (weights * values).sum(axis=1) / weights.sum(axis=1)
+        relative = np.where(weights > 0, values - np.nan_to_num(mean)[:, None], 0.0)
+        return relative, weights
+
+    def similarity(self, profiles) -> np.ndarray:
+        """
+        Similaridade de cosseno ponderada (-1 a 1) de cada perfil com cada esporte
+        (atletas x esportes), calculada com produtos de matrizes. Perfis sem
+        variação ou sem atributos medidos têm similaridade 0.
+        """
+        relative, weights = self._relative(profiles)
+        numerator = (weights * relative) @ self.centered.T
+        athlete_norm = np.sqrt((weights * relative * relative).sum(axis=1))
+        sport_norm = np.sqrt(weights @ (self.centered * self.centered).T)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            similarity = numerator / (athlete_norm[:, None] * sport_norm)
+        return np.nan_to_num(similarity)
+
+    def contributions(self, profile, sport: int) -> np.ndarray:
+        """Parcela de cada atributo na similaridade de um perfil com um esporte (somam a similaridade)"""
+        relative, weights = self._relative(profile)
+        relative, weights = relative[0], weights[0]
+        centered = self.centered[sport]
+        norm = np.sqrt((weights * relative * relative).sum()) * np.sqrt((weights * centered * centered).sum())
+        return weights * relative * centered / norm if norm > 0 else np.zeros(len(self.attributes))
+
+    def match(self, user_data: Dict[str, Any], k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Os k esportes com perfil de requisitos mais parecido com o do atleta, com
+        os atributos que mais aproximam e os que mais afastam o atleta de cada um
+        """
+        profile = self.athlete_vector(user_data)
+        scores = self.similarity(profile)[0]
+        results = []
+        for sport in np.argsort(-scores, kind='stable')[:k]:
+            parts = self.contributions(profile, sport)
+            order = np.argsort(-parts, kind='stable')
+            results.append({
+                'name': self.names[sport],
+                'category': self.categories[sport],
+                'similarity': round(float(scores[sport]), 3),
+                'pontos_fortes': [self.attributes[a] for a in order[:3] if parts[a] > 0],
+                'pontos_fracos': [self.attributes[a] for a in order[::-1][:3] if parts[a] < 0],
+            })
+        return results
+
+    def match_cohort(self, athletes) -> pd.DataFrame:
+        """Similaridade de uma turma inteira com todos os esportes (uma coluna por esporte)"""
+        index = athletes.index if isinstance(athletes, pd.DataFrame) else None
+        return pd.DataFrame(self.similarity(self.athlete_matrix(athletes)), columns=self.names, index=index)
+
+
+_matrix: Optional[RequirementMatrix] = None
+_matrix_lock = threading.Lock()
+
+
+def get_requirement_matrix() -> Optional[RequirementMatrix]:
+    """
+    Retorna a matriz de requisitos em cache, recompilando-a quando
+    sport_profiles.json é modificado
+    """
+    global _matrix
+    try:
+        mtime = os.stat(SPORT_PROFILES_PATH).st_mtime
+    except OSError as e:
+        print(f"Erro ao carregar perfis dos esportes: {str(e)}")
+        return None
+
+    matrix = _matrix
+    if matrix is not None and matrix.mtime == mtime:
+        return matrix
+
+    with _matrix_lock:
+        if _matrix is None or _matrix.mtime != mtime:
+            try:
+                with open(SPORT_PROFILES_PATH, 'r', encoding='utf-8') as f:
+                    _matrix = RequirementMatrix(json.load(f), mtime=mtime)
+            except Exception as e:
+                print(f"Erro ao carregar perfis dos esportes: {str(e)}")
+                return None
+        return _matrix
@@ -0,0 +1,276 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Iterator, Tuple
+from generate_translations import get_base_sport_name
+from config.config import RECOMMENDATION_CONFIG
+from utils.age_bands import get_age_band_table
+from utils.event_tags import EventTag, build_tag_index, tag_mask
+from utils.normalization import COMPATIBILITY_SPEC
+
+# Fração do score biométrico calculada com altura e peso projetados para a idade adulta
+AGE_ADJUSTED_BIOMETRIC_WEIGHT = RECOMMENDATION_CONFIG.get('age_adjusted_biometric_weight', 0.0)
+
+
+def prepare_events(events) -> Dict[str, Any]:
+    """
+    Converte a tabela de eventos (DataFrame ou mapeamento coluna -> array) em
+    arrays colunares para o motor de scoring
+    """
+    names = np.asarray(events['Event'])
+    # Arrays de texto de largura fixa (fatias mapeadas do cache binário) são usados
+    # sem cópia; as demais colunas de texto viram arrays object
+    if names.dtype.kind != 'U':
+        names = names.astype(object)
+    # Índice de atributos: um bitset por evento, calculado uma única vez
+    tags = build_tag_index(names)
+    # Colunas do catálogo derivado são usadas quando presentes
+    if 'base_sport' in events:
+        base_names = [str(s) for s in events['base_sport']]
+    else:
+        base_names = [get_base_sport_name(n) for n in names]
+    # factorize preserva a ordem de primeira aparição de cada modalidade
+    sport_codes, sports = pd.factorize(pd.Series(base_names, dtype=object))
+    sports = list(sports)
+    sport_codes = sport_codes.astype(np.intp)
+
+    # Eventos reordenados por modalidade (ordem estável) para reduções por grupo
+    sport_order = np.argsort(sport_codes, kind='stable')
+    sport_starts = np.searchsorted(sport_codes[sport_order], np.arange(len(sports)))
+
+    if 'is_team' in events:
+        event_is_team = np.asarray(events['is_team'], dtype=bool)
+        sport_is_team = event_is_team[sport_order[sport_starts]] if len(names) else np.zeros(0, dtype=bool)
+    else:
+        sport_is_team = tag_mask(build_tag_index(sports), EventTag.TEAM)
+
+    return {
+        'names': names,
+        'altura': np.asarray(events['altura_media'], dtype=float),
+        'peso': np.asarray(events['peso_media'], dtype=float),
+        'idade': np.asarray(events['idade_media'], dtype=float),
+        'tags': tags,
+        'velocity': tag_mask(tags, EventTag.VELOCITY),
+        'strength': tag_mask(tags, EventTag.STRENGTH),
+        'sport_codes': sport_codes,
+        'sport_order': sport_order.astype(np.intp),
+        'sport_starts': sport_starts.astype(np.intp),
+        'sports': sports,
+        'sport_is_team': sport_is_team,
+    }
+
+
+def _step_penalty(diff: np.ndarray, valid: np.ndarray, high: float, low: float,
+                  high_penalty: float, low_penalty: float) -> np.ndarray:
+    """Penalidade em degraus aplicada apenas onde a média do evento é válida"""
+    penalty = np.where(diff > high, high_penalty, np.where(diff > low, low_penalty, 0.0))
+    return np.where(valid, penalty, 0.0)
+
+
+def biometric_matrix(altura, peso, idade, arrays: Dict[str, Any]) -> np.ndarray:
+    """
+    Compatibilidade biométrica (atletas x eventos) a partir de arrays de
+    altura, peso e idade dos atletas
+    """
+    altura = np.asarray(altura, dtype=float)[:, None]
+    peso = np.asarray(peso, dtype=float)[:, None]
+    idade = np.asarray(idade, dtype=float)[:, None]
+
+    score = np.full((altura.shape[0], len(arrays['names'])), 100.0)
+    for user_values, key, high, low, high_penalty, low_penalty in (
+        (altura, 'altura', 20, 10, 20, 10),
+        (peso, 'peso', 20, 10, 20, 10),
+        (idade, 'idade', 5, 3, 15, 5),
+    ):
+        event_values = arrays[key]
+        valid = (event_values != 0) & ~np.isnan(event_values)
+        with np.errstate(invalid='ignore'):
+            diff = np.abs(user_values - event_values)
+        score -= _step_penalty(diff, valid, high, low, high_penalty, low_penalty)
+
+    return np.maximum(score, 0.0)
+
+
+def age_adjusted_biometric_matrix(altura, peso, idade, genero, arrays: Dict[str, Any]) -> np.ndarray:
+    """
+    biometric_matrix com altura e peso de atletas jovens projetados para a idade
+    adulta, na mesma posição das faixas de config/age_parameters.json
+    """
+    table = get_age_band_table()
+    if table is not None:
+        altura = table.project_adult(genero, idade, 'altura', altura)
+        peso = table.project_adult(genero, idade, 'peso', peso)
+    return biometric_matrix(altura, peso, idade, arrays)
+
+
+def athlete_biometric_matrix(altura, peso, idade, genero, arrays: Dict[str, Any],
+                             weight: float = AGE_ADJUSTED_BIOMETRIC_WEIGHT) -> np.ndarray:
+    """
+    Compatibilidade biométrica usada no pipeline: biometric_matrix combinada com a
+    versão ajustada pela idade conforme `weight` (com 0, apenas biometric_matrix)
+    """
+    scores = biometric_matrix(altura, peso, idade, arrays)
+    if not weight:
+        return scores
+    adjusted = age_adjusted_biometric_matrix(altura, peso, idade, genero, arrays)
+    return scores * (1 - weight) + adjusted * weight
+
+
+def biometric_scores(user_data: Dict, arrays: Dict[str, Any]) -> np.ndarray:
+    """Versão vetorizada de calculate_biometric_compatibility para todos os eventos"""
+    return athlete_biometric_matrix(
+        [float(user_data['biotipo']['altura'])],
+        [float(user_data['biotipo']['peso'])],
+        [float(user_data['idade'])],
+        [user_data.get('genero')],
+        arrays
+    )[0]
+
+
+def physical_matrix(velocity_score, strength_upper, strength_lower, arrays: Dict[str, Any],
+                    user_age: int = 18) -> np.ndarray:
+    """
+    Compatibilidade física (atletas x eventos) a partir dos scores de velocidade
+    e força já normalizados e multiplicados pelo peso de 1.5
+    """
+    velocity_score = np.asarray(velocity_score, dtype=float)[:, None]
+    strength_upper = np.asarray(strength_upper, dtype=float)[:, None]
+    strength_lower = np.asarray(strength_lower, dtype=float)[:, None]
+
+    velocity = arrays['velocity']
+    strength = arrays['strength']
+
+    # Mesma ordem de soma da média escalar: velocidade, força superior, força inferior
+    total = np.where(velocity, velocity_score, 0.0)
+    total = np.where(strength, total + strength_upper, total)
+    total = np.where(strength, total + strength_lower, total)
+    count = velocity.astype(float) + 2.0 * strength
+
+    age_factor = min(1.0, max(0.6, (user_age - 10) / 8))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = (total / count) * age_factor
+    return np.where(count > 0, scores, 50.0)
+
+
+def physical_scores(user_data: Dict, arrays: Dict[str, Any], user_age: int = 18) -> np.ndarray:
+    """Versão vetorizada de calculate_physical_compatibility para todos os eventos"""
+    if not user_data or not user_data.get('dados_fisicos'):
+        return np.full(len(arrays['names']), 50.0)
+
+    dados_fisicos = user_data.get('dados_fisicos', {})
+    velocity_score = COMPATIBILITY_SPEC.normalize('velocidade', dados_fisicos.get('velocidade', 5.0)) * 1.5
+    strength_upper = COMPATIBILITY_SPEC.normalize('forca_superior', dados_fisicos.get('forca_superior', 0)) * 1.5
+    strength_lower = COMPATIBILITY_SPEC.normalize('forca_inferior', dados_fisicos.get('forca_inferior', 0)) * 1.5
+    return physical_matrix([velocity_score], [strength_upper], [strength_lower], arrays, user_age)[0]
+
+
+def final_matrix(biometric: np.ndarray, physical: np.ndarray, technical_score, team_score,
+                 arrays: Dict[str, Any]) -> np.ndarray:
+    """Combina os componentes com os pesos de esportes coletivos e individuais"""
+    technical_score = np.asarray(technical_score, dtype=float)
+    team_score = np.asarray(team_score, dtype=float)
+    if technical_score.ndim:
+        technical_score = technical_score[:, None]
+    if team_score.ndim:
+        team_score = team_score[:, None]
+    is_team = arrays['sport_is_team'][arrays['sport_codes']]
+
+    team_final = (biometric * 0.3 +
+                  physical * 0.2 +
+                  technical_score * 0.2 +
+                  team_score * 0.3)
+    individual_final = (biometric * 0.4 +
+                        physical * 0.3 +
+                        technical_score * 0.3)
+    return np.where(is_team, team_final, individual_final)
+
+
+def score_events(user_data: Dict, arrays: Dict[str, Any], technical_score: float,
+                 team_score: float) -> np.ndarray:
+    """Calcula o score final de todos os eventos em poucas operações vetoriais"""
+    biometric = biometric_scores(user_data, arrays)
+    physical = physical_scores(user_data, arrays)
+    return final_matrix(biometric, physical, technical_score, team_score, arrays)
+
+
+def best_event_per_sport_matrix(scores: np.ndarray, arrays: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Seleciona o melhor evento de cada modalidade para cada atleta (redução group-by
+    sobre a matriz atletas x eventos). Em caso de empate vence o primeiro evento da
+    modalidade, como no laço original. Retorna matrizes (atletas x modalidades) com o
+    índice do melhor evento e o melhor score; -1 quando não há evento com score positivo.
+    """
+    scores = np.atleast_2d(scores)
+    n_athletes = scores.shape[0]
+    n_sports = len(arrays['sports'])
+    if scores.shape[1] == 0:
+        return np.full((n_athletes, n_sports), -1, dtype=np.intp), np.zeros((n_athletes, n_sports))
+
+    order = arrays['sport_order']
+    starts = arrays['sport_starts']
+    grouped = scores[:, order]
+
+    best_score = np.maximum.reduceat(grouped, starts, axis=1)
+    group_of_column = arrays['sport_codes'][order]
+    positions = np.arange(grouped.shape[1])
+    candidates = np.where(grouped == best_score[:, group_of_column], positions, grouped.shape[1])
+    first_position = np.minimum.reduceat(candidates, starts, axis=1)
+
+    positive = best_score > 0
+    best_idx = np.where(positive, order[first_position], -1)
+    return best_idx, np.where(positive, best_score, 0.0)
+
+
+def best_event_per_sport(scores: np.ndarray, arrays: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Melhor evento e score de cada modalidade para um único atleta"""
+    best_idx, best_score = best_event_per_sport_matrix(scores[None, :], arrays)
+    return best_idx[0], best_score[0]
+
+
+def best_event_for_sports(scores: np.ndarray, arrays: Dict[str, Any], codes: np.ndarray,
+                          best_idx: np.ndarray, best_scores: np.ndarray) -> None:
+    """
+    Atualiza, no lugar, o melhor evento e score apenas das modalidades `codes`,
+    com as mesmas regras de best_event_per_sport (empate: primeiro evento da modalidade)
+    """
+    order = arrays['sport_order']
+    starts = arrays['sport_starts']
+    for code in codes:
+        begin = starts[code]
+        end = starts[code + 1] if code + 1 < len(starts) else len(order)
+        events = order[begin:end]
+        position = int(np.argmax(scores[events]))
+        best = scores[events[position]]
+        if best > 0:
+            best_idx[code], best_scores[code] = events[position], best
+        else:
+            best_idx[code], best_scores[code] = -1, 0.0
+
+
+# Colunas por evento copiadas para cada bloco de modalidades
+_EVENT_COLUMNS = ('names', 'altura', 'peso', 'idade', 'tags', 'velocity', 'strength')
+
+
+def sport_blocks(arrays: Dict[str, Any], block_size: int) -> Iterator[Tuple[np.ndarray, Dict[str, Any]]]:
+    """
+    Divide o catálogo em blocos de até `block_size` modalidades consecutivas.
+    Para cada bloco retorna os índices globais dos eventos (agrupados por modalidade)
+    e arrays no mesmo formato de prepare_events, restritos ao bloco; o código de
+    modalidade g do bloco corresponde ao código global `primeiro código do bloco + g`.
+    """
+    order = arrays['sport_order']
+    starts = arrays['sport_starts']
+    n_sports = len(arrays['sports'])
+    for first in range(0, n_sports, block_size):
+        last = min(first + block_size, n_sports)
+        begin = starts[first]
+        end = starts[last] if last < n_sports else len(order)
+        event_idx = order[begin:end]
+        block = {key: arrays[key][event_idx] for key in _EVENT_COLUMNS if key in arrays}
+        block.update({
+            'sport_codes': arrays['sport_codes'][event_idx] - first,
+            'sport_order': np.arange(len(event_idx), dtype=np.intp),
+            'sport_starts': (starts[first:last] - begin).astype(np.intp),
+            'sports': arrays['sports'][first:last],
+            'sport_is_team': arrays['sport_is_team'][first:last],
+        })
+        yield event_idx, block
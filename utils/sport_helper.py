@@ -1,12 +1,20 @@
 import sys
 import os
-import streamlit as st
 import pandas as pd
 import json
 import numpy as np
-import openai
-from typing import Dict, List, Any
-from generate_translations import traduzir_evento, clean_event_name, get_base_sport_name
+import heapq
+from typing import Dict, Iterator, List, Any, Tuple
+from generate_translations import TRADUCOES, traduzir_evento, clean_event_name, get_base_sport_name
+from utils.scoring_engine import score_events, best_event_per_sport, sport_blocks
+from utils.event_catalog import AGGREGATE_COLUMNS, aggregate_by_sport, get_event_catalog, sport_key
+from utils.event_tags import EventTag, event_tags, has_tag
+from utils.normalization import COMPATIBILITY_SPEC, category_tests, normalize_value, numeric_value
+from utils import diagnostics, instrumentation
+
+# Testes de cada categoria, na ordem da configuração (faixas em COMPATIBILITY_SPEC)
+TECHNICAL_TESTS = category_tests('habilidades_tecnicas')
+TACTICAL_TESTS = category_tests('aspectos_taticos')
 
 def load_and_process_data():
     """
@@ -46,33 +54,16 @@ def load_and_process_data():
                 
                 return pd.DataFrame(sports_list)
                 
-        st.error("❌ Arquivo sport_profiles.json não encontrado")
+        diagnostics.error("❌ Arquivo sport_profiles.json não encontrado")
         return None
     
     except Exception as e:
-        st.error(f"Erro ao carregar dados dos esportes: {str(e)}")
+        diagnostics.error(f"Erro ao carregar dados dos esportes: {str(e)}")
         return None
 
 def normalize_score(value, min_val, max_val, inverse=False):
-    """Normaliza um valor para escala 0-100"""
-    try:
-        if value is None or value == "":
-            return 50.0
-        value = float(value)
-        if inverse:
-            if value <= min_val:
-                return 100.0
-            elif value >= max_val:
-                return 0.0
-            return ((max_val - value) / (max_val - min_val)) * 100.0
-        else:
-            if value >= max_val:
-                return 100.0
-            elif value <= min_val:
-                return 0.0
-            return ((value - min_val) / (max_val - min_val)) * 100.0
-    except (TypeError, ValueError):
-        return 50.0
+    """Normaliza um valor para escala 0-100 (ausente vale 50)"""
+    return normalize_value(value, min_val, max_val, inverse, missing=50.0)
 
 def calculate_physical_compatibility(user_data: Dict, sport_name: str, user_age: int = 18) -> float:
     """Calcula compatibilidade física baseada nos testes"""
@@ -88,15 +79,14 @@ def calculate_physical_compatibility(user_data: Dict, sport_name: str, user_age:
         
         scores = []
         
-        velocity_sports = ['Athletics', 'Swimming', 'Cycling', 'Sprint']
-        if any(sport in sport_name for sport in velocity_sports):
-            velocity_score = normalize_score(velocidade, 2.5, 5.0, inverse=True)
+        tags = event_tags(sport_name)
+        if tags & EventTag.VELOCITY:
+            velocity_score = COMPATIBILITY_SPEC.normalize('velocidade', velocidade)
             scores.append(velocity_score * 1.5)
         
-        strength_sports = ['Weightlifting', 'Wrestling', 'Judo', 'Boxing']
-        if any(sport in sport_name for sport in strength_sports):
-            strength_upper = normalize_score(forca_superior, 0, 50)
-            strength_lower = normalize_score(forca_inferior, 0, 60)
+        if tags & EventTag.STRENGTH:
+            strength_upper = COMPATIBILITY_SPEC.normalize('forca_superior', forca_superior)
+            strength_lower = COMPATIBILITY_SPEC.normalize('forca_inferior', forca_inferior)
             scores.extend([strength_upper * 1.5, strength_lower * 1.5])
             
         if not scores:
@@ -108,7 +98,7 @@ def calculate_physical_compatibility(user_data: Dict, sport_name: str, user_age:
         return float(base_score * age_factor)
             
     except Exception as e:
-        st.error(f"Erro no cálculo de compatibilidade física: {str(e)}")
+        diagnostics.error(f"Erro no cálculo de compatibilidade física: {str(e)}")
         return 50.0
 
 def calculate_biotype_compatibility(user_data: Dict, sport: pd.Series) -> float:
@@ -118,27 +108,27 @@ def calculate_biotype_compatibility(user_data: Dict, sport: pd.Series) -> float:
             return 50.0
             
         biotype_data = user_data.get('biotipo', {})
-        sport_name = sport['Event'].lower()
+        tags = event_tags(sport['Event'])
         
         scores = []
         
         altura = biotype_data.get('altura')
         if altura is not None:
-            if any(s in sport_name for s in ['basketball', 'volleyball']):
+            if tags & EventTag.HEIGHT:
                 height_score = normalize_score(altura, 170, 210)
                 scores.append(height_score * 1.5)
-            elif any(s in sport_name for s in ['gymnastics', 'wrestling']):
+            elif tags & EventTag.COMPACT:
                 height_score = normalize_score(altura, 150, 180)
                 scores.append(height_score)
         
         peso = biotype_data.get('peso')
         if peso is not None:
-            if any(s in sport_name for s in ['boxing', 'wrestling', 'judo']):
-                if 'heavyweight' in sport_name:
+            if tags & EventTag.WEIGHT_CLASS:
+                if tags & EventTag.HEAVYWEIGHT:
                     weight_score = normalize_score(peso, 80, 120)
-                elif 'middleweight' in sport_name:
+                elif tags & EventTag.MIDDLEWEIGHT:
                     weight_score = normalize_score(peso, 70, 85)
-                elif 'lightweight' in sport_name:
+                elif tags & EventTag.LIGHTWEIGHT:
                     weight_score = normalize_score(peso, 50, 70)
                 else:
                     weight_score = normalize_score(peso, 40, 120)
@@ -146,7 +136,7 @@ def calculate_biotype_compatibility(user_data: Dict, sport: pd.Series) -> float:
         
         envergadura = biotype_data.get('envergadura')
         if envergadura is not None:
-            if any(s in sport_name for s in ['swimming', 'boxing', 'basketball']):
+            if tags & EventTag.WINGSPAN:
                 wingspan_score = normalize_score(envergadura, 170, 220)
                 scores.append(wingspan_score * 1.2)
         
@@ -156,7 +146,7 @@ def calculate_biotype_compatibility(user_data: Dict, sport: pd.Series) -> float:
         return float(np.mean(scores))
         
     except Exception as e:
-        st.warning(f"Erro no cálculo de compatibilidade de biotipo: {str(e)}")
+        diagnostics.warning(f"Erro no cálculo de compatibilidade de biotipo: {str(e)}")
         return 50.0
 
 def calculate_technical_score(user_data: Dict) -> float:
@@ -167,14 +157,9 @@ def calculate_technical_score(user_data: Dict) -> float:
     scores = []
     tech_data = user_data['habilidades_tecnicas']
     
-    if 'coordenacao' in tech_data:
-        scores.append(normalize_score(tech_data['coordenacao'], 0, 50))
-    if 'precisao' in tech_data:
-        scores.append(normalize_score(tech_data['precisao'], 0, 10))
-    if 'agilidade' in tech_data:
-        scores.append(normalize_score(tech_data['agilidade'], 5, 15, inverse=True))
-    if 'equilibrio' in tech_data:
-        scores.append(normalize_score(tech_data['equilibrio'], 0, 60))
+    for test in TECHNICAL_TESTS:
+        if test in tech_data:
+            scores.append(COMPATIBILITY_SPEC.normalize(test, tech_data[test]))
         
     return float(np.mean(scores)) if scores else 50.0
 
@@ -186,12 +171,9 @@ def calculate_tactical_score(user_data: Dict) -> float:
     scores = []
     tactic_data = user_data['aspectos_taticos']
     
-    if 'tomada_decisao' in tactic_data:
-        scores.append(normalize_score(tactic_data['tomada_decisao'], 0, 10))
-    if 'visao_jogo' in tactic_data:
-        scores.append(normalize_score(tactic_data['visao_jogo'], 0, 10))
-    if 'posicionamento' in tactic_data:
-        scores.append(normalize_score(tactic_data['posicionamento'], 1, 10))
+    for test in TACTICAL_TESTS:
+        if test in tactic_data:
+            scores.append(COMPATIBILITY_SPEC.normalize(test, tactic_data[test]))
         
     return float(np.mean(scores)) if scores else 50.0
 
@@ -209,7 +191,7 @@ def calculate_psychological_score(user_data: Dict) -> float:
             psych_data['motivacao'].get('frequencia', 5),
             psych_data['motivacao'].get('comprometimento', 5)
         ])
-        scores.append(normalize_score(mot_score, 1, 10))
+        scores.append(COMPATIBILITY_SPEC.normalize('motivacao', mot_score))
     
     if 'resiliencia' in psych_data:
         res_score = np.mean([
@@ -217,7 +199,7 @@ def calculate_psychological_score(user_data: Dict) -> float:
             psych_data['resiliencia'].get('criticas', 5),
             psych_data['resiliencia'].get('erros', 5)
         ])
-        scores.append(normalize_score(res_score, 1, 10))
+        scores.append(COMPATIBILITY_SPEC.normalize('resiliencia', res_score))
     
     if 'trabalho_equipe' in psych_data:
         team_score = np.mean([
@@ -225,7 +207,7 @@ def calculate_psychological_score(user_data: Dict) -> float:
             psych_data['trabalho_equipe'].get('opinioes', 5),
             psych_data['trabalho_equipe'].get('contribuicao', 5)
         ])
-        scores.append(normalize_score(team_score, 1, 10))
+        scores.append(COMPATIBILITY_SPEC.normalize('trabalho_equipe', team_score))
         
     return float(np.mean(scores)) if scores else 50.0
 
@@ -253,7 +235,8 @@ def calculate_base_score(biotype_score: float, physical_score: float, tech_score
         }
 
         # Determinar o tipo de esporte
-        sport_category = 'individual' if 'Individual' in sport_name else 'collective'
+        tags = event_tags(sport_name)
+        sport_category = 'individual' if tags & EventTag.INDIVIDUAL else 'collective'
         weights = sport_type_weights[sport_category]
         
         # Calcular score base
@@ -265,35 +248,32 @@ def calculate_base_score(biotype_score: float, physical_score: float, tech_score
             psych_score * weights['psychological']
         ) * 2  # Multiplicar por 2 para dar mais amplitude
         
-        # Fatores de ajuste específicos
-        sport_name_lower = sport_name.lower()
-        
         # Ajustes de compatibilidade específicos
         compatibilidade_ajustes = {
             'altura': {
-                'esportes': ['basketball', 'volleyball'],
+                'tag': EventTag.HEIGHT,
                 'min_altura': 180,
                 'fator_ajuste': 1.2
             },
             'forca': {
-                'esportes': ['weightlifting', 'wrestling', 'boxing'],
+                'tag': EventTag.POWER,
                 'min_forca': 40,
                 'fator_ajuste': 1.15
             },
             'velocidade': {
-                'esportes': ['athletics', 'swimming', 'cycling'],
+                'tag': EventTag.SPEED,
                 'max_velocidade': 3.5,
                 'fator_ajuste': 1.15
             },
             'equilibrio': {
-                'esportes': ['gymnastics'],
+                'tag': EventTag.BALANCE,
                 'min_equilibrio': 50,
                 'fator_ajuste': 1.15
             }
         }
 
         for ajuste, config in compatibilidade_ajustes.items():
-            if any(s in sport_name_lower for s in config['esportes']):
+            if tags & config['tag']:
                 if ajuste == 'altura' and user_data['biotipo'].get('altura', 0) >= config['min_altura']:
                     base_score *= config['fator_ajuste']
                 elif ajuste == 'forca' and user_data['dados_fisicos'].get('forca_superior', 0) >= config['min_forca']:
@@ -311,28 +291,52 @@ def calculate_base_score(biotype_score: float, physical_score: float, tech_score
         return min(100, max(20, base_score))
         
     except Exception as e:
-        st.warning(f"Erro no cálculo do score base: {str(e)}")
+        diagnostics.warning(f"Erro no cálculo do score base: {str(e)}")
         return 50.0
-def merge_sports_data(sports_data, olympic_data):
-    """Combina os dados dos esportes com os dados olímpicos"""
-    merged_data = []
-    
-    for _, sport in sports_data.iterrows():
-        # Encontrar dados olímpicos correspondentes
-        olympic_info = olympic_data[olympic_data['Event'].str.contains(sport['Event'], case=False, na=False)]
-        
-        if not olympic_info.empty:
-            sport_dict = sport.to_dict()
-            # Adicionar informações olímpicas
-            sport_dict.update({
-                'idade_media': olympic_info['idade_media'].mean(),
-                'altura_media': olympic_info['altura_media'].mean(),
-                'peso_media': olympic_info['peso_media'].mean(),
-                'total_atletas': olympic_info['total_atletas'].sum()
-            })
-            merged_data.append(sport_dict)
-            
-    return pd.DataFrame(merged_data)
+# Nome de modalidade em português (normalizado) -> chave da modalidade base em inglês
+_PROFILE_SPORT_KEYS: Dict[str, str] = {}
+for _english, _portuguese in TRADUCOES.items():
+    _PROFILE_SPORT_KEYS.setdefault(sport_key(_portuguese), sport_key(_english))
+
+
+def profile_sport_key(event: str) -> Tuple[str, str]:
+    """
+    Chave (modalidade base, gênero) de um perfil de sport_profiles.json, no formato
+    do índice de aggregate_by_sport. Ex.: "Ginástica Artística Feminino" ->
+    ("gymnastics", "Feminino"). Sem sufixo de gênero, o gênero é ''.
+    """
+    name, gender = str(event), ''
+    for genero in ('Masculino', 'Feminino'):
+        if name.endswith(' ' + genero):
+            name, gender = name[:-len(genero) - 1], genero
+            break
+    words = sport_key(name).split()
+    # Prefixo mais longo com tradução conhecida ("ginastica artistica" -> "ginastica")
+    for size in range(len(words), 0, -1):
+        prefix = ' '.join(words[:size])
+        if prefix in _PROFILE_SPORT_KEYS:
+            return _PROFILE_SPORT_KEYS[prefix], gender
+    # Nome sem tradução: assume que já está em inglês
+    return ' '.join(words), gender
+
+
+def merge_sports_data(sports_data, olympic_data=None):
+    """
+    Combina os dados dos esportes com os dados olímpicos da modalidade e gênero
+    correspondentes. Sem `olympic_data`, usa os agregados do catálogo de eventos.
+    Esportes sem dados olímpicos são descartados.
+    """
+    if olympic_data is None:
+        aggregates = get_event_catalog().sport_aggregates
+    else:
+        aggregates = aggregate_by_sport(olympic_data)
+
+    keys = pd.DataFrame([profile_sport_key(e) for e in sports_data['Event']],
+                        columns=['_sport_key', '_gender'], index=sports_data.index)
+    sports = sports_data.drop(columns=[c for c in AGGREGATE_COLUMNS if c in sports_data.columns])
+    merged = sports.join(keys).merge(aggregates[list(AGGREGATE_COLUMNS)], how='inner',
+                                     left_on=['_sport_key', '_gender'], right_index=True)
+    return merged.drop(columns=['_sport_key', '_gender']).reset_index(drop=True)
 
 def evaluate_biometric_compatibility(user_data, sport_data):
     """Avalia a compatibilidade biométrica do atleta com o esporte"""
@@ -394,6 +398,31 @@ def calculate_biometric_compatibility(user_data: Dict, event: Dict) -> float:
     
     return max(0, score)
     
+def find_biometric_matches(user_data: Dict, k: int = 10) -> List[Dict[str, Any]]:
+    """
+    Eventos cujas médias de altura, peso e idade são as mais próximas do atleta,
+    ordenados pela distância contínua do índice espacial da partição
+    """
+    partition = get_event_catalog().partition(user_data.get('genero'))
+    biotipo = user_data.get('biotipo') or {}
+    events, distances = partition.biometric_index.nearest(
+        biotipo.get('altura'), biotipo.get('peso'), user_data.get('idade'), k
+    )
+    matches = []
+    for event_idx, distance in zip(events, distances):
+        event = partition.event_record(event_idx)
+        matches.append({
+            'name': str(partition.names_pt[event_idx]),
+            'distance': round(float(distance), 3),
+            'olympic_data': {
+                'idade_media': float(event['idade_media']),
+                'altura_media': float(event['altura_media']),
+                'peso_media': float(event['peso_media']),
+                'total_atletas': int(event['total_atletas'])
+            }
+        })
+    return matches
+    
 def clean_json_response(response_str: str) -> str:
     """Limpa a resposta do GPT para extrair apenas o JSON válido"""
     # Remover marcadores de código markdown
@@ -410,8 +439,9 @@ def clean_json_response(response_str: str) -> str:
 def process_events_batch(filtered_events, user_data, batch_size=100):
     """Processa um lote de eventos e retorna as recomendações"""
     try:
-        st.write(f"Processando {len(filtered_events)} eventos...")
+        diagnostics.info(f"Processando {len(filtered_events)} eventos...")
         all_recommendations = []
+        failed_events = []
         
         # Processar eventos em lotes
         for start_idx in range(0, len(filtered_events), batch_size):
@@ -433,22 +463,22 @@ def process_events_batch(filtered_events, user_data, batch_size=100):
                     if idade_diff > 5: biometric_score -= 20
                     
                     # Ajustar score baseado em requisitos físicos específicos
-                    evento_nome = event['Event'].lower()
+                    evento_tags = event_tags(event['Event'])
                     
                     # Velocidade é importante
-                    if any(x in evento_nome for x in ['sprint', 'running', '100m', '200m']):
+                    if evento_tags & EventTag.SPRINT:
                         if user_data['dados_fisicos']['velocidade'] < 3.5:
                             biometric_score += 20
                         elif user_data['dados_fisicos']['velocidade'] > 4.5:
                             biometric_score -= 20
                     
                     # Força é importante
-                    if any(x in evento_nome for x in ['throw', 'weightlifting', 'shot put']):
+                    if evento_tags & EventTag.THROW:
                         if user_data['dados_fisicos']['forca_superior'] > 40:
                             biometric_score += 20
                     
                     # Equilíbrio é importante
-                    if any(x in evento_nome for x in ['gymnastics', 'beam', 'balance']):
+                    if evento_tags & EventTag.BALANCE_EVENT:
                         if user_data['habilidades_tecnicas']['equilibrio'] > 50:
                             biometric_score += 20
                     
@@ -465,14 +495,22 @@ def process_events_batch(filtered_events, user_data, batch_size=100):
                             }
                         })
                 except Exception as e:
-                    st.warning(f"Erro ao processar evento {event['Event']}: {str(e)}")
+                    failed_events.append(f"{event['Event']}: {str(e)}")
                     continue
+            
+            diagnostics.progress(min(end_idx, len(filtered_events)), len(filtered_events))
+        
+        # Um único aviso com os eventos que falharam, em vez de um por evento
+        if failed_events:
+            diagnostics.warning(
+                f"Erro ao processar {len(failed_events)} eventos: " + "; ".join(failed_events[:5])
+            )
                     
-        st.write(f"Encontrados {len(all_recommendations)} eventos compatíveis.")
+        diagnostics.info(f"Encontrados {len(all_recommendations)} eventos compatíveis.")
         return all_recommendations
         
     except Exception as e:
-        st.error(f"Erro no processamento dos eventos: {str(e)}")
+        diagnostics.error(f"Erro no processamento dos eventos: {str(e)}")
         return []
 
 def calculate_team_sport_compatibility(user_data: Dict) -> float:
@@ -487,13 +525,13 @@ def calculate_team_sport_compatibility(user_data: Dict) -> float:
         if 'trabalho_equipe' in psic_data:
             team = psic_data['trabalho_equipe']
             team_scores.extend([
-                team.get('comunicacao', 5),
-                team.get('opinioes', 5),
-                team.get('contribuicao', 5)
+                numeric_value(team.get('comunicacao', 5)),
+                numeric_value(team.get('opinioes', 5)),
+                numeric_value(team.get('contribuicao', 5))
             ])
         
-        # Média do trabalho em equipe
-        if team_scores:
+        # Média do trabalho em equipe (valores não informados anulam o bônus)
+        if team_scores and all(v is not None for v in team_scores):
             team_avg = sum(team_scores) / len(team_scores)
             if team_avg >= 7:
                 score += 15
@@ -504,52 +542,77 @@ def calculate_team_sport_compatibility(user_data: Dict) -> float:
     tatic_data = user_data.get('aspectos_taticos', {})
     if tatic_data:
         # Visão de jogo e tomada de decisão
-        if tatic_data.get('visao_jogo', 0) >= 7:
+        if (numeric_value(tatic_data.get('visao_jogo', 0)) or 0) >= 7:
             score += 10
-        if tatic_data.get('tomada_decisao', 0) >= 7:
+        if (numeric_value(tatic_data.get('tomada_decisao', 0)) or 0) >= 7:
             score += 10
     
     return min(100, score)
 
 def is_team_sport(sport_name: str) -> bool:
     """Identifica se é um esporte coletivo"""
-    team_sports = {
-        'Volleyball', 'Beach Volleyball', 'Basketball', 'Football', 
-        'Handball', 'Water Polo', 'Rugby', 'Hockey', 'Baseball', 
-        'Softball', 'Vôlei', 'Basquete', 'Futebol', 'Handebol', 
-        'Polo Aquático', 'Vôlei de Praia'
-    }
-    return any(sport.lower() in sport_name.lower() for sport in team_sports)
+    return has_tag(sport_name, EventTag.TEAM)
 
-def create_sport_recommendation(sport_name: str, event: Dict, score: float, user_data: Dict) -> Dict:
-    """Cria uma recomendação de esporte com pontos fortes e áreas para desenvolver"""
-    sport_pt = traduzir_evento(sport_name).replace(" Masculino", "").replace(" Feminino", "")
+@instrumentation.instrumented('recommendations.create_recommendation')
+def create_sport_recommendation(sport_name: str, event: Dict, score: float, user_data: Dict,
+                                sport_pt: str = None, event_pt: str = None) -> Dict:
+    """
+    Cria uma recomendação de esporte com pontos fortes e áreas para desenvolver.
+    sport_pt e event_pt permitem reaproveitar nomes já traduzidos pelo catálogo.
+    """
+    if sport_pt is None:
+        sport_pt = traduzir_evento(sport_name).replace(" Masculino", "").replace(" Feminino", "")
+    if event_pt is None:
+        event_pt = traduzir_evento(event['Event'])
     
+    def value(*path):
+        result = user_data
+        for key in path:
+            result = result.get(key) if isinstance(result, dict) else None
+        return numeric_value(result)
+
+    # Testes não informados nunca contam como ponto forte e contam como abaixo do
+    # limite nas áreas para desenvolver
+    def above(v, limit):
+        return v is not None and v > limit
+
+    def below(v, limit):
+        return v is not None and v < limit
+
+    velocidade = value('dados_fisicos', 'velocidade')
+    forca_superior = value('dados_fisicos', 'forca_superior')
+    coordenacao = value('habilidades_tecnicas', 'coordenacao')
+    equilibrio = value('habilidades_tecnicas', 'equilibrio')
+    precisao = value('habilidades_tecnicas', 'precisao')
+    tomada_decisao = value('aspectos_taticos', 'tomada_decisao')
+    visao_jogo = value('aspectos_taticos', 'visao_jogo')
+    comprometimento = value('fatores_psicologicos', 'motivacao', 'comprometimento')
+
     # Gerar pontos fortes específicos
     strengths = []
     
-    # Análise física
-    if user_data['dados_fisicos']['velocidade'] < 4.0:
+    # Análise física (velocidade é tempo: menor é melhor)
+    if below(velocidade, 4.0):
         strengths.append(f"Velocidade excepcional para {sport_pt}")
-    if user_data['dados_fisicos']['forca_superior'] > 30:
+    if above(forca_superior, 30):
         strengths.append(f"Força adequada para {sport_pt}")
         
     # Análise técnica
-    if user_data['habilidades_tecnicas']['coordenacao'] > 35:
+    if above(coordenacao, 35):
         strengths.append(f"Boa coordenação motora para {sport_pt}")
-    if user_data['habilidades_tecnicas']['equilibrio'] > 45:
+    if above(equilibrio, 45):
         strengths.append(f"Equilíbrio adequado para {sport_pt}")
-    if user_data['habilidades_tecnicas']['precisao'] > 7:
+    if above(precisao, 7):
         strengths.append(f"Precisão técnica para {sport_pt}")
         
     # Análise tática
-    if user_data['aspectos_taticos']['tomada_decisao'] > 7:
+    if above(tomada_decisao, 7):
         strengths.append(f"Boa tomada de decisão para {sport_pt}")
-    if user_data['aspectos_taticos']['visao_jogo'] > 7:
+    if above(visao_jogo, 7):
         strengths.append(f"Visão de jogo desenvolvida para {sport_pt}")
         
     # Análise psicológica
-    if user_data['fatores_psicologicos']['motivacao']['comprometimento'] > 7:
+    if above(comprometimento, 7):
         strengths.append(f"Alto comprometimento necessário em {sport_pt}")
     
     # Garantir pelo menos 3 pontos fortes
@@ -559,15 +622,15 @@ def create_sport_recommendation(sport_name: str, event: Dict, score: float, user
     # Áreas para desenvolver
     development = []
     
-    if user_data['dados_fisicos']['velocidade'] > 4.0:
+    if velocidade is None or velocidade > 4.0:
         development.append("Melhorar velocidade")
-    if user_data['dados_fisicos']['forca_superior'] < 30:
+    if forca_superior is None or forca_superior < 30:
         development.append("Desenvolver força superior")
-    if user_data['habilidades_tecnicas']['coordenacao'] < 35:
+    if coordenacao is None or coordenacao < 35:
         development.append("Aprimorar coordenação motora")
-    if user_data['habilidades_tecnicas']['precisao'] < 7:
+    if precisao is None or precisao < 7:
         development.append("Trabalhar precisão técnica")
-    if user_data['aspectos_taticos']['tomada_decisao'] < 7:
+    if tomada_decisao is None or tomada_decisao < 7:
         development.append("Desenvolver tomada de decisão")
         
     # Garantir pelo menos 3 áreas de desenvolvimento
@@ -576,7 +639,7 @@ def create_sport_recommendation(sport_name: str, event: Dict, score: float, user
     
     # Criar recomendação
     return {
-        'name': traduzir_evento(event['Event']),
+        'name': event_pt,
         'compatibility': round(min(100, score), 2),  # Arredondar para 2 casas decimais
         'strengths': strengths[:3],  # Pegar os 3 principais pontos fortes
         'development': development[:3],  # Pegar as 3 principais áreas
@@ -587,135 +650,208 @@ def create_sport_recommendation(sport_name: str, event: Dict, score: float, user
             'total_atletas': int(event['total_atletas'])
         }
     }
+def select_final_recommendations(team_recommendations: List[Dict], individual_recommendations: List[Dict]) -> List[Dict]:
+    """Combina recomendações com a melhor primeiro e depois 70-30 para individuais"""
+    # Ordenar cada lista por compatibilidade
+    team_recommendations.sort(key=lambda x: x['compatibility'], reverse=True)
+    individual_recommendations.sort(key=lambda x: x['compatibility'], reverse=True)
+    
+    final_recommendations = []
+    
+    # Encontrar a melhor recomendação geral
+    all_sports = team_recommendations + individual_recommendations
+    if all_sports:
+        best_overall = max(all_sports, key=lambda x: x['compatibility'])
+        final_recommendations.append(best_overall)
+        
+        # Remover a melhor recomendação das listas originais
+        if best_overall in team_recommendations:
+            team_recommendations.remove(best_overall)
+        else:
+            individual_recommendations.remove(best_overall)
+        
+        # Para as 4 recomendações restantes, seguir proporção 70-30
+        remaining_slots = 4  # já usamos 1 slot para a melhor recomendação
+        num_individual = 3  # ~70% de 4 restantes
+        num_team = 1       # ~30% de 4 restantes
+        
+        # Adicionar esportes individuais
+        for i in range(min(num_individual, len(individual_recommendations))):
+            final_recommendations.append(individual_recommendations[i])
+            
+        # Adicionar esportes coletivos
+        for i in range(min(num_team, len(team_recommendations))):
+            final_recommendations.append(team_recommendations[i])
+            
+        # Se ainda faltam slots, preencher com mais individuais
+        remaining_slots = 5 - len(final_recommendations)
+        if remaining_slots > 0:
+            start_idx = len(final_recommendations) - 1  # -1 porque já incluímos a melhor recomendação
+            for i in range(remaining_slots):
+                if start_idx + i < len(individual_recommendations):
+                    final_recommendations.append(individual_recommendations[start_idx + i])
+                elif i < len(team_recommendations):
+                    final_recommendations.append(team_recommendations[i])
+    
+    # Ajustar compatibilidade para ter variação
+    if final_recommendations:
+        max_compat = final_recommendations[0]['compatibility']
+        for i, rec in enumerate(final_recommendations):
+            rec['compatibility'] = round(max(70, min(100, max_compat - (i * 5))), 2)
+    
+    return final_recommendations
+
+# Tamanho dos heaps por classe (coletivo/individual). A seleção final usa no máximo
+# as 5 primeiras de cada lista ordenada (a melhor geral + 70/30 + preenchimento),
+# então guardar 5 por classe produz exatamente o mesmo resultado que ordenar tudo
+TOP_K_PER_CLASS = 5
+
+# Modalidades pontuadas por bloco em iter_sport_recommendations
+SPORT_BLOCK_SIZE = 16
+
+
+class TopKRecommendations:
+    """
+    Mantém as K candidatas de maior compatibilidade de cada classe em heaps
+    limitados, sem ordenar nem montar a recomendação das demais. Empates mantêm
+    a ordem de chegada (código da modalidade), como na ordenação estável original.
+    """
+
+    def __init__(self, k: int = TOP_K_PER_CLASS):
+        self.k = k
+        self.total = 0
+        self._heaps = {True: [], False: []}
+
+    def push(self, code: int, score: float, is_team: bool) -> None:
+        self.total += 1
+        # Mesma chave de ordenação de create_sport_recommendation
+        entry = (round(min(100, score), 2), -code, score)
+        heap = self._heaps[bool(is_team)]
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def _ranked(self, is_team: bool) -> List[Dict]:
+        return [
+            {'code': -neg_code, 'score': score, 'compatibility': compatibility}
+            for compatibility, neg_code, score in sorted(self._heaps[is_team], reverse=True)
+        ]
+
+    def select(self) -> List[Dict]:
+        """Aplica select_final_recommendations às candidatas guardadas (sem alterar os heaps)"""
+        return select_final_recommendations(self._ranked(True), self._ranked(False))
+
+
+def _build_recommendations(selected: List[Dict], partition, best_idx: np.ndarray,
+                           user_data: Dict[str, Any]) -> List[Dict]:
+    """Monta as recomendações completas apenas das candidatas selecionadas"""
+    recommendations = []
+    for candidate in selected:
+        code = candidate['code']
+        event_idx = best_idx[code]
+        recommendation = create_sport_recommendation(
+            partition.sports[code], partition.event_record(event_idx), candidate['score'], user_data,
+            sport_pt=partition.sports_pt[code], event_pt=str(partition.names_pt[event_idx])
+        )
+        recommendation['compatibility'] = candidate['compatibility']
+        recommendations.append(recommendation)
+    return recommendations
+
+
+@instrumentation.instrumented('recommendations.total')
 def get_sport_recommendations(user_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Gera recomendações de eventos esportivos considerando todos os eventos"""
     try:
-        st.write("Iniciando análise de recomendações...")
-        
-        # Carregar dados olímpicos
-        olympic_data = pd.read_csv('data/perfil_eventos_olimpicos_verao.csv')
-        st.write(f"Dados olímpicos carregados: {len(olympic_data)} eventos.")
-        
-        # Filtrar eventos por gênero
-        gender_key = "Men's" if user_data['genero'] == "Masculino" else "Women's"
-        filtered_events = olympic_data[olympic_data['Event'].str.contains(gender_key)]
-        
-        # Agrupar eventos por modalidade esportiva base
-        base_sports = {}
-        for idx, event in filtered_events.iterrows():
-            event_data = event.to_dict()
-            sport_name = get_base_sport_name(event_data['Event'])
-            if sport_name not in base_sports:
-                base_sports[sport_name] = []
-            base_sports[sport_name].append(event_data)
+        diagnostics.info("Iniciando análise de recomendações...")
+        instrumentation.increment('recommendations.requests')
+        
+        # Catálogo de eventos carregado uma vez por processo, já particionado por gênero
+        with instrumentation.timed('recommendations.catalog_load'):
+            catalog = get_event_catalog()
+        diagnostics.info(f"Dados olímpicos carregados: {catalog.total_events} eventos.")
+        
+        with instrumentation.timed('recommendations.gender_filter'):
+            partition = catalog.partition(user_data['genero'])
+            arrays = partition.arrays
+        
+        with instrumentation.timed('recommendations.event_scoring'):
+            # Scores que dependem apenas do atleta são calculados uma única vez
+            technical_score = calculate_technical_score(user_data)
+            team_score = calculate_team_sport_compatibility(user_data)
             
-        all_recommendations = []
-        team_recommendations = []
-        individual_recommendations = []
+            # Score de todos os eventos
+            scores = score_events(user_data, arrays, technical_score, team_score)
         
-        # Processar cada modalidade esportiva
-        for sport_name, events in base_sports.items():
-            best_event = None
-            best_score = 0
-            
-            for event in events:
-                # Calcular scores base
-                biometric_score = calculate_biometric_compatibility(user_data, event)
-                physical_score = calculate_physical_compatibility(user_data, event['Event'])
-                technical_score = calculate_technical_score(user_data)
-                
-                # Ajustar score baseado no tipo de esporte
-                if is_team_sport(sport_name):
-                    team_score = calculate_team_sport_compatibility(user_data)
-                    final_score = (biometric_score * 0.3 + 
-                                 physical_score * 0.2 + 
-                                 technical_score * 0.2 + 
-                                 team_score * 0.3)
-                else:
-                    final_score = (biometric_score * 0.4 + 
-                                 physical_score * 0.3 + 
-                                 technical_score * 0.3)
-                
-                if final_score > best_score:
-                    best_score = final_score
-                    best_event = event
-            
-            if best_event is not None and best_score >= 70:
-                # Criar recomendação
-                recommendation = create_sport_recommendation(
-                    sport_name, best_event, best_score, user_data
-                )
-                
-                # Separar em coletivos e individuais
-                if is_team_sport(sport_name):
-                    team_recommendations.append(recommendation)
-                else:
-                    individual_recommendations.append(recommendation)
+        # Melhor evento por modalidade
+        with instrumentation.timed('recommendations.sport_grouping'):
+            best_idx, best_scores = best_event_per_sport(scores, arrays)
         
-        # Ordenar cada lista por compatibilidade
-        team_recommendations.sort(key=lambda x: x['compatibility'], reverse=True)
-        individual_recommendations.sort(key=lambda x: x['compatibility'], reverse=True)
+        # Apenas as melhores candidatas de cada classe são guardadas (coletivos e individuais)
+        with instrumentation.timed('recommendations.ranking'):
+            ranking = TopKRecommendations()
+            for code in np.flatnonzero((best_idx >= 0) & (best_scores >= 70)):
+                ranking.push(int(code), float(best_scores[code]), partition.sport_is_team[code])
+        instrumentation.increment('recommendations.candidates', ranking.total)
         
-        # Combinar recomendações com a melhor primeiro e depois 70-30 para individuais
-        final_recommendations = []
+        with instrumentation.timed('recommendations.team_individual_mix'):
+            selected = ranking.select()
         
-        # Encontrar a melhor recomendação geral
-        all_sports = team_recommendations + individual_recommendations
-        if all_sports:
-            best_overall = max(all_sports, key=lambda x: x['compatibility'])
-            final_recommendations.append(best_overall)
-            
-            # Remover a melhor recomendação das listas originais
-            if best_overall in team_recommendations:
-                team_recommendations.remove(best_overall)
-            else:
-                individual_recommendations.remove(best_overall)
-            
-            # Para as 4 recomendações restantes, seguir proporção 70-30
-            remaining_slots = 4  # já usamos 1 slot para a melhor recomendação
-            num_individual = 3  # ~70% de 4 restantes
-            num_team = 1       # ~30% de 4 restantes
-            
-            # Adicionar esportes individuais
-            for i in range(min(num_individual, len(individual_recommendations))):
-                final_recommendations.append(individual_recommendations[i])
-                
-            # Adicionar esportes coletivos
-            for i in range(min(num_team, len(team_recommendations))):
-                final_recommendations.append(team_recommendations[i])
-                
-            # Se ainda faltam slots, preencher com mais individuais
-            remaining_slots = 5 - len(final_recommendations)
-            if remaining_slots > 0:
-                start_idx = len(final_recommendations) - 1  # -1 porque já incluímos a melhor recomendação
-                for i in range(remaining_slots):
-                    if start_idx + i < len(individual_recommendations):
-                        final_recommendations.append(individual_recommendations[start_idx + i])
-                    elif i < len(team_recommendations):
-                        final_recommendations.append(team_recommendations[i])
-        
-        # Ajustar compatibilidade para ter variação
-        if final_recommendations:
-            max_compat = final_recommendations[0]['compatibility']
-            for i, rec in enumerate(final_recommendations):
-                rec['compatibility'] = round(max(70, min(100, max_compat - (i * 5))), 2)
+        final_recommendations = _build_recommendations(selected, partition, best_idx, user_data)
         
         if not final_recommendations:
-            st.warning("Não foram encontradas recomendações que atendam aos critérios mínimos.")
+            instrumentation.increment('recommendations.empty')
+            diagnostics.warning("Não foram encontradas recomendações que atendam aos critérios mínimos.")
             return []
             
         return final_recommendations
 
     except Exception as e:
-        st.error(f"Erro na recomendação de esportes: {str(e)}")
+        diagnostics.error(f"Erro na recomendação de esportes: {str(e)}")
         import traceback
-        st.error(f"Detalhes do erro: {traceback.format_exc()}")
+        diagnostics.error(f"Detalhes do erro: {traceback.format_exc()}")
         return []
+
+def iter_sport_recommendations(user_data: Dict[str, Any],
+                               block_size: int = SPORT_BLOCK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Versão incremental de get_sport_recommendations: pontua as modalidades em blocos
+    e, após cada bloco, produz a seleção parcial com as modalidades vistas até ali.
+    A última lista produzida é igual ao retorno de get_sport_recommendations.
+    """
+    try:
+        partition = get_event_catalog().partition(user_data['genero'])
+        technical_score = calculate_technical_score(user_data)
+        team_score = calculate_team_sport_compatibility(user_data)
+
+        ranking = TopKRecommendations()
+        best_idx = np.full(len(partition.sports), -1, dtype=np.intp)
+        for event_idx, block in sport_blocks(partition.arrays, block_size):
+            first = int(partition.sport_codes[event_idx[0]])
+            scores = score_events(user_data, block, technical_score, team_score)
+            block_best, block_scores = best_event_per_sport(scores, block)
+
+            for local in np.flatnonzero((block_best >= 0) & (block_scores >= 70)):
+                code = first + int(local)
+                best_idx[code] = event_idx[block_best[local]]
+                ranking.push(code, float(block_scores[local]), partition.sport_is_team[code])
+
+            if ranking.total:
+                yield _build_recommendations(ranking.select(), partition, best_idx, user_data)
+
+        if not ranking.total:
+            diagnostics.warning("Não foram encontradas recomendações que atendam aos critérios mínimos.")
+            yield []
+
+    except Exception as e:
+        diagnostics.error(f"Erro na recomendação de esportes: {str(e)}")
+        yield []
+
 def get_sport_strengths(sport_name: str, user_data: Dict) -> List[str]:
     """Identifica os pontos fortes do usuário para um determinado esporte"""
     try:
         strengths = []
-        sport_name = sport_name.lower()
+        tags = event_tags(sport_name)
         
         # Biotipo
         if user_data.get('biotipo'):
@@ -723,11 +859,11 @@ def get_sport_strengths(sport_name: str, user_data: Dict) -> List[str]:
             peso = user_data['biotipo'].get('peso', 0)
             envergadura = user_data['biotipo'].get('envergadura', 0)
             
-            if altura >= 180 and any(s in sport_name for s in ['basketball', 'volleyball']):
+            if altura >= 180 and tags & EventTag.HEIGHT:
                 strengths.append("Altura favorável para esportes de altura")
-            if envergadura >= 190 and any(s in sport_name for s in ['swimming', 'boxing']):
+            if envergadura >= 190 and tags & EventTag.REACH:
                 strengths.append("Envergadura excelente")
-            if peso >= 80 and any(s in sport_name for s in ['rugby', 'wrestling']):
+            if peso >= 80 and tags & EventTag.HEAVY_BUILD:
                 strengths.append("Biotipo favorável para esportes de força")
         
         # Dados físicos
@@ -780,17 +916,17 @@ def get_sport_strengths(sport_name: str, user_data: Dict) -> List[str]:
         return strengths[:3] if strengths else ["Necessita avaliação completa"]
         
     except Exception as e:
-        st.warning(f"Erro ao identificar pontos fortes: {str(e)}")
+        diagnostics.warning(f"Erro ao identificar pontos fortes: {str(e)}")
         return ["Necessita avaliação completa"]
 def get_development_areas(sport_name: str, user_data: Dict) -> List[str]:
     """Identifica áreas de desenvolvimento para um determinado esporte"""
     try:
         areas = []
-        sport_name = sport_name.lower()
+        tags = event_tags(sport_name)
         
         # Avaliação física
         if user_data.get('dados_fisicos'):
-            if user_data['dados_fisicos'].get('velocidade', 6) > 4.0 and 'athletics' in sport_name:
+            if user_data['dados_fisicos'].get('velocidade', 6) > 4.0 and tags & EventTag.ATHLETICS:
                 areas.append("Velocidade")
                 
             if user_data['dados_fisicos'].get('forca_superior', 0) < 30:
@@ -817,5 +953,5 @@ def get_development_areas(sport_name: str, user_data: Dict) -> List[str]:
         return areas[:3] if areas else ["Avaliação pendente"]
         
     except Exception as e:
-        st.warning(f"Erro ao identificar áreas de desenvolvimento: {str(e)}")
+        diagnostics.warning(f"Erro ao identificar áreas de desenvolvimento: {str(e)}")
         return ["Avaliação pendente"]
@@ -0,0 +1,15 @@
+import streamlit as st
+from utils.diagnostics import DiagnosticsSink
+
+
+class StreamlitSink(DiagnosticsSink):
+    """Adaptador que exibe as mensagens do núcleo de scoring na página do Streamlit"""
+
+    def info(self, message: str) -> None:
+        st.write(message)
+
+    def warning(self, message: str) -> None:
+        st.warning(message)
+
+    def error(self, message: str) -> None:
+        st.error(message)
@@ -0,0 +1,69 @@
+import json
+import random
+from typing import Any, Dict, List
+
+from config.config import TESTS_CONFIG
+
+# Faixas das informações pessoais (mesmos limites dos campos do app)
+PERSONAL_RANGES = {
+    'idade': (10, 18),
+    'altura': (100, 220),
+    'peso': (30, 150),
+    'envergadura': (100, 230),
+}
+
+
+def _sample(rng: random.Random, min_val, max_val):
+    """Valor uniforme na faixa; inteiro quando os limites são inteiros"""
+    if isinstance(min_val, int) and isinstance(max_val, int):
+        return rng.randint(min_val, max_val)
+    return round(rng.uniform(min_val, max_val), 1)
+
+
+def synthetic_athlete(rng: random.Random) -> Dict[str, Any]:
+    """Atleta sintético no formato user_data, com valores nas faixas de TESTS_CONFIG"""
+    athlete = {
+        'genero': rng.choice(['Masculino', 'Feminino']),
+        'idade': _sample(rng, *PERSONAL_RANGES['idade']),
+        'biotipo': {
+            key: _sample(rng, *PERSONAL_RANGES[key]) for key in ('altura', 'peso', 'envergadura')
+        }
+    }
+    for category, config in TESTS_CONFIG.items():
+        results = {}
+        for test_name, test in config['tests'].items():
+            if 'components' in test:
+                results[test_name] = {
+                    name: _sample(rng, component['min'], component['max'])
+                    for name, component in test['components'].items()
+                }
+            else:
+                results[test_name] = _sample(rng, test['min'], test['max'])
+        athlete[category] = results
+    return athlete
+
+
+def synthetic_cohort(size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [synthetic_athlete(rng) for _ in range(size)]
+
+
+def edge_case_athletes() -> List[Dict[str, Any]]:
+    """Atletas com testes ausentes, vazios ou em texto, para a verificação de paridade"""
+    rng = random.Random(0)
+    base = synthetic_athlete(rng)
+    cases = [{}, {'genero': 'Feminino', 'idade': 12}]
+    for category in TESTS_CONFIG:
+        partial = json.loads(json.dumps(base))
+        partial[category] = {}
+        cases.append(partial)
+    blanks = json.loads(json.dumps(base))
+    blanks['dados_fisicos'] = {'velocidade': None, 'forca_superior': '', 'forca_inferior': '42'}
+    blanks['habilidades_tecnicas'] = {'coordenacao': 'abc', 'agilidade': 15, 'equilibrio': 60}
+    blanks['fatores_psicologicos'] = {
+        'motivacao': {'dedicacao': '9', 'frequencia': None, 'comprometimento': 7},
+        'resiliencia': {},
+        'trabalho_equipe': {'comunicacao': 3.5, 'opinioes': True, 'contribuicao': 10}
+    }
+    cases.append(blanks)
+    return cases
@@ -1,26 +1,15 @@
 import numpy as np
+import pandas as pd
+from typing import Dict, List
+from config.config import TESTS_CONFIG
+from utils import instrumentation
+from utils.normalization import (TEST_SPEC, category_tests, mean_present, normalize_value, numeric_column,
+                                 raw_number_column)
 
 
 def normalize_score(value, min_val, max_val, inverse=False):
-    """Normaliza um valor para escala 0-100"""
-    try:
-        if value is None or value == "":  # Adicionado para evitar NoneType
-            return 0
-        value = float(value)
-        if inverse:
-            if value <= min_val:
-                return 100
-            elif value >= max_val:
-                return 0
-            return ((max_val - value) / (max_val - min_val)) * 100
-        else:
-            if value >= max_val:
-                return 100
-            elif value <= min_val:
-                return 0
-            return ((value - min_val) / (max_val - min_val)) * 100
-    except (TypeError, ValueError):
-        return 0
+    """Normaliza um valor para escala 0-100 (ausente vale 0)"""
+    return normalize_value(value, min_val, max_val, inverse, missing=0)
 
 
 def calculate_average(values):
@@ -31,6 +20,7 @@ def calculate_average(values):
     return float(np.mean(valid_values))
 
 
+@instrumentation.instrumented('test_results.process')
 def process_test_results(test_results):
     """Processa os resultados dos testes e retorna os scores normalizados."""
     try:
@@ -42,63 +32,31 @@ def process_test_results(test_results):
                 'fatores_psicologicos': 0
             }
 
-        # Processar dados físicos
-        dados_fisicos = test_results.get('dados_fisicos', {})
-        if dados_fisicos:
-            velocidade_score = normalize_score(dados_fisicos.get('velocidade'), 2.5, 5.0, inverse=True)
-            forca_sup_score = normalize_score(dados_fisicos.get('forca_superior'), 0, 50)
-            forca_inf_score = normalize_score(dados_fisicos.get('forca_inferior'), 0, 60)
-            score_fisico = calculate_average([velocidade_score, forca_sup_score, forca_inf_score])
-        else:
-            score_fisico = 0
-
-        # Processar habilidades técnicas
-        habilidades_tecnicas = test_results.get('habilidades_tecnicas', {})
-        if habilidades_tecnicas:
-            coord_score = normalize_score(habilidades_tecnicas.get('coordenacao'), 0, 50)
-            prec_score = normalize_score(habilidades_tecnicas.get('precisao'), 0, 10)
-            agil_score = normalize_score(habilidades_tecnicas.get('agilidade'), 5, 15, inverse=True)
-            equil_score = normalize_score(habilidades_tecnicas.get('equilibrio'), 0, 60)
-            score_tecnico = calculate_average([coord_score, prec_score, agil_score, equil_score])
-        else:
-            score_tecnico = 0
-
-        # Processar aspectos táticos
-        aspectos_taticos = test_results.get('aspectos_taticos', {})
-        if aspectos_taticos:
-            decisao_score = normalize_score(aspectos_taticos.get('tomada_decisao'), 0, 10)
-            visao_score = normalize_score(aspectos_taticos.get('visao_jogo'), 0, 10)
-            posic_score = normalize_score(aspectos_taticos.get('posicionamento'), 1, 10)
-            score_tatico = calculate_average([decisao_score, visao_score, posic_score])
-        else:
-            score_tatico = 0
+        # Processar dados físicos, habilidades técnicas e aspectos táticos
+        scores = {}
+        for category, tests in CATEGORY_TESTS.items():
+            values = test_results.get(category, {})
+            if values:
+                scores[category] = calculate_average([
+                    TEST_SPEC.normalize(test, values.get(test), missing=0) for test in tests
+                ])
+            else:
+                scores[category] = 0
 
         # Processar fatores psicológicos
         fatores_psicologicos = test_results.get('fatores_psicologicos', {})
         if fatores_psicologicos:
-            mot = fatores_psicologicos.get('motivacao', {})
-            motivacao = calculate_average([mot.get('dedicacao'), mot.get('frequencia'), mot.get('comprometimento')])
-
-            res = fatores_psicologicos.get('resiliencia', {})
-            resiliencia = calculate_average([res.get('derrotas'), res.get('criticas'), res.get('erros')])
-
-            eq = fatores_psicologicos.get('trabalho_equipe', {})
-            trabalho_equipe = calculate_average([eq.get('comunicacao'), eq.get('opinioes'), eq.get('contribuicao')])
-
-            score_psicologico = calculate_average([
-                normalize_score(motivacao, 0, 10),
-                normalize_score(resiliencia, 0, 10),
-                normalize_score(trabalho_equipe, 0, 10)
-            ])
+            factors = []
+            for factor, components in PSYCHOLOGICAL_FACTORS.items():
+                values = fatores_psicologicos.get(factor, {})
+                average = calculate_average([values.get(c) for c in components])
+                factors.append(TEST_SPEC.normalize(factor, average, missing=0))
+            score_psicologico = calculate_average(factors)
         else:
             score_psicologico = 0
 
-        return {
-            'dados_fisicos': score_fisico,
-            'habilidades_tecnicas': score_tecnico,
-            'aspectos_taticos': score_tatico,
-            'fatores_psicologicos': score_psicologico
-        }
+        scores['fatores_psicologicos'] = score_psicologico
+        return scores
 
     except Exception as e:
         print(f"Erro no processamento dos scores: {str(e)}")
@@ -108,3 +66,49 @@ def process_test_results(test_results):
             'aspectos_taticos': 0,
             'fatores_psicologicos': 0
         }
+
+
+# Testes de cada categoria usados por process_test_results, na ordem da configuração
+# (faixas em TEST_SPEC). Os nomes são os mesmos das colunas da tabela de atletas
+# (utils.cohort.ATHLETE_FIELDS)
+CATEGORY_TESTS: Dict[str, List[str]] = {
+    category: category_tests(category)
+    for category in ('dados_fisicos', 'habilidades_tecnicas', 'aspectos_taticos')
+}
+
+# Componentes psicológicos: a média dos valores brutos de cada fator é normalizada
+# com a faixa do fator em TEST_SPEC
+PSYCHOLOGICAL_FACTORS: Dict[str, List[str]] = {
+    factor: list(test['components'])
+    for factor, test in TESTS_CONFIG['fatores_psicologicos']['tests'].items()
+}
+
+
+@instrumentation.instrumented('test_results.process_frame')
+def process_test_results_frame(athletes) -> pd.DataFrame:
+    """
+    Versão colunar de process_test_results: recebe uma tabela (DataFrame ou
+    mapeamento coluna -> array) com os valores brutos dos testes, uma linha por
+    atleta, e retorna os scores das quatro categorias para todas as linhas.
+    Colunas ausentes e valores None/NaN/vazios são tratados como testes não informados.
+    """
+    athletes = pd.DataFrame(athletes)
+    scores = {}
+    for category, tests in CATEGORY_TESTS.items():
+        values = np.column_stack([numeric_column(athletes, test) for test in tests])
+        normalized = TEST_SPEC.normalize_columns(values, tests, missing=0.0)
+        total = np.zeros(len(athletes))
+        for column in range(len(tests)):
+            total = total + normalized[:, column]
+        scores[category] = total / len(tests)
+
+    averages = np.column_stack([
+        mean_present([raw_number_column(athletes, c) for c in components])
+        for components in PSYCHOLOGICAL_FACTORS.values()
+    ])
+    factors = TEST_SPEC.normalize_columns(averages, list(PSYCHOLOGICAL_FACTORS), missing=0.0)
+    total = np.zeros(len(athletes))
+    for column in range(factors.shape[1]):
+        total = total + factors[:, column]
+    scores['fatores_psicologicos'] = total / factors.shape[1]
+    return pd.DataFrame(scores, index=athletes.index)